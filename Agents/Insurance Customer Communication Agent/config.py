@@ -5,12 +5,17 @@ This module contains all configuration settings, connection strings, and constan
 used throughout the insurance agent application.
 """
 
+import os
+
 # Azure AI Project Configuration
 AZURE_PROJECT_CONNECTION_STRING = "eastus2.api.azureml.ms;aee23923-3bba-468d-8dcd-7c4bc1ce218f;rg-ronakofficial1414-9323_ai;ronakofficial1414-8644"
 AZURE_AGENT_ID = "asst_eo3eOzKI2Sk7NlezVZU35rL8"
 
 # Logic App Configuration
-INSURANCE_LOGIC_APP_URL = "https://demoinsurance.azurewebsites.net:443/api/Insurance/triggers/When_a_HTTP_request_is_received/invoke?api-version=2022-05-01&sp=%2Ftriggers%2FWhen_a_HTTP_request_is_received%2Frun&sv=1.0&sig=SnPAbyaqajdIX8V-V4MHttI0DFq0yF5wrk_dWzXE1VI"
+INSURANCE_LOGIC_APP_URL = os.getenv(
+    "INSURANCE_LOGIC_APP_URL",
+    "https://demoinsurance.azurewebsites.net:443/api/Insurance/triggers/When_a_HTTP_request_is_received/invoke?api-version=2022-05-01&sp=%2Ftriggers%2FWhen_a_HTTP_request_is_received%2Frun&sv=1.0&sig=SnPAbyaqajdIX8V-V4MHttI0DFq0yF5wrk_dWzXE1VI"
+)
 
 # Insurance Stages Configuration
 INSURANCE_STAGES = {
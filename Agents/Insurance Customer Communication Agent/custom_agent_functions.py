@@ -12,6 +12,7 @@ import requests
 import json
 import time
 from typing import Dict, Any, Optional, List
+from config import INSURANCE_LOGIC_APP_URL
 
 
 def send_insurance_policy_number(customer_id: str) -> Dict[str, Any]:
@@ -25,7 +26,7 @@ def send_insurance_policy_number(customer_id: str) -> Dict[str, Any]:
     :rtype: Dict[str, Any]
     """
     # Logic App endpoint for insurance customer communication
-    api_url = "https://demoinsurance.azurewebsites.net:443/api/Insurance/triggers/When_a_HTTP_request_is_received/invoke?api-version=2022-05-01&sp=%2Ftriggers%2FWhen_a_HTTP_request_is_received%2Frun&sv=1.0&sig=SnPAbyaqajdIX8V-V4MHttI0DFq0yF5wrk_dWzXE1VI"
+    api_url = INSURANCE_LOGIC_APP_URL
     
     print(f"Sending policy number generation email for customer {customer_id}...")
 
@@ -243,7 +244,7 @@ def send_insurance_claim_in_progress(customer_id: str) -> Dict[str, Any]:
     :rtype: Dict[str, Any]
     """
     # Logic App endpoint for insurance customer communication
-    api_url = "https://demoinsurance.azurewebsites.net:443/api/Insurance/triggers/When_a_HTTP_request_is_received/invoke?api-version=2022-05-01&sp=%2Ftriggers%2FWhen_a_HTTP_request_is_received%2Frun&sv=1.0&sig=SnPAbyaqajdIX8V-V4MHttI0DFq0yF5wrk_dWzXE1VI"
+    api_url = INSURANCE_LOGIC_APP_URL
     
     print(f"Sending claim in progress email for customer {customer_id}...")
 
@@ -484,7 +485,7 @@ def send_insurance_claim_approved(customer_id: str) -> Dict[str, Any]:
     :rtype: Dict[str, Any]
     """
     # Logic App endpoint for insurance customer communication
-    api_url = "https://demoinsurance.azurewebsites.net:443/api/Insurance/triggers/When_a_HTTP_request_is_received/invoke?api-version=2022-05-01&sp=%2Ftriggers%2FWhen_a_HTTP_request_is_received%2Frun&sv=1.0&sig=SnPAbyaqajdIX8V-V4MHttI0DFq0yF5wrk_dWzXE1VI"
+    api_url = INSURANCE_LOGIC_APP_URL
     
     print(f"Sending claim approved email for customer {customer_id}...")
 
@@ -790,7 +791,7 @@ def send_insurance_claim_rejected(customer_id: str) -> Dict[str, Any]:
     :rtype: Dict[str, Any]
     """
     # Logic App endpoint for insurance customer communication
-    api_url = "https://demoinsurance.azurewebsites.net:443/api/Insurance/triggers/When_a_HTTP_request_is_received/invoke?api-version=2022-05-01&sp=%2Ftriggers%2FWhen_a_HTTP_request_is_received%2Frun&sv=1.0&sig=SnPAbyaqajdIX8V-V4MHttI0DFq0yF5wrk_dWzXE1VI"
+    api_url = INSURANCE_LOGIC_APP_URL
     
     print(f"Sending claim rejected email for customer {customer_id}...")
 
@@ -22,7 +22,9 @@ def main():
         
         # Create and run automation engine
         engine = AutomationEngine()
-        engine.run_automation(customer_id, username, password)
+        result = engine.run_automation(customer_id, username, password)
+        if result:
+            print(f"Result ({result['source']}): {result['message']}")
         
     except KeyboardInterrupt:
         UserInteraction.print_warning("Process interrupted by user")
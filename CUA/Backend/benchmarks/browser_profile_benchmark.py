@@ -0,0 +1,85 @@
+"""
+Benchmark of browser startup time and per-screenshot cost for each browser profile.
+
+Usage (from CUA/Backend):
+    python -m benchmarks.browser_profile_benchmark --launches 3 --screenshots 20
+"""
+
+import argparse
+import time
+from benchmarks.cua_loop_benchmark import percentile
+from benchmarks.frontend_server import serve_frontend
+from config.settings import settings
+from core.browser_manager import BrowserManager
+
+def measure_profile(profile: str, url: str, launches: int, screenshots: int) -> dict:
+    """
+    Measure startup and screenshot timings for one profile.
+    
+    Args:
+        profile: Browser profile name
+        url: Page to load before taking screenshots
+        launches: Number of browser launches
+        screenshots: Screenshots taken per launch
+    
+    Returns:
+        Dictionary with startup and screenshot statistics
+    """
+    startup_ms = []
+    screenshot_ms = []
+    screenshot_bytes = []
+    
+    for _ in range(launches):
+        browser_manager = BrowserManager(profile=profile)
+        start = time.perf_counter()
+        browser_manager.start_browser()
+        startup_ms.append((time.perf_counter() - start) * 1000)
+        try:
+            browser_manager.page.goto(url, wait_until="load")
+            for _ in range(screenshots):
+                start = time.perf_counter()
+                screenshot = browser_manager.take_screenshot()
+                screenshot_ms.append((time.perf_counter() - start) * 1000)
+                screenshot_bytes.append(len(screenshot))
+        finally:
+            browser_manager.close_browser()
+    
+    return {
+        "startup_mean_ms": sum(startup_ms) / len(startup_ms),
+        "screenshot_p50_ms": percentile(screenshot_ms, 0.50),
+        "screenshot_p95_ms": percentile(screenshot_ms, 0.95),
+        "screenshot_kb": sum(screenshot_bytes) / len(screenshot_bytes) / 1024
+    }
+
+def main():
+    """Run the benchmark for every selected profile and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=list(settings.BROWSER_PROFILES), help="Profiles to measure")
+    parser.add_argument("--launches", type=int, default=3, help="Browser launches per profile")
+    parser.add_argument("--screenshots", type=int, default=20, help="Screenshots per launch")
+    parser.add_argument("--port", type=int, default=8000, help="Frontend server port")
+    parser.add_argument("--daemon-url", default="", help="Lease warm browsers from a running browser daemon")
+    args = parser.parse_args()
+    
+    # Measure a clean browser, not a restored session
+    settings.REUSE_STORAGE_STATE = False
+    settings.BROWSER_DAEMON_URL = args.daemon_url
+    
+    with serve_frontend(args.port) as base_url:
+        results = {
+            profile: measure_profile(profile, f"{base_url}/login.html", args.launches, args.screenshots)
+            for profile in args.profiles
+        }
+    
+    print("\n" + "=" * 82)
+    print(f"{'Profile':<22}{'Startup (ms)':>15}{'Shot p50 (ms)':>15}{'Shot p95 (ms)':>15}{'Shot size (KB)':>15}")
+    print("-" * 82)
+    for profile, result in results.items():
+        print(
+            f"{profile:<22}{result['startup_mean_ms']:>15.0f}{result['screenshot_p50_ms']:>15.1f}"
+            f"{result['screenshot_p95_ms']:>15.1f}{result['screenshot_kb']:>15.0f}"
+        )
+    print("=" * 82)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Offline benchmark of the AutomationEngine loop against the mock Responses server.
+
+Runs the full computer-use loop (browser actions, screenshots, payload upload)
+against the bundled Frontend pages, with the model replaced by scripted turns.
+
+Usage (from CUA/Backend):
+    python -m benchmarks.cua_loop_benchmark --runs 3 --latency-ms 300 --error-503-rate 0.05
+
+Batched safety check scenario (fails if a follow-up is rejected by the mock):
+    python -m benchmarks.cua_loop_benchmark --runs 1 --script benchmarks/scripts/safety_check_batch.json --acknowledge-safety-checks
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from benchmarks.frontend_server import serve_frontend
+from benchmarks.mock_responses_server import MockResponsesServer, load_script
+from config.settings import settings
+
+DEFAULT_SCRIPT = os.path.join(os.path.dirname(__file__), "scripts", "claim_risk_score.json")
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def run_once(engine_class) -> dict:
+    """
+    Run the automation workflow once.
+    
+    Args:
+        engine_class: AutomationEngine class (imported after the endpoint is patched)
+    
+    Returns:
+        Dictionary with wall time, iteration count and per-iteration timings
+    """
+    from utils.telemetry import telemetry
+    
+    engine = engine_class()
+    start = time.perf_counter()
+    engine.run_automation("default", "demo", "123")
+    elapsed = time.perf_counter() - start
+    
+    iteration_spans = [span for span in telemetry.spans if span.iteration > 0]
+    return {
+        "seconds": elapsed,
+        "iterations": engine.iteration_count,
+        "iteration_ms": [(span.end_time_ns - span.start_time_ns) / 1e6 for span in iteration_spans],
+        "model_ms": [span.phases.get("model", 0.0) * 1000 for span in iteration_spans],
+        "input_tokens": [span.attributes["input_tokens"] for span in iteration_spans if "input_tokens" in span.attributes],
+        "compactions": engine.context_compactor.stats["compactions"] if engine.context_compactor else 0,
+        "retries": sum(span.attributes["retries"] for span in telemetry.spans)
+    }
+
+def summarize(results: list, mock_stats: dict) -> dict:
+    """Aggregate per-run results into a benchmark summary."""
+    iteration_ms = [sample for result in results for sample in result["iteration_ms"]]
+    model_ms = [sample for result in results for sample in result["model_ms"]]
+    loop_ms = [total - model for total, model in zip(iteration_ms, model_ms)]
+    input_tokens = [sample for result in results for sample in result["input_tokens"]]
+    total_seconds = sum(result["seconds"] for result in results)
+    return {
+        "runs": len(results),
+        "mean_run_seconds": sum(result["seconds"] for result in results) / len(results),
+        "mean_iterations": sum(result["iterations"] for result in results) / len(results),
+        "iteration_p50_ms": percentile(iteration_ms, 0.50) if iteration_ms else 0.0,
+        "iteration_p95_ms": percentile(iteration_ms, 0.95) if iteration_ms else 0.0,
+        "local_p50_ms": percentile(loop_ms, 0.50) if loop_ms else 0.0,
+        "local_p95_ms": percentile(loop_ms, 0.95) if loop_ms else 0.0,
+        "iterations_per_s": sum(result["iterations"] for result in results) / total_seconds,
+        "mean_input_tokens": sum(input_tokens) / len(input_tokens) if input_tokens else 0.0,
+        "peak_input_tokens": max(input_tokens, default=0),
+        "compactions": sum(result["compactions"] for result in results),
+        "retries": sum(result["retries"] for result in results),
+        "mock": mock_stats
+    }
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Number of workflow runs")
+    parser.add_argument("--port", type=int, default=8000, help="Frontend server port")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT, help="Scripted turns JSON file")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Mock model latency per response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random latency added per response")
+    parser.add_argument("--error-503-rate", type=float, default=0.0, help="Probability of an injected 503")
+    parser.add_argument("--error-429-rate", type=float, default=0.0, help="Probability of an injected 429")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for latency and errors")
+    parser.add_argument("--profile", default="headless-fast", help="Browser profile (see Settings.BROWSER_PROFILES)")
+    parser.add_argument("--extract-result", action="store_true", help="End runs once the score is readable from the DOM")
+    parser.add_argument("--compact-every", type=int, default=0, help="Start a fresh response chain every N iterations (0 disables)")
+    parser.add_argument("--acknowledge-safety-checks", action="store_true", help="Confirm pending safety checks without prompting")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    # Measure the loop itself, not the session or trajectory caches
+    settings.REUSE_STORAGE_STATE = False
+    settings.TRAJECTORY_MODE = "off"
+    settings.TELEMETRY_EXPORT = False
+    settings.BROWSER_PROFILE = args.profile
+    settings.CONTEXT_COMPACTION = args.compact_every > 0
+    settings.RESULT_EXTRACTION = args.extract_result
+    settings.CONTEXT_COMPACT_MAX_ITERATIONS = args.compact_every or settings.CONTEXT_COMPACT_MAX_ITERATIONS
+    
+    mock_server = MockResponsesServer(
+        load_script(args.script),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_503_rate=args.error_503_rate,
+        error_429_rate=args.error_429_rate,
+        seed=args.seed
+    )
+    
+    with mock_server, serve_frontend(args.port) as base_url:
+        settings.DEFAULT_CRM_URL = f"{base_url}/login.html"
+        settings.AUTHENTICATED_CRM_URL = f"{base_url}/risk-score.html"
+        settings.AZURE_OPENAI_ENDPOINT = mock_server.url
+        settings.AZURE_OPENAI_API_KEY = "mock-key"
+        
+        # The global Azure client reads the endpoint at import time
+        from core.automation_engine import AutomationEngine
+        if args.acknowledge_safety_checks:
+            from handlers.safety_handler import SafetyHandler
+            SafetyHandler._get_user_acknowledgment = lambda self: True
+        
+        results = [run_once(AutomationEngine) for _ in range(args.runs)]
+        summary = summarize(results, dict(mock_server.stats))
+    
+    print("\n" + "=" * 50)
+    print("CUA LOOP BENCHMARK (mock model)")
+    print("-" * 50)
+    for key, value in summary.items():
+        if isinstance(value, float):
+            print(f"{key:<25}{value:>20.1f}")
+        elif not isinstance(value, dict):
+            print(f"{key:<25}{value:>20}")
+    for key, value in summary["mock"].items():
+        print(f"{'mock.' + key:<25}{value:>20}")
+    print("=" * 50)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(summary, output_file, indent=2)
+        print(f"Summary written to {args.output}")
+
+    if summary["mock"]["rejected_400"]:
+        print("FAILED: the mock server rejected follow-ups that did not answer every computer call")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
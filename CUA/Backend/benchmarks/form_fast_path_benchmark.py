@@ -0,0 +1,67 @@
+"""
+Benchmark comparing model iterations and wall time with and without the DOM form fast path.
+
+Usage (from CUA/Backend):
+    python -m benchmarks.form_fast_path_benchmark --runs 3
+"""
+
+import argparse
+import time
+from benchmarks.frontend_server import serve_frontend
+from config.settings import settings
+from core.automation_engine import AutomationEngine
+
+def run_once(fast_path: bool) -> dict:
+    """
+    Run the automation workflow once.
+    
+    Args:
+        fast_path: Whether the DOM form fast path is enabled
+        
+    Returns:
+        Dictionary with iteration count and wall time in seconds
+    """
+    settings.FORM_FAST_PATH = fast_path
+    engine = AutomationEngine()
+    
+    start = time.perf_counter()
+    engine.run_automation("default", "demo", "123")
+    elapsed = time.perf_counter() - start
+    
+    return {"iterations": engine.iteration_count, "seconds": elapsed}
+
+def summarize(results: list) -> dict:
+    """Average iteration counts and wall times across runs."""
+    return {
+        "iterations": sum(r["iterations"] for r in results) / len(results),
+        "seconds": sum(r["seconds"] for r in results) / len(results)
+    }
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Runs per mode")
+    parser.add_argument("--port", type=int, default=8000, help="Frontend server port")
+    args = parser.parse_args()
+    
+    # Measure the workflow itself, not the session or trajectory caches
+    settings.REUSE_STORAGE_STATE = False
+    settings.TRAJECTORY_MODE = "off"
+    
+    with serve_frontend(args.port) as base_url:
+        settings.DEFAULT_CRM_URL = f"{base_url}/login.html"
+        
+        summaries = {}
+        for label, fast_path in (("model only", False), ("form fast path", True)):
+            results = [run_once(fast_path) for _ in range(args.runs)]
+            summaries[label] = summarize(results)
+    
+    print("\n" + "=" * 50)
+    print(f"{'Mode':<20}{'Iterations':>15}{'Wall time (s)':>15}")
+    print("-" * 50)
+    for label, summary in summaries.items():
+        print(f"{label:<20}{summary['iterations']:>15.1f}{summary['seconds']:>15.1f}")
+    print("=" * 50)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Local static server for the bundled Frontend pages used by benchmarks.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "Frontend"))
+
+def _is_port_open(port: int) -> bool:
+    """Check if something is already listening on the local port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+@contextmanager
+def serve_frontend(port: int = 8000, startup_timeout: float = 10.0):
+    """
+    Serve the Frontend directory with `python -m http.server` for the duration of the block.
+    
+    An already running server on the port is reused and left untouched.
+    
+    Args:
+        port: Local port to serve on
+        startup_timeout: Seconds to wait for the server to accept connections
+    """
+    if _is_port_open(port):
+        yield f"http://localhost:{port}"
+        return
+    
+    process = subprocess.Popen(
+        [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1"],
+        cwd=FRONTEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while not _is_port_open(port):
+            if time.monotonic() > deadline or process.poll() is not None:
+                raise RuntimeError(f"Frontend server failed to start on port {port}")
+            time.sleep(0.1)
+        yield f"http://localhost:{port}"
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
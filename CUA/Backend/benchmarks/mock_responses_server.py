@@ -0,0 +1,288 @@
+"""
+Local stand-in for the Azure OpenAI Responses API used by offline benchmarks.
+
+The server answers `POST .../responses` with scripted `computer_call` turns so the
+full AutomationEngine loop (browser actions, screenshots, payload upload) runs
+without a live `computer-use-preview` deployment.
+"""
+
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_FINAL_MESSAGE = "The Risk Assessment score is '60'."
+
+# Approximate token cost of one 1024x768 screenshot
+IMAGE_TOKENS = 765
+OUTPUT_TOKENS_PER_ACTION = 40
+
+def load_script(path: str) -> dict:
+    """
+    Load a scripted conversation from a JSON file.
+    
+    The file holds a "turns" list where each turn has an "actions" list; every
+    action becomes one computer call of that response. A turn's optional
+    "safety_checks" maps an action index to the pending safety checks of that
+    call. An optional "final_message" is returned once the turns are exhausted.
+    
+    Args:
+        path: Path of the script file
+    
+    Returns:
+        Script dictionary
+    """
+    with open(path, "r", encoding="utf-8") as script_file:
+        return json.load(script_file)
+
+def _iter_input_parts(input_data):
+    """Yield the text and image parts of a request's input items."""
+    if isinstance(input_data, str):
+        yield {"type": "input_text", "text": input_data}
+        return
+    
+    for item in input_data or []:
+        parts = item.get("content") or item.get("output") or []
+        if isinstance(parts, str):
+            yield {"type": "input_text", "text": parts}
+        else:
+            yield from parts if isinstance(parts, list) else [parts]
+
+def estimate_input_tokens(input_data) -> int:
+    """
+    Roughly estimate the tokens of a request's input items.
+    
+    Args:
+        input_data: The request's "input" value (string or list of items)
+    
+    Returns:
+        Estimated token count (images count as IMAGE_TOKENS, text as 4 characters per token)
+    """
+    return sum(
+        IMAGE_TOKENS if part.get("type") == "input_image" else len(part.get("text", "")) // 4
+        for part in _iter_input_parts(input_data)
+    )
+
+def find_missing_call_outputs(input_data, expected_calls: dict) -> list:
+    """
+    Check that a follow-up request answers every computer call of the previous response.
+    
+    Args:
+        input_data: The request's "input" value
+        expected_calls: call_id -> ids of the safety checks that must be acknowledged
+    
+    Returns:
+        Problems found (empty when every call has its output and acknowledgments)
+    """
+    outputs = {
+        item.get("call_id"): item for item in (input_data if isinstance(input_data, list) else [])
+        if item.get("type") == "computer_call_output"
+    }
+    problems = []
+    for call_id, check_ids in expected_calls.items():
+        if call_id not in outputs:
+            problems.append(f"No tool output found for computer call {call_id}.")
+            continue
+        acknowledged = {check.get("id") for check in outputs[call_id].get("acknowledged_safety_checks") or []}
+        for check_id in check_ids:
+            if check_id not in acknowledged:
+                problems.append(f"Safety check {check_id} of computer call {call_id} was not acknowledged.")
+    return problems
+
+def has_input_image(input_data) -> bool:
+    """Check if a request's input carries a screenshot."""
+    return any(part.get("type") == "input_image" for part in _iter_input_parts(input_data))
+
+class _ResponsesRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler delegating to the owning MockResponsesServer."""
+    
+    def do_POST(self):
+        """Handle a Responses API create call."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.split("?")[0].endswith("/responses"):
+            self._send_json(404, {"error": {"code": "NotFound", "message": self.path}})
+            return
+        
+        status, payload, headers = self.server.mock.handle_request(body)
+        self._send_json(status, payload, headers)
+    
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        """Write a JSON response."""
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+class MockResponsesServer:
+    """Scripted Responses API server with latency and error injection."""
+    
+    def __init__(self, script: dict, port: int = 0, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_503_rate: float = 0.0, error_429_rate: float = 0.0, retry_after: float = 1.0,
+                 seed: int = None):
+        """
+        Initialize the mock server.
+        
+        Args:
+            script: Scripted conversation (see load_script)
+            port: Local port (0 picks a free port)
+            latency_ms: Base latency added to every successful response
+            jitter_ms: Uniform random latency added on top of the base latency
+            error_503_rate: Probability of answering a request with 503
+            error_429_rate: Probability of answering a request with 429 and `Retry-After`
+            retry_after: `Retry-After` value in seconds sent with injected 429s
+            seed: Random seed for reproducible latency and error injection
+        """
+        self.turns = script.get("turns", [])
+        self.final_message = script.get("final_message", DEFAULT_FINAL_MESSAGE)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_503_rate = error_503_rate
+        self.error_429_rate = error_429_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._step_by_response_id = {}
+        self._context_tokens_by_response_id = {}
+        self._calls_by_response_id = {}
+        self._last_step = -1
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "responses": 0, "injected_503": 0, "injected_429": 0, "rejected_400": 0, "request_bytes": 0}
+        
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _ResponsesRequestHandler)
+        self._server.mock = self
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL to use as the Azure OpenAI endpoint."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+    
+    def __enter__(self):
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def handle_request(self, body: bytes):
+        """
+        Build the reply for a Responses API request.
+        
+        The reply depends only on `previous_response_id`, so a retried request
+        receives the same scripted turn. A request that starts a new chain with a
+        screenshot (context compaction) continues after the latest scripted turn.
+        Reported input tokens grow with every image kept in the chain. Like the
+        real API, a follow-up that leaves a computer call of the previous response
+        unanswered, or a safety check unacknowledged, is rejected with 400.
+        
+        Args:
+            body: Raw JSON request body
+        
+        Returns:
+            Tuple of (HTTP status, JSON payload, extra headers)
+        """
+        request = json.loads(body or b"{}")
+        
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["request_bytes"] += len(body)
+            roll = self._random.random()
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            
+            if roll < self.error_503_rate:
+                self.stats["injected_503"] += 1
+                return 503, {"error": {"code": "ServiceUnavailable", "message": "Injected 503"}}, {}
+            if roll < self.error_503_rate + self.error_429_rate:
+                self.stats["injected_429"] += 1
+                return 429, {"error": {"code": "429", "message": "Injected rate limit"}}, {
+                    "Retry-After": str(self.retry_after)
+                }
+            
+            previous_id = request.get("previous_response_id")
+            problems = find_missing_call_outputs(request.get("input"), self._calls_by_response_id.get(previous_id, {}))
+            if problems:
+                self.stats["rejected_400"] += 1
+                return 400, {"error": {"code": "invalid_request_error", "message": " ".join(problems)}}, {}
+            if previous_id:
+                step = self._step_by_response_id.get(previous_id, -1) + 1
+            elif has_input_image(request.get("input")):
+                step = self._last_step + 1
+            else:
+                step = 0
+            input_tokens = self._context_tokens_by_response_id.get(previous_id, 0) + estimate_input_tokens(
+                request.get("input")
+            )
+            response_id = f"resp_mock_{next(self._ids)}"
+            self._step_by_response_id[response_id] = step
+            self._last_step = step
+            self.stats["responses"] += 1
+            
+            response = self._build_response(response_id, step, request.get("model"), input_tokens)
+            self._context_tokens_by_response_id[response_id] = input_tokens + response["usage"]["output_tokens"]
+            self._calls_by_response_id[response_id] = {
+                item["call_id"]: [check["id"] for check in item["pending_safety_checks"]]
+                for item in response["output"] if item["type"] == "computer_call"
+            }
+        
+        time.sleep(delay)
+        return 200, response, {}
+    
+    def _build_response(self, response_id: str, step: int, model: str, input_tokens: int = 0) -> dict:
+        """Build a Responses API payload for a scripted step."""
+        if step < len(self.turns):
+            safety_checks = self.turns[step].get("safety_checks", {})
+            output = [
+                {
+                    "type": "computer_call",
+                    "id": f"cu_{response_id}_{index}",
+                    "call_id": f"call_{response_id}_{index}",
+                    "action": action,
+                    "pending_safety_checks": [
+                        {"id": f"sc_{response_id}_{index}_{check_index}", **check}
+                        for check_index, check in enumerate(safety_checks.get(str(index), []))
+                    ],
+                    "status": "completed"
+                }
+                for index, action in enumerate(self.turns[step]["actions"])
+            ]
+        else:
+            output = [{
+                "type": "message",
+                "id": f"msg_{response_id}",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": self.final_message, "annotations": []}]
+            }]
+        
+        output_tokens = OUTPUT_TOKENS_PER_ACTION * len(output)
+        return {
+            "id": response_id,
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": model or "computer-use-preview",
+            "output": output,
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "truncation": "auto",
+            "usage": {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens
+            }
+        }
@@ -0,0 +1,169 @@
+"""
+Throughput and parity benchmark for the browser-free risk rule engine.
+
+Scores a synthetic claim batch in both scoring modes and, with --check-parity,
+compares the results with RiskAnalysisUtils and RiskAnalysisApp running in node.
+
+Usage (from CUA/Backend):
+    python -m benchmarks.risk_rules_benchmark --claims 1000000 --check-parity
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+from config.settings import settings
+from core.risk_rule_engine import RiskRuleEngine
+
+RISK_SCORE_JS = os.path.join(os.path.dirname(settings.RISK_RULES_PATH), "risk-score.js")
+
+# Rules with a deterministic check in RiskAnalysisApp.evaluateRule (the others use Math.random)
+REPORT_DETERMINISTIC_RULES = ["HLT-001", "HLT-002", "HLT-003", "MOT-001", "MOT-002", "MOT-003", "LIF-001", "LIF-002"]
+
+# Loads both Frontend scripts into one context and scores every claim with the browser code
+NODE_HARNESS = """
+const fs = require("fs");
+const vm = require("vm");
+const [dataPath, appPath, claimsPath, selectedPath] = process.argv.slice(2);
+const context = { console, document: { addEventListener() {} }, window: {} };
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(dataPath, "utf8") + "\\nthis.RiskAnalysisData = RiskAnalysisData; this.RiskAnalysisUtils = RiskAnalysisUtils;", context);
+vm.runInContext(fs.readFileSync(appPath, "utf8") + "\\nthis.RiskAnalysisApp = RiskAnalysisApp;", context);
+const { RiskAnalysisData, RiskAnalysisUtils, RiskAnalysisApp } = context;
+const claims = JSON.parse(fs.readFileSync(claimsPath, "utf8"));
+const selected = JSON.parse(fs.readFileSync(selectedPath, "utf8"));
+const results = claims.map(claim => {
+    const failedRules = (RiskAnalysisData.rules[claim.claimType] || []).filter(rule => RiskAnalysisUtils.evaluateRule(rule, claim));
+    const score = RiskAnalysisUtils.calculateRiskScore(failedRules);
+    const level = RiskAnalysisUtils.getRiskLevel(score);
+    const app = Object.create(RiskAnalysisApp.prototype);
+    app.formData = claim;
+    app.selectedRules = new Set(selected);
+    app.ruleResults = new Map();
+    app.runAutoValidation();
+    const report = app.calculateRiskScore();
+    const reportLevel = app.getRiskLevel(report.score);
+    return {
+        utils: { score, level, recommendation: RiskAnalysisUtils.getRecommendation(level, failedRules) },
+        report: { score: report.score, level: reportLevel, recommendation: app.getRecommendation(reportLevel).action }
+    };
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+def generate_claims(count: int, seed: int = 0) -> list:
+    """
+    Generate synthetic claims that exercise every rule threshold.
+    
+    Args:
+        count: Number of claims
+        seed: Random seed
+    
+    Returns:
+        List of claim dictionaries
+    """
+    rng = random.Random(seed)
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    boundary_amounts = [9999, 10000, 25000, 50000, 75000, 100000, 200000, 300000, 500000, 1000000, 1500000, 2500000]
+    boundary_days = [7, 15, 30, 270, 365, 1095]
+    claims = []
+    for index in range(count):
+        if rng.random() < 0.5:
+            amount = rng.choice(boundary_amounts) + rng.choice([-1, 0, 1])
+        else:
+            amount = round(10 ** rng.uniform(3, 7), 2)
+        if rng.random() < 0.5:
+            policy_age = rng.choice(boundary_days) + rng.choice([-1, 0, 1])
+        else:
+            policy_age = rng.randint(0, 3000)
+        incident_age = rng.randint(0, min(policy_age, 60))
+        claims.append({
+            "customerName": f"Customer {index}",
+            "policyNumber": f"GSS-{index:06d}",
+            "claimType": rng.choice(["health", "motor", "life"]),
+            "claimAmount": amount,
+            "policyStartDate": (today - datetime.timedelta(days=policy_age)).isoformat(),
+            "incidentDate": (today - datetime.timedelta(days=incident_age)).isoformat(),
+            "providerName": "Apollo Hospital, Delhi"
+        })
+    return claims
+
+def check_parity(engine: RiskRuleEngine, claims: list) -> int:
+    """
+    Compare engine results with the Frontend JavaScript implementations.
+    
+    Args:
+        engine: Risk rule engine
+        claims: Claims to compare
+    
+    Returns:
+        Number of mismatching results
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        harness_path = os.path.join(temp_dir, "harness.js")
+        claims_path = os.path.join(temp_dir, "claims.json")
+        selected_path = os.path.join(temp_dir, "selected.json")
+        with open(harness_path, "w", encoding="utf-8") as harness_file:
+            harness_file.write(NODE_HARNESS)
+        with open(claims_path, "w", encoding="utf-8") as claims_file:
+            json.dump(claims, claims_file)
+        with open(selected_path, "w", encoding="utf-8") as selected_file:
+            json.dump(REPORT_DETERMINISTIC_RULES, selected_file)
+        
+        completed = subprocess.run(
+            ["node", harness_path, settings.RISK_RULES_PATH, RISK_SCORE_JS, claims_path, selected_path],
+            capture_output=True, text=True, check=True
+        )
+    expected = json.loads(completed.stdout)
+    
+    mismatches = 0
+    for mode, selected_rules in (("utils", None), ("report", set(REPORT_DETERMINISTIC_RULES))):
+        result = engine.score_batch(claims, mode, selected_rules=selected_rules)
+        for index, reference in enumerate(item[mode] for item in expected):
+            actual = {
+                "score": int(result["score"][index]),
+                "level": str(result["level"][index]),
+                "recommendation": str(result["recommendation"][index])
+            }
+            if actual != reference:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"Mismatch ({mode}) for {claims[index]}: engine {actual}, browser {reference}")
+    return mismatches
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--claims", type=int, default=100000, help="Synthetic claims to score")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--check-parity", action="store_true", help="Compare results with the JavaScript code (needs node)")
+    parser.add_argument("--parity-claims", type=int, default=5000, help="Claims compared with the JavaScript code")
+    args = parser.parse_args()
+    
+    engine = RiskRuleEngine()
+    claims = generate_claims(args.claims, args.seed)
+    
+    for mode in ("utils", "report"):
+        start = time.perf_counter()
+        columns = engine.build_columns(claims, mode)
+        built = time.perf_counter()
+        engine.evaluate(columns)
+        evaluated = time.perf_counter()
+        engine.score_batch(claims, mode)
+        scored = time.perf_counter()
+        print(
+            f"{mode:<8} columns {(built - start) * 1000:>9.1f} ms | rules {(evaluated - built) * 1000:>9.1f} ms | "
+            f"score_batch {(scored - evaluated) * 1000:>9.1f} ms ({len(claims) / (scored - evaluated):,.0f} claims/s)"
+        )
+    
+    if args.check_parity:
+        parity_claims = generate_claims(args.parity_claims, args.seed + 1)
+        mismatches = check_parity(engine, parity_claims)
+        print(f"Parity: {2 * len(parity_claims) - mismatches}/{2 * len(parity_claims)} results match the JavaScript code")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Declarative form maps for pages the automation can fill without the model.
+"""
+
+class FormMaps:
+    """Container for known form layouts of the Frontend pages."""
+    
+    # Risk Analysis step 1 form (risk-score.js renderStep1) followed by the
+    # buttons that advance the workflow to the Step 4 report
+    RISK_SCORE_CLAIM_FORM = {
+        "name": "risk_score_claim",
+        "url_pattern": "risk-score.html",
+        "ready_selector": "#customerName",
+        "fields": {
+            "customerName": "#customerName",
+            "policyNumber": "#policyNumber",
+            "claimType": "#claimType",
+            "claimAmount": "#claimAmount",
+            "policyStartDate": "#policyStartDate",
+            "incidentDate": "#incidentDate",
+            "providerName": "#hospitalGarageName"
+        },
+        "submit_steps": [
+            "button[onclick='app.submitStep1()']",
+            "button[onclick='app.proceedToStep3()']",
+            "button[onclick='app.proceedToStep4()']"
+        ],
+        "done_selector": ".score-number"
+    }
+    
+    @staticmethod
+    def get_all_form_maps() -> list:
+        """Get all known form maps."""
+        return [FormMaps.RISK_SCORE_CLAIM_FORM]
@@ -0,0 +1,24 @@
+"""
+Declarative result extractors that read the task result straight from the page DOM.
+"""
+
+class ResultExtractors:
+    """Container for known result locations on the Frontend pages."""
+    
+    # Risk Analysis Step 4 report (risk-score.js renderStep4): the "Risk
+    # Assessment" card shows the score number and the risk level
+    RISK_ASSESSMENT_SCORE = {
+        "name": "risk_assessment_score",
+        "url_pattern": "risk-score.html",
+        "selector": ".risk-score-card .score-number",
+        "pattern": r"^\s*(\d+)\s*$",
+        "fields": {
+            "level": {"selector": ".risk-score-card .score-level", "pattern": r"(\w+)\s+Risk"}
+        },
+        "message_template": "The Risk Assessment score is '{value}'."
+    }
+    
+    @staticmethod
+    def get_all_extractors() -> list:
+        """Get all known result extractors."""
+        return [ResultExtractors.RISK_ASSESSMENT_SCORE]
@@ -34,9 +34,55 @@ class Settings:
     DEFAULT_WAIT_TIME = int(os.getenv("DEFAULT_WAIT_TIME", "2"))
     BASE_RETRY_DELAY = int(os.getenv("BASE_RETRY_DELAY", "2"))
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
+    MAX_RETRY_DELAY = float(os.getenv("MAX_RETRY_DELAY", "60"))
+    
+    # API Rate Limiting and Circuit Breaker
+    API_RATE_LIMIT_PER_SECOND = float(os.getenv("API_RATE_LIMIT_PER_SECOND", "2"))
+    API_RATE_LIMIT_BURST = float(os.getenv("API_RATE_LIMIT_BURST", "5"))
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "8"))
+    CIRCUIT_BREAKER_RECOVERY_TIME = float(os.getenv("CIRCUIT_BREAKER_RECOVERY_TIME", "30"))
     
     # CRM System
     DEFAULT_CRM_URL = os.getenv("DEFAULT_CRM_URL", "http://localhost:8000/login.html")
+    AUTHENTICATED_CRM_URL = os.getenv("AUTHENTICATED_CRM_URL", "http://localhost:8000/risk-score.html")
+    
+    # Browser Storage State (cookies/localStorage reuse across runs)
+    REUSE_STORAGE_STATE = os.getenv("REUSE_STORAGE_STATE", "true").lower() == "true"
+    STORAGE_STATE_DIR = os.getenv("STORAGE_STATE_DIR", ".browser_state")
+    STORAGE_STATE_MAX_AGE = int(os.getenv("STORAGE_STATE_MAX_AGE", "3600"))
+    
+    # Trajectory Replay Cache ("off", "record" or "replay")
+    TRAJECTORY_MODE = os.getenv("TRAJECTORY_MODE", "off").lower()
+    TRAJECTORY_DIR = os.getenv("TRAJECTORY_DIR", "trajectories")
+    TRAJECTORY_MATCH_THRESHOLD = int(os.getenv("TRAJECTORY_MATCH_THRESHOLD", "4"))
+    
+    # DOM Form Fast Path (fills known forms through selectors instead of the model)
+    FORM_FAST_PATH = os.getenv("FORM_FAST_PATH", "false").lower() == "true"
+    FORM_FAST_PATH_TIMEOUT_MS = int(os.getenv("FORM_FAST_PATH_TIMEOUT_MS", "5000"))
+    
+    # DOM Result Extraction (ends the run as soon as the result is visible on the page)
+    RESULT_EXTRACTION = os.getenv("RESULT_EXTRACTION", "false").lower() == "true"
+    RESULT_EXTRACTION_TIMEOUT_MS = int(os.getenv("RESULT_EXTRACTION_TIMEOUT_MS", "1000"))
+    
+    # Risk Rule Engine (rule set shared with the Frontend risk analysis pages)
+    RISK_RULES_PATH = os.getenv(
+        "RISK_RULES_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Frontend", "js", "risk-analysis-data.js")
+    )
+    
+    # Conversation Context Compaction (fresh response chain with a summary and the latest screenshot)
+    CONTEXT_COMPACTION = os.getenv("CONTEXT_COMPACTION", "false").lower() == "true"
+    CONTEXT_COMPACT_MAX_ITERATIONS = int(os.getenv("CONTEXT_COMPACT_MAX_ITERATIONS", "12"))
+    CONTEXT_COMPACT_MAX_INPUT_TOKENS = int(os.getenv("CONTEXT_COMPACT_MAX_INPUT_TOKENS", "40000"))
+    CONTEXT_SUMMARY_MAX_STEPS = int(os.getenv("CONTEXT_SUMMARY_MAX_STEPS", "30"))
+    
+    # Telemetry
+    TELEMETRY_EXPORT = os.getenv("TELEMETRY_EXPORT", "false").lower() == "true"
+    TELEMETRY_DIR = os.getenv("TELEMETRY_DIR", "telemetry")
+    
+    # Screenshot Archive
+    SCREENSHOT_ARCHIVE = os.getenv("SCREENSHOT_ARCHIVE", "false").lower() == "true"
+    SCREENSHOT_ARCHIVE_DIR = os.getenv("SCREENSHOT_ARCHIVE_DIR", "screenshot_archive")
     
     # Browser Launch Args
     BROWSER_ARGS = [
@@ -44,6 +90,96 @@ class Settings:
         "--disable-file-system"
     ]
     
+    # Browser Performance Profiles
+    # Each profile adds Chromium flags to BROWSER_ARGS and sets context options.
+    # A viewport of None uses BROWSER_WIDTH x BROWSER_HEIGHT; the computer use
+    # tool always reports the active profile's viewport as its display size.
+    BROWSER_PROFILE = os.getenv("BROWSER_PROFILE", "default")
+    BROWSER_PROFILES = {
+        "default": {
+            "headless": BROWSER_HEADLESS,
+            "args": [],
+            "viewport": None,
+            "device_scale_factor": 1,
+            "reduced_motion": "no-preference"
+        },
+        "headless-fast": {
+            "headless": True,
+            "args": [
+                "--disable-gpu",
+                "--disable-background-timer-throttling",
+                "--disable-backgrounding-occluded-windows",
+                "--disable-renderer-backgrounding",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--force-prefers-reduced-motion",
+                "--hide-scrollbars",
+                "--mute-audio"
+            ],
+            "viewport": None,
+            "device_scale_factor": 1,
+            "reduced_motion": "reduce"
+        },
+        "headless-low-memory": {
+            "headless": True,
+            "args": [
+                "--disable-gpu",
+                "--disable-background-timer-throttling",
+                "--disable-backgrounding-occluded-windows",
+                "--disable-renderer-backgrounding",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--force-prefers-reduced-motion",
+                "--hide-scrollbars",
+                "--mute-audio",
+                "--renderer-process-limit=1",
+                "--disable-dev-shm-usage",
+                "--disable-background-networking",
+                "--disable-features=Translate,MediaRouter,OptimizationHints"
+            ],
+            "viewport": None,
+            "device_scale_factor": 1,
+            "reduced_motion": "reduce"
+        }
+    }
+    
+    # Warm Browser Daemon (leave BROWSER_DAEMON_URL empty to launch a browser per run)
+    BROWSER_DAEMON_URL = os.getenv("BROWSER_DAEMON_URL", "")
+    BROWSER_DAEMON_PORT = int(os.getenv("BROWSER_DAEMON_PORT", "9333"))
+    BROWSER_DAEMON_CDP_PORT = int(os.getenv("BROWSER_DAEMON_CDP_PORT", "9334"))
+    BROWSER_DAEMON_MAX_USES = int(os.getenv("BROWSER_DAEMON_MAX_USES", "50"))
+    BROWSER_DAEMON_MAX_MEMORY_MB = float(os.getenv("BROWSER_DAEMON_MAX_MEMORY_MB", "1500"))
+    BROWSER_DAEMON_LEASE_TIMEOUT = float(os.getenv("BROWSER_DAEMON_LEASE_TIMEOUT", "900"))
+    
+    def get_browser_profile(self, name: str = None) -> dict:
+        """
+        Get a browser profile with its viewport resolved.
+        
+        Args:
+            name: Profile name (default from BROWSER_PROFILE)
+        
+        Returns:
+            Profile dictionary
+        """
+        name = name or self.BROWSER_PROFILE
+        if name not in self.BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile '{name}'. Available: {', '.join(self.BROWSER_PROFILES)}")
+        
+        profile = dict(self.BROWSER_PROFILES[name])
+        width, height = profile["viewport"] or (self.BROWSER_WIDTH, self.BROWSER_HEIGHT)
+        profile["viewport"] = {"width": width, "height": height}
+        profile["name"] = name
+        return profile
+    
+    def get_computer_use_tools(self) -> list:
+        """Get the computer use tool definition matching the active profile's viewport."""
+        viewport = self.get_browser_profile()["viewport"]
+        return [{
+            **self.COMPUTER_USE_TOOLS[0],
+            "display_width": viewport["width"],
+            "display_height": viewport["height"]
+        }]
+    
     @classmethod
     def validate_settings(cls):
         """Validate that required settings are present."""
@@ -2,9 +2,21 @@
 System instructions and prompts for the automation system.
 """
 
+import json
+
 class SystemInstructions:
     """Container for system instructions and prompts."""
     
+    CLAIM_DETAILS = {
+        "customerName": "Rajesh Kumar Sharma",
+        "policyNumber": "GSS-2025-123456",
+        "claimType": "health",
+        "claimAmount": 185000,
+        "policyStartDate": "2023-05-15",
+        "incidentDate": "2025-08-01",
+        "providerName": "Apollo Hospital, Delhi"
+    }
+    
     LOGIN_AND_NAVIGATION_PROMPT = """
 Navigate to the page and handle any login if required. 
 If you need login credentials, use 'demo' and '123' for the System and then 
@@ -12,15 +24,7 @@ If you need login credentials, use 'demo' and '123' for the System and then
 go to the Risk Analysis page.
 On that page, enter the following customer details:
 
-{
-  "customerName": "Rajesh Kumar Sharma",
-  "policyNumber": "GSS-2025-123456",
-  "claimType": "health",
-  "claimAmount": 185000,
-  "policyStartDate": "2023-05-15",
-  "incidentDate": "2025-08-01",
-  "providerName": "Apollo Hospital, Delhi"
-}
+{claim_details}
 
 Click the Submit button.
 After the page updates, scroll down and click the Continue button.
@@ -32,11 +36,29 @@ Return only the score in this format:
 "The Risk Assessment score is '60'."
 
 Do not return any other text or offer further assistance.
-"""
+""".format(claim_details=json.dumps(CLAIM_DETAILS, indent=2))
     
     CUSTOMER_SEARCH_PROMPT_TEMPLATE = """
 Go to the customers tab and find the CRM Ref for the Customer ID {customer_id}.
 If you need login credentials, use {username} and {password} for the CRM System.
+"""
+    
+    FORM_FAST_PATH_NOTE = (
+        "The claim details form was filled in and submitted automatically and the "
+        "Risk Analysis report is now visible. Continue from the current screen."
+    )
+    
+    COMPACTED_CONTEXT_TEMPLATE = """
+{task_prompt}
+
+The earlier conversation was compacted to save context. Earlier screenshots are no longer available.
+Actions already performed, oldest first:
+{action_history}
+
+Notes from earlier steps:
+{notes}
+
+The attached screenshot shows the current screen. Continue the task from here; do not repeat steps that are already done.
 """
     
     SAFETY_WARNING_MESSAGE = """
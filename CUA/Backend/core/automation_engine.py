@@ -4,13 +4,21 @@ Core automation engine that orchestrates the automation workflow.
 
 from core.azure_client import azure_client
 from core.browser_manager import BrowserManager
+from core.context_compactor import ContextCompactor
+from core.trajectory_cache import TrajectoryCache
 from handlers.action_handler import ActionHandler
+from handlers.form_handler import FormHandler
+from handlers.result_extractor import ResultExtractor
 from handlers.safety_handler import SafetyHandler
 from utils.api_utils import safe_api_call
-from utils.screenshot_utils import encode_screenshot
+from utils.screenshot_archive import ScreenshotArchive
+from utils.screenshot_utils import DataUrlEncoder, compute_screenshot_hash
 from utils.user_interaction import UserInteraction
+from utils.telemetry import telemetry
 from config.settings import settings
 from config.system_instructions import SystemInstructions
+from config.form_maps import FormMaps
+from config.result_extractors import ResultExtractors
 
 class AutomationEngine:
     """Main automation engine that orchestrates the entire workflow."""
@@ -19,22 +27,61 @@ class AutomationEngine:
         """Initialize the automation engine."""
         self.browser_manager = None
         self.action_handler = None
+        self.form_handler = None
+        self.result_extractor = None
         self.safety_handler = SafetyHandler()
         self.user_interaction = UserInteraction()
+        self.screenshot_encoder = DataUrlEncoder()
+        self.screenshot_archive = None
+        self.trajectory_cache = None
+        self.context_compactor = None
+        self.task_completed = False
+        self.result = None
+        self._last_screenshot_hash = None
+        self.iteration_count = 0
     
-    def run_automation(self, customer_id: str, username: str, password: str):
-        """Run the complete automation workflow."""
+    def run_automation(self, customer_id: str, username: str, password: str) -> dict:
+        """
+        Run the complete automation workflow.
+        
+        Returns:
+            Structured task result, or None if the task did not complete
+        """
         # Start automation without extra output
+        telemetry.start_run()
+        if settings.SCREENSHOT_ARCHIVE:
+            self.screenshot_archive = ScreenshotArchive(telemetry.run_id)
         
-        with BrowserManager() as browser_manager:
+        with BrowserManager(settings.DEFAULT_CRM_URL, username) as browser_manager:
             self.browser_manager = browser_manager
             self.action_handler = ActionHandler(browser_manager)
+            if settings.FORM_FAST_PATH:
+                self.form_handler = FormHandler(browser_manager, FormMaps.get_all_form_maps())
+            if settings.RESULT_EXTRACTION:
+                self.result_extractor = ResultExtractor(browser_manager, ResultExtractors.get_all_extractors())
             
-            # Navigate to initial URL
-            browser_manager.navigate_to(settings.DEFAULT_CRM_URL)
+            # Navigate to initial URL, skipping the login page when a saved session was restored
+            if browser_manager.storage_state_restored:
+                browser_manager.navigate_to(settings.AUTHENTICATED_CRM_URL)
+            else:
+                browser_manager.navigate_to(settings.DEFAULT_CRM_URL)
             
             # Execute the automation workflow
             self._execute_login_and_navigation()
+            
+            # Persist the session for subsequent runs, but only once the task got past the login;
+            # a failed run must not replace a good session or extend its expiry
+            if self.task_completed:
+                browser_manager.save_storage_state()
+        
+        telemetry.print_summary()
+        if self.context_compactor:
+            self.context_compactor.print_summary()
+        if self.screenshot_archive:
+            self.screenshot_archive.print_summary()
+        if settings.TELEMETRY_EXPORT:
+            telemetry.export()
+        return self.result
     
     def _execute_login_and_navigation(self):
         """Execute the login and navigation phase."""
@@ -42,17 +89,50 @@ class AutomationEngine:
             SystemInstructions.USER_INTERACTION_MESSAGES['login_header']
         )
         
+        self.trajectory_cache = TrajectoryCache(SystemInstructions.LOGIN_AND_NAVIGATION_PROMPT)
+        self.context_compactor = ContextCompactor(SystemInstructions.LOGIN_AND_NAVIGATION_PROMPT)
+        self.task_completed = False
+        self.result = None
+        telemetry.start_iteration(0)
+        
+        # Replay any recorded steps that match the starting screen before involving the model
+        if self.trajectory_cache.is_active:
+            with telemetry.phase("screenshot"):
+                screenshot_bytes = self.browser_manager.take_screenshot()
+            with telemetry.phase("replay"):
+                screenshot_bytes = self._replay_cached_actions(screenshot_bytes)
+            self._last_screenshot_hash = compute_screenshot_hash(screenshot_bytes)
+        
+        prompt = SystemInstructions.LOGIN_AND_NAVIGATION_PROMPT
+        with telemetry.phase("form_fast_path"):
+            fast_path_used = self._try_form_fast_path()
+        if fast_path_used:
+            prompt += "\n" + SystemInstructions.FORM_FAST_PATH_NOTE
+        
+        # A replayed trajectory or the form fast path may already have reached the result
+        with telemetry.phase("extract"):
+            result_found = self._try_extract_result()
+        if result_found:
+            telemetry.end_iteration()
+            self.trajectory_cache.save()
+            return
+        
         def create_response():
-            return azure_client.create_initial_response(
-                SystemInstructions.LOGIN_AND_NAVIGATION_PROMPT
-            )
+            return azure_client.create_initial_response(prompt)
         
-        response = safe_api_call(create_response)
+        with telemetry.phase("model"):
+            response = safe_api_call(create_response)
+        telemetry.end_iteration()
         if response:
             print("First half response:", response.output)
             self._computer_use_loop(response)
         else:
             print("Failed to get initial response for first half")
+        
+        if self.trajectory_cache.is_replaying:
+            print(f"Replayed {self.trajectory_cache.replayed_count} cached actions without model calls")
+        if self.task_completed:
+            self.trajectory_cache.save()
     
     def _computer_use_loop(self, response):
         """
@@ -61,6 +141,8 @@ class AutomationEngine:
         iteration_count = 0
         
         while iteration_count < settings.MAX_ITERATIONS:
+            telemetry.start_iteration(iteration_count + 1)
+            self.context_compactor.observe(response)
             try:
                 computer_calls = [item for item in response.output if item.type == "computer_call"]
                 
@@ -75,33 +157,44 @@ class AutomationEngine:
                         continue
                     
                     print("No more computer calls. Task completed.")
+                    self.task_completed = True
+                    self.result = {"source": "model", "message": self._extract_agent_message(response)}
                     for item in response.output:
                         print(item)
                     break
                 
-                computer_call = computer_calls[0]
-                action = computer_call.action
+                has_safety_checks = any(
+                    getattr(call, 'pending_safety_checks', None) for call in computer_calls
+                )
                 
-                # Handle safety checks
-                if hasattr(computer_call, 'pending_safety_checks') and computer_call.pending_safety_checks:
-                    response = self.safety_handler.handle_safety_checks(
-                        computer_call, response, self.action_handler, azure_client
-                    )
+                # Handle safety checks: every call is executed and answered, flagged ones after confirmation
+                if has_safety_checks:
+                    with telemetry.phase("safety_check"):
+                        response = self.safety_handler.handle_safety_checks(
+                            computer_calls, response, self.action_handler, azure_client
+                        )
+                    # The screen after an acknowledged action is not tracked for replay
+                    self._last_screenshot_hash = None
                     if response is None:
                         break
                 else:
-                    # Normal action execution
-                    response = self._execute_normal_action(computer_call, response, iteration_count)
+                    # Normal action execution for every computer call in the response
+                    response = self._execute_normal_actions(computer_calls, response, iteration_count)
                     if response is None:
+                        # The result extractor ends the run after this iteration's actions
+                        if self.task_completed:
+                            iteration_count += 1
                         break
                 
                 print(f"Response {iteration_count + 1}: {response.output}")
                 iteration_count += 1
-                
+            
             except Exception as e:
                 print(f"Error in computer use loop iteration {iteration_count + 1}: {e}")
                 break
         
+        telemetry.end_iteration()
+        self.iteration_count = iteration_count
         print(f"Computer use loop completed after {iteration_count} iterations")
         return response
     
@@ -142,32 +235,141 @@ class AutomationEngine:
         
         return response
     
-    def _execute_normal_action(self, computer_call, response, iteration_count):
-        """Execute a normal action without safety checks."""
-        action = computer_call.action
-        call_id = computer_call.call_id
-        
-        print(f"Iteration {iteration_count + 1}: {action}")
-        
-        # Execute the action
-        self.action_handler.execute_action(action)
-        self.browser_manager.wait(1)
-        
-        # Take screenshot and create response
-        screenshot_bytes = self.browser_manager.take_screenshot()
-        screenshot_base64 = encode_screenshot(screenshot_bytes)
-        
-        def make_api_call():
-            return azure_client.create_followup_response(
-                response.id,
-                [{
-                    "call_id": call_id,
-                    "type": "computer_call_output",
-                    "output": {
-                        "type": "input_image",
-                        "image_url": f"data:image/png;base64,{screenshot_base64}"
-                    }
-                }]
+    def _execute_normal_actions(self, computer_calls, response, iteration_count):
+        """
+        Execute all computer calls of a response in order without safety checks.
+        
+        Intermediate screenshots are skipped: the page settles once after the last
+        action and the single final screenshot answers every call in the batch.
+        """
+        actions = [computer_call.action for computer_call in computer_calls]
+        
+        for action in actions:
+            print(f"Iteration {iteration_count + 1}: {action}")
+        if len(actions) > 1:
+            print(f"Executing {len(actions)} batched actions")
+        
+        # Execute the actions
+        self.trajectory_cache.record_step(self._last_screenshot_hash, actions)
+        telemetry.record("actions", len(actions))
+        with telemetry.phase("action"):
+            for action in actions:
+                self.action_handler.execute_action(action)
+        with telemetry.phase("settle"):
+            self.browser_manager.wait(1)
+        with telemetry.phase("form_fast_path"):
+            fast_path_used = self._try_form_fast_path()
+        
+        # End the run without another model turn once the result is on the page
+        with telemetry.phase("extract"):
+            if self._try_extract_result():
+                return None
+        
+        # Take screenshot, replaying cached actions while the screen matches the trajectory
+        with telemetry.phase("screenshot"):
+            screenshot_bytes = self.browser_manager.take_screenshot()
+        if self.trajectory_cache.is_active:
+            with telemetry.phase("replay"):
+                screenshot_bytes = self._replay_cached_actions(screenshot_bytes)
+                self._last_screenshot_hash = compute_screenshot_hash(screenshot_bytes)
+        if self.screenshot_archive:
+            with telemetry.phase("archive"):
+                self.screenshot_archive.add(
+                    screenshot_bytes, iteration_count + 1, ",".join(action.type for action in actions)
+                )
+        with telemetry.phase("encode"):
+            image_url = self.screenshot_encoder.encode(screenshot_bytes)
+        telemetry.record("screenshot_bytes", len(screenshot_bytes))
+        # Release the raw frame before the (slow) model call
+        del screenshot_bytes
+        
+        screenshot_output = {
+            "type": "input_image",
+            "image_url": image_url
+        }
+        input_items = [
+            {
+                "call_id": computer_call.call_id,
+                "type": "computer_call_output",
+                "output": screenshot_output
+            }
+            for computer_call in computer_calls
+        ]
+        if fast_path_used:
+            input_items.append({"role": "user", "content": SystemInstructions.FORM_FAST_PATH_NOTE})
+        telemetry.record_memory()
+        
+        # Start a fresh response chain with a summary and only the latest screenshot when the context has grown
+        self.context_compactor.record_actions(actions)
+        compact = self.context_compactor.should_compact()
+        if compact:
+            summary = self.context_compactor.build_summary(
+                SystemInstructions.FORM_FAST_PATH_NOTE if fast_path_used else None
             )
+            telemetry.record("payload_bytes", len(image_url) + len(summary))
+            
+            def make_api_call():
+                return azure_client.create_compacted_response(summary, image_url)
+        else:
+            telemetry.record("payload_bytes", len(image_url) * len(computer_calls))
+            
+            def make_api_call():
+                return azure_client.create_followup_response(response.id, input_items)
+        
+        with telemetry.phase("model"):
+            next_response = safe_api_call(make_api_call)
+        if compact and next_response:
+            self.context_compactor.mark_compacted()
+        return next_response
+    
+    def _replay_cached_actions(self, screenshot_bytes: bytes) -> bytes:
+        """
+        Execute recorded actions locally while the screen matches the trajectory.
+        
+        Args:
+            screenshot_bytes: Screenshot of the current screen
+        
+        Returns:
+            Screenshot of the screen at the point of divergence
+        """
+        while True:
+            actions = self.trajectory_cache.match_step(compute_screenshot_hash(screenshot_bytes))
+            if actions is None:
+                return screenshot_bytes
+            
+            for action in actions:
+                print(f"Replaying cached action: {action.type}")
+                self.action_handler.execute_action(action)
+            self.browser_manager.wait(1)
+            screenshot_bytes = self.browser_manager.take_screenshot()
+    
+    def _try_extract_result(self) -> bool:
+        """
+        Read the task result from the page DOM.
+        
+        Returns:
+            True if the result was found and the task is complete
+        """
+        if not self.result_extractor:
+            return False
+        
+        result = self.result_extractor.try_extract()
+        if not result:
+            return False
+        
+        print(f"Result extracted from page: {result['message']}")
+        self.result = result
+        self.task_completed = True
+        return True
+    
+    def _try_form_fast_path(self) -> bool:
+        """
+        Fill a known form on the current page through DOM selectors.
+        
+        Returns:
+            True if a form was filled and submitted without the model
+        """
+        if not self.form_handler:
+            return False
         
-        return safe_api_call(make_api_call)
+        return self.form_handler.try_fill(SystemInstructions.CLAIM_DETAILS)
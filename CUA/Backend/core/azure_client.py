@@ -17,10 +17,13 @@ class AzureOpenAIClient:
     def _initialize_client(self):
         """Initialize the Azure OpenAI client with configured settings."""
         try:
+            # Retries are left to ResiliencePolicy so every attempt goes through the
+            # shared limiter and circuit breaker and shows up in the metrics
             self._client = AzureOpenAI(
                 api_key=settings.AZURE_OPENAI_API_KEY,
                 azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
-                api_version=settings.AZURE_OPENAI_API_VERSION
+                api_version=settings.AZURE_OPENAI_API_VERSION,
+                max_retries=0
             )
         except Exception as e:
             raise Exception(f"Failed to initialize Azure OpenAI client: {e}")
@@ -41,7 +44,7 @@ class AzureOpenAIClient:
         return self.create_response(
             model=settings.AZURE_OPENAI_MODEL,
             input=[{"role": "user", "content": message}],
-            tools=settings.COMPUTER_USE_TOOLS,
+            tools=settings.get_computer_use_tools(),
             reasoning={"generate_summary": "concise"},
             truncation="auto"
         )
@@ -51,10 +54,26 @@ class AzureOpenAIClient:
         return self.create_response(
             model=settings.AZURE_OPENAI_MODEL,
             previous_response_id=previous_response_id,
-            tools=settings.COMPUTER_USE_TOOLS,
+            tools=settings.get_computer_use_tools(),
             input=input_data,
             truncation="auto"
         )
+    
+    def create_compacted_response(self, summary: str, image_url: str):
+        """Start a new response chain from a progress summary and the current screenshot."""
+        return self.create_response(
+            model=settings.AZURE_OPENAI_MODEL,
+            input=[{
+                "role": "user",
+                "content": [
+                    {"type": "input_text", "text": summary},
+                    {"type": "input_image", "image_url": image_url}
+                ]
+            }],
+            tools=settings.get_computer_use_tools(),
+            reasoning={"generate_summary": "concise"},
+            truncation="auto"
+        )
 
 # Global client instance
 azure_client = AzureOpenAIClient()
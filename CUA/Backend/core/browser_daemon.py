@@ -0,0 +1,414 @@
+"""
+Long-lived Chromium daemon that hands out warm browsers to automation runs.
+
+The daemon keeps one Chromium process running with a local DevTools endpoint.
+Each run leases the browser over a small HTTP control API, connects with
+Playwright's `connect_over_cdp` and creates its own fresh context, so runs stay
+isolated without paying for a cold launch. The browser is recycled after a
+number of leases or when its memory grows past a threshold: the next generation
+is launched on the alternate DevTools port and takes all new leases, while the
+old one drains and is stopped when its last lease is released.
+
+Usage (from CUA/Backend):
+    python -m core.browser_daemon --profile headless-fast
+"""
+
+import argparse
+import json
+import os
+import secrets
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from playwright.sync_api import sync_playwright
+from config.settings import settings
+
+# Environment variables passed to Chromium; everything else (API keys, tokens,
+# proxy credentials, database URLs) stays out of the browser process
+BROWSER_ENV_ALLOWLIST = (
+    "PATH", "HOME", "USER", "LANG", "LC_ALL", "TZ", "TMPDIR",
+    "DISPLAY", "WAYLAND_DISPLAY", "XDG_RUNTIME_DIR", "XAUTHORITY",
+    "FONTCONFIG_PATH", "SYSTEMROOT", "TEMP", "TMP"
+)
+
+def get_process_tree_rss_mb(root_pid: int) -> float:
+    """
+    Get the resident memory of a process and all of its descendants.
+    
+    Shared pages are counted once per process, so the figure is an upper bound.
+    
+    Args:
+        root_pid: Process id of the tree root
+    
+    Returns:
+        Resident memory in MB, or None where /proc is not available
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as stat_file:
+                stat = stat_file.read()
+            with open(f"/proc/{entry}/statm", "r") as statm_file:
+                statm = statm_file.read().split()
+        except OSError:
+            continue
+        # The process name may contain spaces, so split after its closing parenthesis
+        parent_pid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent_pid, []).append(int(entry))
+        rss_pages[int(entry)] = int(statm[1])
+    
+    total_pages = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        total_pages += rss_pages.get(pid, 0)
+        pending.extend(children.get(pid, []))
+    return total_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+class BrowserDaemon:
+    """Keeps a warm Chromium process and leases it to automation runs."""
+    
+    def __init__(self, profile: str = None, port: int = None, cdp_port: int = None,
+                 max_uses: int = None, max_memory_mb: float = None, lease_timeout: float = None):
+        """
+        Initialize the daemon.
+        
+        Args:
+            profile: Browser profile used to launch Chromium (default from settings)
+            port: Control API port (default from settings)
+            cdp_port: Chromium DevTools port (default from settings); the next port
+                      is used by the generation launched while the old one drains
+            max_uses: Leases served before the browser is recycled (default from settings)
+            max_memory_mb: Browser memory that triggers a recycle (default from settings)
+            lease_timeout: Seconds after which an unreleased lease is dropped (default from settings)
+        """
+        self.profile = settings.get_browser_profile(profile)
+        self.port = port or settings.BROWSER_DAEMON_PORT
+        self.cdp_port = cdp_port or settings.BROWSER_DAEMON_CDP_PORT
+        self.cdp_ports = (self.cdp_port, self.cdp_port + 1)
+        self.max_uses = max_uses or settings.BROWSER_DAEMON_MAX_USES
+        self.max_memory_mb = max_memory_mb or settings.BROWSER_DAEMON_MAX_MEMORY_MB
+        self.lease_timeout = lease_timeout or settings.BROWSER_DAEMON_LEASE_TIMEOUT
+        self.executable_path = None
+        self.process = None
+        self.user_data_dir = None
+        self.generation = 0
+        self.uses = 0
+        # lease id -> (start time, browser generation)
+        self.leases = {}
+        # Recycled generations that still have active leases: generation -> (process, user data dir, DevTools port)
+        self.draining = {}
+        self.stats = {"leases": 0, "launches": 0, "recycles": 0, "expired_leases": 0}
+        self._lock = threading.Lock()
+    
+    @property
+    def cdp_url(self) -> str:
+        """DevTools endpoint that clients connect to."""
+        return f"http://127.0.0.1:{self.cdp_port}"
+    
+    def launch_browser(self, startup_timeout: float = 30.0):
+        """
+        Launch Chromium with a local DevTools endpoint and wait until it accepts connections.
+        
+        Args:
+            startup_timeout: Seconds to wait for the DevTools endpoint
+        """
+        if not self.executable_path:
+            with sync_playwright() as playwright:
+                self.executable_path = playwright.chromium.executable_path
+        
+        # Draining generations keep their port until their last lease is released
+        draining_ports = {port for _, _, port in self.draining.values()}
+        self.cdp_port = next(port for port in self.cdp_ports if port not in draining_ports)
+        self.user_data_dir = tempfile.mkdtemp(prefix="cua-browser-")
+        command = [
+            self.executable_path,
+            f"--remote-debugging-port={self.cdp_port}",
+            "--remote-debugging-address=127.0.0.1",
+            f"--user-data-dir={self.user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            *settings.BROWSER_ARGS,
+            *self.profile["args"]
+        ]
+        if self.profile["headless"]:
+            command.append("--headless=new")
+        command.append("about:blank")
+        
+        # Keep API keys and other secrets out of the browser's environment
+        browser_env = {key: os.environ[key] for key in BROWSER_ENV_ALLOWLIST if key in os.environ}
+        self.process = subprocess.Popen(command, env=browser_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"{self.cdp_url}/json/version", timeout=1):
+                    break
+            except OSError:
+                if time.monotonic() > deadline or self.process.poll() is not None:
+                    self.stop_browser()
+                    raise RuntimeError(f"Chromium did not open its DevTools endpoint on port {self.cdp_port}")
+                time.sleep(0.1)
+        
+        self.generation += 1
+        self.uses = 0
+        self.stats["launches"] += 1
+        print(f"Browser generation {self.generation} ready at {self.cdp_url} (pid {self.process.pid})")
+    
+    def stop_browser(self):
+        """Terminate the current Chromium and remove its temporary profile directory."""
+        self._terminate(self.process, self.user_data_dir)
+        self.process = None
+        self.user_data_dir = None
+    
+    @staticmethod
+    def _terminate(process: subprocess.Popen, user_data_dir: str):
+        """Terminate a Chromium process and remove its temporary profile directory."""
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        
+        if user_data_dir:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+    
+    def get_memory_mb(self) -> float:
+        """Get the browser's resident memory in MB, or None if it cannot be measured."""
+        if not self.process:
+            return None
+        return get_process_tree_rss_mb(self.process.pid)
+    
+    def get_recycle_reason(self) -> str:
+        """
+        Check whether the browser should be replaced.
+        
+        Returns:
+            Reason for recycling, or None if the browser can keep serving
+        """
+        if not self.process or self.process.poll() is not None:
+            return "browser not running"
+        if self.uses >= self.max_uses:
+            return f"{self.uses} uses"
+        
+        memory_mb = self.get_memory_mb()
+        if memory_mb is not None and memory_mb > self.max_memory_mb:
+            return f"{memory_mb:.0f} MB resident"
+        return None
+    
+    def lease(self) -> dict:
+        """
+        Lease the warm browser to a run.
+        
+        Returns:
+            Dictionary with the lease id, DevTools URL and browser generation
+        """
+        with self._lock:
+            self._expire_leases()
+            self._recycle_if_needed()
+            
+            lease_id = secrets.token_hex(8)
+            self.leases[lease_id] = (time.monotonic(), self.generation)
+            self.uses += 1
+            self.stats["leases"] += 1
+            return {"lease_id": lease_id, "cdp_url": self.cdp_url, "generation": self.generation}
+    
+    def release(self, lease_id: str) -> dict:
+        """
+        Return a leased browser.
+        
+        Args:
+            lease_id: Lease id returned by lease()
+        
+        Returns:
+            Dictionary with the number of leases still active
+        """
+        with self._lock:
+            self.leases.pop(lease_id, None)
+            self._stop_drained()
+            self._recycle_if_needed()
+            return {"active_leases": len(self.leases)}
+    
+    def get_status(self) -> dict:
+        """Get the daemon state and counters."""
+        with self._lock:
+            memory_mb = self.get_memory_mb()
+            return {
+                "generation": self.generation,
+                "uses": self.uses,
+                "active_leases": len(self.leases),
+                "draining_generations": len(self.draining),
+                "memory_mb": round(memory_mb, 1) if memory_mb is not None else None,
+                **self.stats
+            }
+    
+    def _expire_leases(self):
+        """Drop leases held longer than the lease timeout (e.g. by a crashed run)."""
+        now = time.monotonic()
+        expired = [lease_id for lease_id, (started, _) in self.leases.items() if now - started > self.lease_timeout]
+        for lease_id in expired:
+            del self.leases[lease_id]
+        self.stats["expired_leases"] += len(expired)
+        self._stop_drained()
+    
+    def _stop_drained(self):
+        """Stop recycled generations whose last lease has been released."""
+        leased_generations = {generation for _, generation in self.leases.values()}
+        for generation in [generation for generation in self.draining if generation not in leased_generations]:
+            process, user_data_dir, _ = self.draining.pop(generation)
+            self._terminate(process, user_data_dir)
+            print(f"Browser generation {generation} drained and stopped")
+    
+    def _recycle_if_needed(self):
+        """
+        Replace the browser if it needs recycling.
+        
+        An idle or crashed browser is stopped right away. A browser that still has
+        active leases keeps serving them but gets no new ones: it drains on its
+        DevTools port while the next generation is launched on the other port.
+        """
+        reason = self.get_recycle_reason()
+        if not reason:
+            return
+        
+        running = self.process and self.process.poll() is None
+        active = any(generation == self.generation for _, generation in self.leases.values())
+        if running and active:
+            if len(self.draining) >= len(self.cdp_ports) - 1:
+                # Both ports are taken until the previous generation drains
+                return
+            self.draining[self.generation] = (self.process, self.user_data_dir, self.cdp_port)
+            self.process = None
+            self.user_data_dir = None
+        else:
+            # Leases on a crashed browser cannot be served any more
+            self.stop_browser()
+            self.leases = {
+                lease_id: lease for lease_id, lease in self.leases.items() if lease[1] != self.generation
+            }
+        
+        if self.generation:
+            print(f"Recycling browser generation {self.generation} ({reason})")
+            self.stats["recycles"] += 1
+        self.launch_browser()
+    
+    def serve_forever(self):
+        """Launch the browser and serve the control API until interrupted."""
+        with self._lock:
+            self._recycle_if_needed()
+        
+        server = ThreadingHTTPServer(("127.0.0.1", self.port), _DaemonRequestHandler)
+        server.browser_daemon = self
+        print(f"Browser daemon listening on http://127.0.0.1:{self.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stop_browser()
+            for process, user_data_dir, _ in self.draining.values():
+                self._terminate(process, user_data_dir)
+            self.draining.clear()
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    """Control API: POST /lease, POST /release, GET /status."""
+    
+    def do_GET(self):
+        """Report daemon status."""
+        if self.path == "/status":
+            self._send_json(200, self.server.browser_daemon.get_status())
+        else:
+            self._send_json(404, {"error": "not found"})
+    
+    def do_POST(self):
+        """Lease or release the browser."""
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        try:
+            if self.path == "/lease":
+                self._send_json(200, self.server.browser_daemon.lease())
+            elif self.path == "/release":
+                self._send_json(200, self.server.browser_daemon.release(body.get("lease_id", "")))
+            else:
+                self._send_json(404, {"error": "not found"})
+        except RuntimeError as e:
+            self._send_json(503, {"error": str(e)})
+    
+    def _send_json(self, status: int, payload: dict):
+        """Write a JSON response."""
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+class BrowserDaemonClient:
+    """Client for the browser daemon control API."""
+    
+    def __init__(self, url: str = None, timeout: float = 30.0):
+        """
+        Initialize the client.
+        
+        Args:
+            url: Daemon control URL (default from settings)
+            timeout: Request timeout in seconds (covers a browser recycle)
+        """
+        self.url = (url or settings.BROWSER_DAEMON_URL).rstrip("/")
+        self.timeout = timeout
+    
+    def lease(self) -> dict:
+        """Lease the warm browser; returns the lease id, DevTools URL and generation."""
+        return self._post("/lease", {})
+    
+    def release(self, lease_id: str):
+        """Release a lease so the daemon can recycle the browser when needed."""
+        self._post("/release", {"lease_id": lease_id})
+    
+    def _post(self, path: str, payload: dict) -> dict:
+        """Send a JSON POST request to the daemon."""
+        request = urllib.request.Request(
+            f"{self.url}{path}",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+def main():
+    """Run the browser daemon."""
+    parser = argparse.ArgumentParser(description="Warm Chromium daemon for automation runs")
+    parser.add_argument("--profile", default=None, help="Browser profile (default from settings)")
+    parser.add_argument("--port", type=int, default=None, help="Control API port")
+    parser.add_argument("--cdp-port", type=int, default=None, help="Chromium DevTools port")
+    parser.add_argument("--max-uses", type=int, default=None, help="Leases before the browser is recycled")
+    parser.add_argument("--max-memory-mb", type=float, default=None, help="Browser memory that triggers a recycle")
+    args = parser.parse_args()
+    
+    BrowserDaemon(
+        profile=args.profile,
+        port=args.port,
+        cdp_port=args.cdp_port,
+        max_uses=args.max_uses,
+        max_memory_mb=args.max_memory_mb
+    ).serve_forever()
+
+if __name__ == "__main__":
+    main()
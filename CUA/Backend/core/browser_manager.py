@@ -2,19 +2,40 @@
 Browser and page management for automation.
 """
 
+import hashlib
+import json
+import os
 import time
+from urllib.parse import urlparse
 from playwright.sync_api import sync_playwright
 from config.settings import settings
+from core.browser_daemon import BrowserDaemonClient
 
 class BrowserManager:
     """Manages browser lifecycle and page operations."""
     
-    def __init__(self):
-        """Initialize the browser manager."""
+    def __init__(self, storage_url: str = None, storage_user: str = None, profile: str = None):
+        """
+        Initialize the browser manager.
+        
+        Args:
+            storage_url: Target URL used to key the persisted storage state (optional)
+            storage_user: User name used to key the persisted storage state (optional)
+            profile: Browser performance profile name (default from settings)
+        """
         self.playwright = None
         self.browser = None
+        self.context = None
         self.page = None
         self._context_manager = None
+        self.storage_url = storage_url
+        self.storage_user = storage_user
+        self.storage_state_restored = False
+        # Login time (mtime) of the restored storage state; saving keeps it so the expiry does not slide
+        self.storage_state_login_time = None
+        self.profile = settings.get_browser_profile(profile)
+        self.daemon_client = BrowserDaemonClient() if settings.BROWSER_DAEMON_URL else None
+        self.daemon_lease = None
     
     def __enter__(self):
         """Context manager entry."""
@@ -30,23 +51,65 @@ class BrowserManager:
         self._context_manager = sync_playwright()
         self.playwright = self._context_manager.__enter__()
         
-        self.browser = self.playwright.chromium.launch(
-            headless=settings.BROWSER_HEADLESS,
-            chromium_sandbox=True,
-            env={},
-            args=settings.BROWSER_ARGS
+        self.browser = self.connect_daemon_browser() if self.daemon_client else None
+        if not self.browser:
+            self.browser = self.playwright.chromium.launch(
+                headless=self.profile["headless"],
+                chromium_sandbox=True,
+                env={},
+                args=settings.BROWSER_ARGS + self.profile["args"]
+            )
+        
+        storage_state_path = self.get_valid_storage_state_path()
+        self.storage_state_restored = storage_state_path is not None
+        if self.storage_state_restored:
+            self.storage_state_login_time = os.path.getmtime(storage_state_path)
+            print(f"Restoring browser storage state from {storage_state_path}")
+        
+        self.context = self.browser.new_context(
+            storage_state=storage_state_path,
+            viewport=self.profile["viewport"],
+            device_scale_factor=self.profile["device_scale_factor"],
+            reduced_motion=self.profile["reduced_motion"]
         )
+        self.page = self.context.new_page()
+    
+    def connect_daemon_browser(self):
+        """
+        Lease the warm browser from the browser daemon and connect to it.
         
-        self.page = self.browser.new_page()
-        self.page.set_viewport_size({
-            "width": settings.BROWSER_WIDTH, 
-            "height": settings.BROWSER_HEIGHT
-        })
+        Returns:
+            Connected browser, or None if the daemon is unavailable
+        """
+        try:
+            self.daemon_lease = self.daemon_client.lease()
+            browser = self.playwright.chromium.connect_over_cdp(self.daemon_lease["cdp_url"])
+            print(f"Using warm browser from daemon (generation {self.daemon_lease['generation']})")
+            return browser
+        except Exception as e:
+            print(f"Browser daemon unavailable ({e}), launching a new browser")
+            self.release_daemon_lease()
+            return None
+    
+    def release_daemon_lease(self):
+        """Return the leased daemon browser, if any."""
+        if not self.daemon_lease:
+            return
+        
+        try:
+            self.daemon_client.release(self.daemon_lease["lease_id"])
+        except Exception as e:
+            print(f"Failed to release browser daemon lease: {e}")
+        self.daemon_lease = None
     
     def close_browser(self):
         """Close the browser and cleanup resources."""
+        if self.daemon_lease and self.context:
+            # Only this run's context is closed; the daemon keeps the browser warm
+            self.context.close()
         if self.browser:
             self.browser.close()
+        self.release_daemon_lease()
         if self._context_manager:
             self._context_manager.__exit__(None, None, None)
     
@@ -60,10 +123,10 @@ class BrowserManager:
     
     def get_current_page(self):
         """Get the current active page, switching if necessary."""
-        if not self.browser:
+        if not self.context:
             return self.page
         
-        all_pages = self.browser.contexts[0].pages
+        all_pages = self.context.pages
         if len(all_pages) > 1 and all_pages[-1] != self.page:
             self.page = all_pages[-1]
             print("Switched to new page/tab")
@@ -81,3 +144,70 @@ class BrowserManager:
         """Wait for a specified number of seconds."""
         wait_time = seconds if seconds is not None else settings.DEFAULT_WAIT_TIME
         time.sleep(wait_time)
+    
+    def get_storage_state_path(self) -> str:
+        """
+        Get the storage state file path for the configured target URL and user.
+        
+        Returns:
+            Path of the storage state file, or None if storage reuse is not configured
+        """
+        if not settings.REUSE_STORAGE_STATE or not self.storage_url:
+            return None
+        
+        parsed_url = urlparse(self.storage_url)
+        key = f"{parsed_url.scheme}://{parsed_url.netloc}|{self.storage_user or ''}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(settings.STORAGE_STATE_DIR, f"{digest}.json")
+    
+    def get_valid_storage_state_path(self) -> str:
+        """
+        Get the storage state file path if it exists and has not expired.
+        
+        Expired storage state files are removed so that the next run logs in again.
+        
+        Returns:
+            Path of a usable storage state file, or None
+        """
+        storage_state_path = self.get_storage_state_path()
+        if not storage_state_path or not os.path.exists(storage_state_path):
+            return None
+        
+        age = time.time() - os.path.getmtime(storage_state_path)
+        if age > settings.STORAGE_STATE_MAX_AGE:
+            print(f"Browser storage state expired ({int(age)}s old), logging in again")
+            self.clear_storage_state()
+            return None
+        
+        return storage_state_path
+    
+    def save_storage_state(self):
+        """
+        Persist the current context's cookies and localStorage for later runs.
+        
+        Only call this once the session is known to be authenticated. The file is
+        readable by the current user only. A restored session keeps the modification
+        time of its file, so STORAGE_STATE_MAX_AGE counts from the original login.
+        """
+        storage_state_path = self.get_storage_state_path()
+        if not storage_state_path or not self.context:
+            return
+        
+        os.makedirs(os.path.dirname(storage_state_path), mode=0o700, exist_ok=True)
+        storage_state = self.context.storage_state()
+        
+        # Write a private temporary file and move it into place, so no reader sees a partial file
+        temp_path = f"{storage_state_path}.{os.getpid()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as state_file:
+            json.dump(storage_state, state_file)
+        if self.storage_state_login_time is not None:
+            os.utime(temp_path, (self.storage_state_login_time, self.storage_state_login_time))
+        os.replace(temp_path, storage_state_path)
+        print(f"Saved browser storage state to {storage_state_path}")
+    
+    def clear_storage_state(self):
+        """Remove the persisted storage state for the configured target URL and user."""
+        storage_state_path = self.get_storage_state_path()
+        if storage_state_path and os.path.exists(storage_state_path):
+            os.remove(storage_state_path)
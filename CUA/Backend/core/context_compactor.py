@@ -0,0 +1,149 @@
+"""
+Conversation-context compaction for long computer-use sessions.
+"""
+
+from config.settings import settings
+from config.system_instructions import SystemInstructions
+from utils.telemetry import telemetry
+
+ACTION_FIELDS = ("x", "y", "button", "text", "keys", "scroll_x", "scroll_y", "ms")
+
+def describe_action(action) -> str:
+    """
+    Describe a computer call action in one short line.
+    
+    Args:
+        action: Computer call action object
+    
+    Returns:
+        Text such as "click(x=120, y=340, button='left')"
+    """
+    fields = []
+    for field in ACTION_FIELDS:
+        value = getattr(action, field, None)
+        if value not in (None, "", []):
+            fields.append(f"{field}={value!r}")
+    return f"{action.type}({', '.join(fields)})"
+
+class ContextCompactor:
+    """
+    Tracks response-chain growth and decides when to start a fresh chain.
+    
+    Every follow-up request chained through `previous_response_id` carries all
+    earlier screenshots in the server-side context. When the chain gets long or
+    its input token count passes the limit, the next screenshot is sent on a new
+    chain together with a compact text summary of the work done so far.
+    """
+    
+    def __init__(self, task_prompt: str, enabled: bool = None, max_iterations: int = None,
+                 max_input_tokens: int = None, max_summary_steps: int = None):
+        """
+        Initialize the compactor.
+        
+        Args:
+            task_prompt: Original task prompt, repeated at the top of every summary
+            enabled: Whether compaction is enabled (default from settings)
+            max_iterations: Iterations on one chain before compacting (default from settings)
+            max_input_tokens: Input tokens of the latest response that trigger compaction (default from settings)
+            max_summary_steps: Most recent action steps kept in the summary (default from settings)
+        """
+        self.task_prompt = task_prompt.strip()
+        self.enabled = settings.CONTEXT_COMPACTION if enabled is None else enabled
+        self.max_iterations = max_iterations or settings.CONTEXT_COMPACT_MAX_ITERATIONS
+        self.max_input_tokens = max_input_tokens or settings.CONTEXT_COMPACT_MAX_INPUT_TOKENS
+        self.max_summary_steps = max_summary_steps or settings.CONTEXT_SUMMARY_MAX_STEPS
+        
+        self.action_history = []
+        self.notes = []
+        self.chain_iterations = 0
+        self.last_input_tokens = 0
+        self.stats = {"compactions": 0, "input_tokens": 0, "output_tokens": 0, "peak_input_tokens": 0}
+    
+    def observe(self, response):
+        """
+        Record token usage and reasoning notes of a model response.
+        
+        The input token count and its growth since the previous response are
+        recorded on the current telemetry iteration.
+        
+        Args:
+            response: Response returned by the Responses API
+        """
+        self.chain_iterations += 1
+        
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "input_tokens", None)
+        if input_tokens is not None:
+            output_tokens = getattr(usage, "output_tokens", 0) or 0
+            telemetry.record("input_tokens", input_tokens)
+            telemetry.record("output_tokens", output_tokens)
+            telemetry.record("input_token_growth", input_tokens - self.last_input_tokens)
+            self.last_input_tokens = input_tokens
+            self.stats["input_tokens"] += input_tokens
+            self.stats["output_tokens"] += output_tokens
+            self.stats["peak_input_tokens"] = max(self.stats["peak_input_tokens"], input_tokens)
+        
+        for item in response.output:
+            if getattr(item, "type", None) == "reasoning":
+                for summary_item in getattr(item, "summary", None) or []:
+                    if getattr(summary_item, "text", ""):
+                        self.notes.append(summary_item.text.strip())
+            elif getattr(item, "type", None) == "message":
+                for content_item in getattr(item, "content", None) or []:
+                    if getattr(content_item, "text", ""):
+                        self.notes.append(content_item.text.strip())
+    
+    def record_actions(self, actions: list):
+        """
+        Record a batch of executed actions for the summary.
+        
+        Args:
+            actions: Computer call action objects executed as one batch
+        """
+        self.action_history.append("; ".join(describe_action(action) for action in actions))
+    
+    def should_compact(self) -> bool:
+        """Check if the next screenshot should start a fresh response chain."""
+        if not self.enabled:
+            return False
+        return self.chain_iterations >= self.max_iterations or self.last_input_tokens >= self.max_input_tokens
+    
+    def build_summary(self, extra_note: str = None) -> str:
+        """
+        Build the text that opens a fresh response chain.
+        
+        Args:
+            extra_note: Additional instruction appended to the summary (optional)
+        
+        Returns:
+            Task prompt followed by the recent action history and notes
+        """
+        steps = self.action_history[-self.max_summary_steps:]
+        first_step = len(self.action_history) - len(steps) + 1
+        action_history = "\n".join(f"{first_step + index}. {step}" for index, step in enumerate(steps)) or "None"
+        notes = "\n".join(f"- {note}" for note in self.notes[-self.max_summary_steps:]) or "None"
+        
+        summary = SystemInstructions.COMPACTED_CONTEXT_TEMPLATE.format(
+            task_prompt=self.task_prompt,
+            action_history=action_history,
+            notes=notes
+        )
+        if extra_note:
+            summary += "\n" + extra_note
+        return summary
+    
+    def mark_compacted(self):
+        """Reset the chain counters after a fresh chain was started."""
+        self.chain_iterations = 0
+        self.stats["compactions"] += 1
+        telemetry.record("context_compacted", True)
+        print(f"Context compacted: new response chain after {len(self.action_history)} action steps")
+    
+    def print_summary(self):
+        """Print token usage and compaction counts for the run."""
+        if not self.stats["input_tokens"]:
+            return
+        print(
+            f"Tokens: {self.stats['input_tokens']} input (peak {self.stats['peak_input_tokens']} per call), "
+            f"{self.stats['output_tokens']} output | Context compactions: {self.stats['compactions']}"
+        )
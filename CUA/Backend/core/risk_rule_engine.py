@@ -0,0 +1,363 @@
+"""
+Browser-free claim risk scoring with the Frontend risk rule set.
+
+The rules and thresholds are read from `RiskAnalysisData` in
+Frontend/js/risk-analysis-data.js, so the browser and this engine share a single
+source of truth. Rule conditions are compiled into vectorized NumPy predicates
+and whole claim batches are scored column-wise.
+
+Two scoring modes mirror the two JavaScript implementations:
+- "utils": `RiskAnalysisUtils` (rule weights plus a bonus per High severity
+  failure, thresholds from `riskThresholds`, critical-first recommendation).
+- "report": `RiskAnalysisApp.calculateRiskScore` in risk-score.js (points per
+  failed rule severity, fixed level cut-offs, Step 4 recommendation action).
+"""
+
+import ast
+import datetime
+import json
+import numpy as np
+from config.settings import settings
+
+SCORING_MODES = ("utils", "report")
+CONDITION_VARIABLES = ("claimAmount", "daysSincePolicyStart", "daysSinceIncident")
+
+# RiskAnalysisUtils.calculateRiskScore
+DEFAULT_RULE_WEIGHT = 10
+CRITICAL_RULE_BONUS = 10
+
+# RiskAnalysisApp.calculateRiskScore / getRiskLevel / getRecommendation
+REPORT_SEVERITY_POINTS = {"High": 30, "Medium": 20, "Low": 10}
+REPORT_LEVEL_CUTOFFS = {"High": 60, "Medium": 30}
+REPORT_RECOMMENDATIONS = {"High": "Escalate for Review", "Medium": "Investigate Further", "Low": "Approve"}
+
+# RiskAnalysisUtils.getRecommendation
+UTILS_CRITICAL_RECOMMENDATION = "Investigate - Critical violations detected"
+UTILS_RECOMMENDATIONS = {
+    "Low": "Approve - Low risk claim",
+    "Medium": "Review - Moderate risk requires verification",
+    "High": "Escalate - High risk requires senior approval"
+}
+
+_JS_OPERATORS = (("===", "=="), ("!==", "!="), ("&&", " and "), ("||", " or "))
+_COMPARE_FUNCTIONS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal
+}
+_ARITHMETIC_FUNCTIONS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide
+}
+
+def load_rule_set(path: str = None) -> dict:
+    """
+    Load the rules and risk thresholds from risk-analysis-data.js.
+    
+    Args:
+        path: Path of risk-analysis-data.js (default from settings)
+    
+    Returns:
+        Dictionary with "rules" (by claim type) and "riskThresholds"
+    """
+    with open(path or settings.RISK_RULES_PATH, "r", encoding="utf-8") as source_file:
+        source = source_file.read()
+    
+    data_start = source.index("const RiskAnalysisData")
+    return {
+        key: json.loads(_js_literal_to_json(_extract_js_object(source, key, data_start)))
+        for key in ("rules", "riskThresholds")
+    }
+
+def _extract_js_object(source: str, key: str, start: int = 0) -> str:
+    """Extract the `{...}` literal assigned to `key:` in JavaScript source."""
+    key_index = source.index(f"{key}:", start)
+    open_index = source.index("{", key_index)
+    depth = 0
+    index = open_index
+    while index < len(source):
+        char = source[index]
+        if char in "\"'`":
+            index = _skip_js_string(source, index)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return source[open_index:index + 1]
+        index += 1
+    raise ValueError(f"Unterminated object literal for '{key}'")
+
+def _skip_js_string(source: str, index: int) -> int:
+    """Return the index just past the string literal starting at `index`."""
+    quote = source[index]
+    index += 1
+    while source[index] != quote:
+        index += 2 if source[index] == "\\" else 1
+    return index + 1
+
+def _js_literal_to_json(literal: str) -> str:
+    """Convert a JavaScript object literal (unquoted keys, trailing commas) to JSON."""
+    parts = []
+    index = 0
+    while index < len(literal):
+        char = literal[index]
+        if char in "\"'":
+            end = _skip_js_string(literal, index)
+            parts.append(json.dumps(literal[index + 1:end - 1]) if char == "'" else literal[index:end])
+            index = end
+        elif char.isalpha() or char == "_":
+            end = index
+            while end < len(literal) and (literal[end].isalnum() or literal[end] == "_"):
+                end += 1
+            word = literal[index:end]
+            next_char = literal[end:].lstrip()[:1]
+            parts.append(f'"{word}"' if next_char == ":" else word)
+            index = end
+        elif char == ",":
+            next_char = literal[index + 1:].lstrip()[:1]
+            if next_char not in ("}", "]"):
+                parts.append(char)
+            index += 1
+        else:
+            parts.append(char)
+            index += 1
+    return "".join(parts)
+
+def compile_condition(condition: str):
+    """
+    Compile a rule condition into a vectorized predicate.
+    
+    Only comparisons, boolean operators and arithmetic over the variables in
+    CONDITION_VARIABLES and numeric literals are accepted; nothing is evaluated.
+    
+    Args:
+        condition: Condition expression from the rule set (e.g. "claimAmount > 500000")
+    
+    Returns:
+        Function mapping a dictionary of NumPy columns to a boolean array
+    
+    Raises:
+        ValueError: If the condition uses unsupported syntax
+    """
+    expression = condition
+    for js_operator, python_operator in _JS_OPERATORS:
+        expression = expression.replace(js_operator, python_operator)
+    
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid rule condition '{condition}': {e}")
+    return _compile_node(tree.body, condition)
+
+def _compile_node(node, condition: str):
+    """Compile one expression node into a function of the columns."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        value = node.value
+        return lambda columns: value
+    
+    if isinstance(node, ast.Name) and node.id in CONDITION_VARIABLES:
+        name = node.id
+        return lambda columns: columns[name]
+    
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARE_FUNCTIONS for op in node.ops):
+        operands = [_compile_node(operand, condition) for operand in [node.left, *node.comparators]]
+        functions = [_COMPARE_FUNCTIONS[type(op)] for op in node.ops]
+        
+        def compare(columns):
+            values = [operand(columns) for operand in operands]
+            return np.logical_and.reduce([
+                function(values[index], values[index + 1]) for index, function in enumerate(functions)
+            ])
+        
+        return compare
+    
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(operand, condition) for operand in node.values]
+        reducer = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return lambda columns: reducer.reduce([operand(columns) for operand in operands])
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        operand = _compile_node(node.operand, condition)
+        function = np.logical_not if isinstance(node.op, ast.Not) else np.negative
+        return lambda columns: function(operand(columns))
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC_FUNCTIONS:
+        left = _compile_node(node.left, condition)
+        right = _compile_node(node.right, condition)
+        function = _ARITHMETIC_FUNCTIONS[type(node.op)]
+        return lambda columns: function(left(columns), right(columns))
+    
+    raise ValueError(f"Unsupported expression in rule condition '{condition}': {ast.dump(node)}")
+
+class RiskRuleEngine:
+    """Scores claim batches against the shared risk rule set without a browser."""
+    
+    def __init__(self, rule_set: dict = None, path: str = None):
+        """
+        Initialize the engine and compile every rule condition.
+        
+        Args:
+            rule_set: Dictionary with "rules" and "riskThresholds" (default: loaded from path)
+            path: Path of risk-analysis-data.js (default from settings)
+        """
+        rule_set = rule_set or load_rule_set(path)
+        self.thresholds = rule_set["riskThresholds"]
+        self.rules = [rule for claim_type in rule_set["rules"] for rule in rule_set["rules"][claim_type]]
+        self.rule_ids = [rule["id"] for rule in self.rules]
+        self.rule_types = np.array([rule["type"] for rule in self.rules])
+        self.weights = np.array([rule.get("weight") or DEFAULT_RULE_WEIGHT for rule in self.rules], dtype=np.int64)
+        self.is_critical = np.array([rule["severity"] == "High" for rule in self.rules])
+        self.report_points = np.array(
+            [REPORT_SEVERITY_POINTS.get(rule["severity"], 0) for rule in self.rules], dtype=np.int64
+        )
+        self.predicates = [self._compile_rule(rule) for rule in self.rules]
+    
+    def _compile_rule(self, rule: dict):
+        """Compile a rule condition; a broken condition never fails, like the JavaScript catch."""
+        try:
+            return compile_condition(rule["condition"])
+        except ValueError as e:
+            print(f"Skipping rule {rule['id']}: {e}")
+            return lambda columns: np.zeros(len(columns["claimAmount"]), dtype=bool)
+    
+    def build_columns(self, claims: list, mode: str = "utils", as_of: datetime.date = None) -> dict:
+        """
+        Convert claim dictionaries into the columns used by rule conditions.
+        
+        Args:
+            claims: Claims with claimType, claimAmount, policyStartDate and incidentDate
+            mode: "utils" or "report" (see module docstring)
+            as_of: Date the day counts are measured against (default: today in UTC)
+        
+        Returns:
+            Dictionary of NumPy columns keyed by condition variable, plus "claimType"
+        """
+        as_of = np.datetime64(as_of or datetime.datetime.now(datetime.timezone.utc).date(), "D")
+        policy_start = np.array([claim.get("policyStartDate") or "NaT" for claim in claims], dtype="datetime64[D]")
+        incident = np.array([claim.get("incidentDate") or "NaT" for claim in claims], dtype="datetime64[D]")
+        claim_amount = np.array([_to_number(claim.get("claimAmount")) for claim in claims], dtype=np.float64)
+        
+        if mode == "report":
+            # risk-score.js parses the amount with parseInt and measures the policy age at the incident
+            claim_amount = np.trunc(claim_amount)
+            days_since_policy_start = _to_days(incident - policy_start)
+        else:
+            days_since_policy_start = _to_days(as_of - policy_start)
+        
+        return {
+            "claimType": np.array([claim.get("claimType") or "" for claim in claims]),
+            "claimAmount": claim_amount,
+            "daysSincePolicyStart": days_since_policy_start,
+            "daysSinceIncident": _to_days(as_of - incident)
+        }
+    
+    def evaluate(self, columns: dict, selected_rules: set = None) -> np.ndarray:
+        """
+        Evaluate every rule of each claim's type.
+        
+        Args:
+            columns: Columns from build_columns
+            selected_rules: Rule ids to evaluate (default: all rules, like the Step 2 default selection)
+        
+        Returns:
+            Boolean matrix of shape (claims, rules); True marks a failed rule
+        """
+        claim_types = columns["claimType"]
+        failed = np.zeros((len(claim_types), len(self.rules)), dtype=bool)
+        for index, (rule_id, predicate) in enumerate(zip(self.rule_ids, self.predicates)):
+            if selected_rules is not None and rule_id not in selected_rules:
+                continue
+            applies = claim_types == self.rule_types[index]
+            if applies.any():
+                failed[:, index] = np.logical_and(applies, predicate(columns))
+        return failed
+    
+    def score_batch(self, claims: list, mode: str = "utils", as_of: datetime.date = None,
+                    selected_rules: set = None) -> dict:
+        """
+        Score a batch of claims.
+        
+        Args:
+            claims: Claim dictionaries with the RiskAnalysisData.sampleClaims fields
+            mode: "utils" or "report" (see module docstring)
+            as_of: Date the day counts are measured against (default: today in UTC)
+            selected_rules: Rule ids to evaluate (default: all rules)
+        
+        Returns:
+            Dictionary with "score", "level" and "recommendation" arrays, the
+            "failed" rule matrix and the matching "rule_ids"
+        """
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{mode}'. Available modes: {', '.join(SCORING_MODES)}")
+        
+        failed = self.evaluate(self.build_columns(claims, mode, as_of), selected_rules)
+        has_critical = (failed & self.is_critical).any(axis=1)
+        
+        if mode == "report":
+            score = np.minimum(failed @ self.report_points, 100)
+            level = np.select(
+                [score >= REPORT_LEVEL_CUTOFFS["High"], score >= REPORT_LEVEL_CUTOFFS["Medium"]],
+                ["High", "Medium"],
+                "Low"
+            )
+            recommendation = np.vectorize(REPORT_RECOMMENDATIONS.get, otypes=[object])(level)
+        else:
+            score = np.minimum(failed @ self.weights + (failed & self.is_critical).sum(axis=1) * CRITICAL_RULE_BONUS, 100)
+            level = np.select(
+                [score <= self.thresholds["low"]["max"], score <= self.thresholds["medium"]["max"]],
+                ["Low", "Medium"],
+                "High"
+            )
+            recommendation = np.where(
+                has_critical,
+                UTILS_CRITICAL_RECOMMENDATION,
+                np.vectorize(UTILS_RECOMMENDATIONS.get, otypes=[object])(level)
+            )
+        
+        return {
+            "score": score,
+            "level": level,
+            "recommendation": recommendation,
+            "failed": failed,
+            "rule_ids": self.rule_ids
+        }
+    
+    def score_claim(self, claim: dict, mode: str = "utils", as_of: datetime.date = None,
+                    selected_rules: set = None) -> dict:
+        """
+        Score a single claim.
+        
+        Returns:
+            Dictionary with score, level, recommendation, failedRules and criticalRules (rule ids)
+        """
+        result = self.score_batch([claim], mode, as_of, selected_rules)
+        failed_rules = [rule_id for rule_id, failed in zip(self.rule_ids, result["failed"][0]) if failed]
+        return {
+            "score": int(result["score"][0]),
+            "level": str(result["level"][0]),
+            "recommendation": str(result["recommendation"][0]),
+            "failedRules": failed_rules,
+            "criticalRules": [
+                rule_id for rule_id, critical in zip(self.rule_ids, self.is_critical) if critical and rule_id in failed_rules
+            ]
+        }
+
+def _to_days(delta: np.ndarray) -> np.ndarray:
+    """Convert day deltas to floats; missing dates become NaN so every comparison on them is false."""
+    days = delta.astype(np.float64)
+    days[np.isnat(delta)] = np.nan
+    return days
+
+def _to_number(value) -> float:
+    """Convert a claim amount to float, using NaN for missing or invalid values like parseFloat."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
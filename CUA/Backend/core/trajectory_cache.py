@@ -0,0 +1,129 @@
+"""
+Trajectory recording and deterministic replay for repetitive workflows.
+"""
+
+import hashlib
+import json
+import os
+from types import SimpleNamespace
+from config.settings import settings
+from utils.screenshot_utils import screenshot_hash_distance
+
+class TrajectoryCache:
+    """Records (screenshot hash, actions) pairs and replays them on matching screens."""
+    
+    def __init__(self, workflow_key: str, mode: str = None, directory: str = None, match_threshold: int = None):
+        """
+        Initialize the trajectory cache.
+        
+        Args:
+            workflow_key: Text identifying the workflow (e.g. the task prompt)
+            mode: "off", "record" or "replay" (default from settings)
+            directory: Directory holding trajectory files (default from settings)
+            match_threshold: Maximum hash distance treated as a visual match (default from settings)
+        """
+        self.mode = mode or settings.TRAJECTORY_MODE
+        self.directory = directory or settings.TRAJECTORY_DIR
+        self.match_threshold = match_threshold if match_threshold is not None else settings.TRAJECTORY_MATCH_THRESHOLD
+        
+        workflow_digest = hashlib.sha256(workflow_key.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(self.directory, f"{workflow_digest}.jsonl")
+        
+        self.recorded_steps = []
+        self.replay_steps = self._load_steps() if self.is_replaying else []
+        self.replay_cursor = 0
+        self.replayed_count = 0
+    
+    @property
+    def is_active(self) -> bool:
+        """Check if screens need hashing for recording or replay."""
+        return self.is_recording or self.is_replaying
+    
+    @property
+    def is_recording(self) -> bool:
+        """Check if new steps are being recorded."""
+        return self.mode == "record"
+    
+    @property
+    def is_replaying(self) -> bool:
+        """Check if recorded steps are being replayed."""
+        return self.mode == "replay"
+    
+    def record_step(self, screenshot_hash: str, actions: list):
+        """
+        Record the actions the model chose for a given screen.
+        
+        Args:
+            screenshot_hash: Hash of the screenshot the model acted on
+            actions: Computer call action objects executed as one batch
+        """
+        if not self.is_recording or not screenshot_hash:
+            return
+        
+        # Screenshot requests carry no state change worth replaying
+        actions_data = [self._serialize_action(action) for action in actions]
+        actions_data = [data for data in actions_data if data.get("type") != "screenshot"]
+        if not actions_data:
+            return
+        
+        self.recorded_steps.append({
+            "step": len(self.recorded_steps),
+            "screenshot_hash": screenshot_hash,
+            "actions": actions_data
+        })
+    
+    def match_step(self, screenshot_hash: str):
+        """
+        Find the next recorded actions for the current screen.
+        
+        Args:
+            screenshot_hash: Hash of the current screenshot
+        
+        Returns:
+            List of action objects to execute locally, or None on divergence
+        """
+        if not self.is_replaying:
+            return None
+        
+        for index in range(self.replay_cursor, len(self.replay_steps)):
+            step = self.replay_steps[index]
+            if screenshot_hash_distance(step["screenshot_hash"], screenshot_hash) <= self.match_threshold:
+                self.replay_cursor = index + 1
+                self.replayed_count += len(step["actions"])
+                return [SimpleNamespace(**action) for action in step["actions"]]
+        
+        return None
+    
+    def save(self):
+        """Write the recorded trajectory, replacing any previous one for this workflow."""
+        if not self.is_recording or not self.recorded_steps:
+            return
+        
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as trajectory_file:
+            for step in self.recorded_steps:
+                trajectory_file.write(json.dumps(step) + "\n")
+        os.replace(temp_path, self.path)
+        print(f"Saved trajectory with {len(self.recorded_steps)} steps to {self.path}")
+    
+    def _load_steps(self) -> list:
+        """Load a recorded trajectory from disk."""
+        if not os.path.exists(self.path):
+            print(f"No recorded trajectory found at {self.path}")
+            return []
+        
+        with open(self.path, "r", encoding="utf-8") as trajectory_file:
+            steps = [json.loads(line) for line in trajectory_file if line.strip()]
+        
+        print(f"Loaded trajectory with {len(steps)} steps from {self.path}")
+        return steps
+    
+    @staticmethod
+    def _serialize_action(action) -> dict:
+        """Convert a computer call action into a JSON serializable dict."""
+        if isinstance(action, dict):
+            return dict(action)
+        if hasattr(action, "model_dump"):
+            return action.model_dump()
+        return dict(vars(action))
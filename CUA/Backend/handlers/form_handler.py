@@ -0,0 +1,90 @@
+"""
+Form handler for filling known forms through DOM selectors.
+"""
+
+from config.settings import settings
+
+class FormHandler:
+    """Fills forms described by a declarative form map without model round trips."""
+    
+    def __init__(self, browser_manager, form_maps: list):
+        """
+        Initialize the form handler.
+        
+        Args:
+            browser_manager: Browser manager instance
+            form_maps: Form map definitions (see config.form_maps)
+        """
+        self.browser_manager = browser_manager
+        self.form_maps = form_maps
+        self.attempted_forms = set()
+    
+    def find_form_map(self):
+        """
+        Find a form map matching the current page.
+        
+        Returns:
+            Matching form map or None if the page is unknown or already attempted
+        """
+        page = self.browser_manager.get_current_page()
+        
+        for form_map in self.form_maps:
+            if form_map["name"] in self.attempted_forms:
+                continue
+            if form_map["url_pattern"] not in page.url:
+                continue
+            if page.locator(form_map["ready_selector"]).count() == 0:
+                continue
+            return form_map
+        
+        return None
+    
+    def try_fill(self, form_data: dict) -> bool:
+        """
+        Fill and submit a known form on the current page.
+        
+        The fast path only runs when every mapped field has a value and a unique
+        element on the page; anything else is left to the model.
+        
+        Args:
+            form_data: Values keyed by form map field name
+            
+        Returns:
+            True if the form was filled and submitted, False otherwise
+        """
+        form_map = self.find_form_map()
+        if not form_map:
+            return False
+        
+        page = self.browser_manager.get_current_page()
+        fields = form_map["fields"]
+        
+        if any(form_data.get(field) is None for field in fields):
+            print(f"Form fast path skipped for {form_map['name']}: missing field values")
+            return False
+        
+        if any(page.locator(selector).count() != 1 for selector in fields.values()):
+            print(f"Form fast path skipped for {form_map['name']}: ambiguous field selectors")
+            return False
+        
+        # Never retry a form the fast path has already touched
+        self.attempted_forms.add(form_map["name"])
+        
+        timeout = settings.FORM_FAST_PATH_TIMEOUT_MS
+        try:
+            for field, selector in fields.items():
+                print(f"Filling {selector} with {form_data[field]}")
+                page.fill(selector, str(form_data[field]), timeout=timeout)
+            
+            for selector in form_map.get("submit_steps", []):
+                print(f"Clicking {selector}")
+                page.click(selector, timeout=timeout)
+            
+            if form_map.get("done_selector"):
+                page.wait_for_selector(form_map["done_selector"], timeout=timeout)
+        except Exception as e:
+            print(f"Form fast path failed for {form_map['name']}: {e}")
+            return False
+        
+        print(f"Form fast path completed for {form_map['name']}")
+        return True
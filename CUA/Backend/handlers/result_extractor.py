@@ -0,0 +1,76 @@
+"""
+Result extractor that ends a run as soon as the task result is visible in the DOM.
+"""
+
+import re
+from config.settings import settings
+
+class ResultExtractor:
+    """Checks the current page for a configured result selector and pattern."""
+    
+    def __init__(self, browser_manager, extractors: list):
+        """
+        Initialize the result extractor.
+        
+        Args:
+            browser_manager: Browser manager instance
+            extractors: Result extractor definitions (see config.result_extractors)
+        """
+        self.browser_manager = browser_manager
+        self.extractors = extractors
+    
+    def try_extract(self) -> dict:
+        """
+        Extract the task result from the current page.
+        
+        Returns:
+            Structured result, or None if no extractor matches the page yet
+        """
+        page = self.browser_manager.get_current_page()
+        
+        for extractor in self.extractors:
+            if extractor["url_pattern"] not in page.url:
+                continue
+            
+            value = self._read_value(page, extractor["selector"], extractor["pattern"])
+            if value is None:
+                continue
+            
+            result = {
+                "source": "dom",
+                "extractor": extractor["name"],
+                "value": value,
+                "url": page.url
+            }
+            for field, field_spec in extractor.get("fields", {}).items():
+                result[field] = self._read_value(page, field_spec["selector"], field_spec["pattern"])
+            result["message"] = extractor["message_template"].format(**result)
+            return result
+        
+        return None
+    
+    def _read_value(self, page, selector: str, pattern: str) -> str:
+        """
+        Read the text of a unique element and match it against a pattern.
+        
+        Args:
+            page: Current Playwright page
+            selector: CSS selector of the element
+            pattern: Regular expression; its first group (or whole match) is the value
+        
+        Returns:
+            Matched value, or None if the element is missing, ambiguous or does not match
+        """
+        try:
+            locator = page.locator(selector)
+            if locator.count() != 1:
+                return None
+            text = locator.inner_text(timeout=settings.RESULT_EXTRACTION_TIMEOUT_MS)
+        except Exception as e:
+            print(f"Result extraction failed for {selector}: {e}")
+            return None
+        
+        match = re.search(pattern, text)
+        if not match:
+            return None
+        return match.group(1) if match.groups() else match.group(0)
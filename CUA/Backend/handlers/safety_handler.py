@@ -2,7 +2,7 @@
 Safety handler for managing safety checks and user confirmations.
 """
 
-from utils.screenshot_utils import encode_screenshot
+from utils.screenshot_utils import encode_screenshot_data_url
 from utils.api_utils import safe_api_call
 from utils.user_interaction import UserInteraction
 from config.system_instructions import SystemInstructions
@@ -14,12 +14,16 @@ class SafetyHandler:
         """Initialize the safety handler."""
         self.user_interaction = UserInteraction()
     
-    def handle_safety_checks(self, computer_call, response, action_handler, azure_client):
+    def handle_safety_checks(self, computer_calls, response, action_handler, azure_client):
         """
-        Handle safety checks with user confirmation.
+        Execute a batch of computer calls, asking for confirmation before each flagged call.
+        
+        The calls are executed in order. Every call_id is answered with one
+        computer_call_output carrying the final screenshot; calls that had pending
+        safety checks also carry their acknowledged_safety_checks.
         
         Args:
-            computer_call: The computer call with safety checks
+            computer_calls: The computer calls of the response, at least one with safety checks
             response: The current response object
             action_handler: Action handler instance
             azure_client: Azure OpenAI client instance
@@ -27,47 +31,54 @@ class SafetyHandler:
         Returns:
             Updated response object or None if user declines
         """
-        pending_safety_checks = computer_call.pending_safety_checks
-        
-        self._display_safety_warning(pending_safety_checks)
+        for computer_call in computer_calls:
+            pending_safety_checks = getattr(computer_call, 'pending_safety_checks', None)
+            if pending_safety_checks:
+                self._display_safety_warning(pending_safety_checks)
         
-        if not self._get_user_acknowledgment():
-            print(SystemInstructions.USER_INTERACTION_MESSAGES['user_declined'])
-            return None
+                if not self._get_user_acknowledgment():
+                    print(SystemInstructions.USER_INTERACTION_MESSAGES['user_declined'])
+                    return None
         
-        print(SystemInstructions.USER_INTERACTION_MESSAGES['safety_acknowledged'])
+                print(SystemInstructions.USER_INTERACTION_MESSAGES['safety_acknowledged'])
         
-        # Execute the action
-        action_handler.execute_action(computer_call.action)
+            # Execute the action
+            action_handler.execute_action(computer_call.action)
         action_handler.browser_manager.wait(1)
         
         # Get screenshot
         screenshot_bytes = action_handler.browser_manager.take_screenshot()
-        screenshot_base64 = encode_screenshot(screenshot_bytes)
+        image_url = encode_screenshot_data_url(screenshot_bytes)
+        del screenshot_bytes
         
-        # Create input with acknowledged safety checks
-        api_input = {
-            "type": "computer_call_output",
-            "call_id": computer_call.call_id,
-            "acknowledged_safety_checks": [
-                {
-                    "id": getattr(safety_check, 'id', ''),
-                    "code": getattr(safety_check, 'code', ''),
-                    "message": getattr(safety_check, 'message', '')
+        # Create one output per call, with the acknowledged safety checks of the flagged calls
+        api_input = []
+        for computer_call in computer_calls:
+            call_output = {
+                "type": "computer_call_output",
+                "call_id": computer_call.call_id,
+                "output": {
+                    "type": "input_image",
+                    "image_url": image_url
                 }
-                for safety_check in pending_safety_checks
-            ],
-            "output": {
-                "type": "input_image",
-                "image_url": f"data:image/png;base64,{screenshot_base64}"
             }
-        }
+            pending_safety_checks = getattr(computer_call, 'pending_safety_checks', None)
+            if pending_safety_checks:
+                call_output["acknowledged_safety_checks"] = [
+                    {
+                        "id": getattr(safety_check, 'id', ''),
+                        "code": getattr(safety_check, 'code', ''),
+                        "message": getattr(safety_check, 'message', '')
+                    }
+                    for safety_check in pending_safety_checks
+                ]
+            api_input.append(call_output)
         
         # Make API call with acknowledged safety checks
         def make_api_call_with_acknowledgment():
             return azure_client.create_followup_response(
                 response.id,
-                [api_input]
+                api_input
             )
         
         return safe_api_call(make_api_call_with_acknowledgment)
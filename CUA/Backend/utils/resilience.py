@@ -0,0 +1,336 @@
+"""
+Resilience primitives for API calls: rate limiting, backoff and circuit breaking.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import openai
+from config.settings import settings
+
+class ErrorKind:
+    """Classification of API call failures."""
+    
+    RATE_LIMIT = "rate_limit"
+    SERVER = "server"
+    TRANSIENT = "transient"
+    FATAL = "fatal"
+    
+    RETRYABLE = (RATE_LIMIT, SERVER, TRANSIENT)
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify an exception by its type and HTTP status code.
+    
+    Args:
+        error: Exception raised by the API call
+    
+    Returns:
+        One of the ErrorKind values
+    """
+    if isinstance(error, openai.RateLimitError):
+        return ErrorKind.RATE_LIMIT
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return ErrorKind.TRANSIENT
+    if isinstance(error, openai.InternalServerError):
+        return ErrorKind.SERVER
+    
+    status_code = getattr(error, "status_code", None)
+    if status_code == 429:
+        return ErrorKind.RATE_LIMIT
+    if status_code in (408, 409):
+        return ErrorKind.TRANSIENT
+    if isinstance(status_code, int) and status_code >= 500:
+        return ErrorKind.SERVER
+    if isinstance(status_code, int):
+        return ErrorKind.FATAL
+    
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return ErrorKind.TRANSIENT
+    return ErrorKind.FATAL
+
+def get_retry_after(error: Exception) -> float:
+    """
+    Read the server requested delay from a `Retry-After` style header.
+    
+    Args:
+        error: Exception raised by the API call
+    
+    Returns:
+        Delay in seconds, or None if the server did not ask for one
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class DecorrelatedJitterBackoff:
+    """Decorrelated jitter backoff: sleep = min(cap, uniform(base, previous * 3))."""
+    
+    def __init__(self, base_delay: float, max_delay: float):
+        """
+        Initialize the backoff generator.
+        
+        Args:
+            base_delay: Minimum delay in seconds
+            max_delay: Maximum delay in seconds
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._previous = base_delay
+    
+    def next_delay(self) -> float:
+        """Get the next randomized delay in seconds."""
+        self._previous = min(self.max_delay, random.uniform(self.base_delay, self._previous * 3))
+        return self._previous
+
+class TokenBucket:
+    """Thread-safe token bucket limiter shared by every caller in the process."""
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the token bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def pause(self, seconds: float):
+        """Stop handing out tokens for the given time (e.g. a server `Retry-After`)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+    
+    def acquire(self) -> float:
+        """
+        Block until a token is available.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    wait_time = (1 - self._tokens) / self.rate
+                else:
+                    self._updated = self._paused_until
+                    wait_time = self._paused_until - now
+            time.sleep(wait_time)
+            waited += wait_time
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker (closed -> open -> half-open with a single trial call)."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int, recovery_time: float):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive retryable failures that open the circuit
+            recovery_time: Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def before_call(self):
+        """
+        Reject the call if the circuit is open, moving to half-open after recovery.
+        
+        While half-open only one trial call is admitted; other callers are
+        rejected until it succeeds (closing the circuit) or fails (reopening it).
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.recovery_time - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(f"Circuit open, retry in {remaining:.1f}s")
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN and self._probe_in_flight:
+                raise CircuitOpenError("Circuit half-open, trial call in progress")
+            
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = True
+    
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+    
+    def record_ignored(self):
+        """End a call whose failure says nothing about the service's health (e.g. a 400)."""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Count a failure and open the circuit when the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"Circuit breaker opened after {self._failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+class ResiliencePolicy:
+    """Combines the limiter, backoff and circuit breaker around API calls."""
+    
+    def __init__(self, rate: float = None, burst: float = None, failure_threshold: int = None,
+                 recovery_time: float = None, max_delay: float = None):
+        """Initialize the policy (defaults from settings)."""
+        self.limiter = TokenBucket(
+            rate or settings.API_RATE_LIMIT_PER_SECOND,
+            burst or settings.API_RATE_LIMIT_BURST
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold or settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            recovery_time or settings.CIRCUIT_BREAKER_RECOVERY_TIME
+        )
+        self.max_delay = max_delay or settings.MAX_RETRY_DELAY
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "calls": 0,
+            "failures": 0,
+            "retries": 0,
+            "throttle_delay_s": 0.0,
+            "backoff_delay_s": 0.0,
+            "retry_after_honored": 0,
+            "circuit_rejections": 0,
+            "errors_by_kind": {}
+        }
+    
+    def call(self, func, max_retries: int, base_delay: float, on_retry=None, on_throttle=None):
+        """
+        Call a function with rate limiting, retries and circuit breaking.
+        
+        Args:
+            func: Function to call
+            max_retries: Maximum number of attempts
+            base_delay: Base backoff delay in seconds
+            on_retry: Optional callback receiving each backoff delay
+            on_throttle: Optional callback receiving each limiter wait
+        
+        Returns:
+            Result of the function call
+        """
+        backoff = DecorrelatedJitterBackoff(base_delay, self.max_delay)
+        
+        for attempt in range(max_retries):
+            try:
+                self.circuit_breaker.before_call()
+            except CircuitOpenError:
+                self._increment("circuit_rejections")
+                raise
+            
+            throttle_delay = self.limiter.acquire()
+            if throttle_delay:
+                self._increment("throttle_delay_s", throttle_delay)
+                if on_throttle:
+                    on_throttle(throttle_delay)
+            
+            self._increment("calls")
+            try:
+                result = func()
+            except Exception as e:
+                kind = classify_error(e)
+                self._record_failure(kind)
+                print(f"API call failed (attempt {attempt + 1}/{max_retries}, {kind}): {e}")
+                
+                if kind not in ErrorKind.RETRYABLE:
+                    self.circuit_breaker.record_ignored()
+                    raise
+                self.circuit_breaker.record_failure()
+                if attempt == max_retries - 1:
+                    print("Max retries reached. Raising exception.")
+                    raise
+                
+                delay = backoff.next_delay()
+                retry_after = get_retry_after(e)
+                if retry_after is not None:
+                    # The server knows best; pause every caller sharing the limiter
+                    delay = max(delay, min(retry_after, self.max_delay))
+                    self.limiter.pause(delay)
+                    self._increment("retry_after_honored")
+                
+                print(f"Waiting {delay:.1f} seconds before retry...")
+                self._increment("retries")
+                self._increment("backoff_delay_s", delay)
+                if on_retry:
+                    on_retry(delay)
+                time.sleep(delay)
+                continue
+            
+            self.circuit_breaker.record_success()
+            return result
+        
+        return None
+    
+    def get_metrics(self) -> dict:
+        """Get a snapshot of the throttling and retry metrics."""
+        with self._metrics_lock:
+            snapshot = dict(self.metrics)
+            snapshot["errors_by_kind"] = dict(self.metrics["errors_by_kind"])
+        snapshot["circuit_state"] = self.circuit_breaker.state
+        return snapshot
+    
+    def _increment(self, name: str, amount=1):
+        """Increment a metric counter."""
+        with self._metrics_lock:
+            self.metrics[name] += amount
+    
+    def _record_failure(self, kind: str):
+        """Count a failure by error kind."""
+        with self._metrics_lock:
+            self.metrics["failures"] += 1
+            self.metrics["errors_by_kind"][kind] = self.metrics["errors_by_kind"].get(kind, 0) + 1
+
+# Global policy shared by every engine in the process
+api_resilience = ResiliencePolicy()
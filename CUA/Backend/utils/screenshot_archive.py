@@ -0,0 +1,71 @@
+"""
+Content-addressed screenshot archive for auditing automation runs.
+"""
+
+import hashlib
+import json
+import os
+import time
+from config.settings import settings
+
+class ScreenshotArchive:
+    """Stores each distinct screenshot once under its hash and indexes every iteration."""
+    
+    def __init__(self, run_id: str, directory: str = None):
+        """
+        Initialize the archive.
+        
+        Args:
+            run_id: Identifier of the current run (e.g. the telemetry run id)
+            directory: Archive root directory (default from settings)
+        """
+        self.run_id = run_id
+        self.directory = directory or settings.SCREENSHOT_ARCHIVE_DIR
+        self.objects_dir = os.path.join(self.directory, "objects")
+        self.index_path = os.path.join(self.directory, "index.jsonl")
+        self.stats = {"frames": 0, "stored": 0, "deduplicated": 0, "bytes_written": 0}
+        os.makedirs(self.objects_dir, exist_ok=True)
+    
+    def get_object_path(self, digest: str) -> str:
+        """Get the storage path for a screenshot hash."""
+        return os.path.join(self.objects_dir, digest[:2], f"{digest[2:]}.png")
+    
+    def add(self, screenshot_bytes: bytes, step: int, action: str = "") -> str:
+        """
+        Archive a screenshot and append an index entry for it.
+        
+        Args:
+            screenshot_bytes: Raw PNG screenshot bytes
+            step: Iteration number within the run
+            action: Short description of the actions that produced the screen
+        
+        Returns:
+            SHA-256 hex digest of the screenshot
+        """
+        digest = hashlib.sha256(screenshot_bytes).hexdigest()
+        object_path = self.get_object_path(digest)
+        
+        if os.path.exists(object_path):
+            self.stats["deduplicated"] += 1
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            temp_path = f"{object_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as object_file:
+                object_file.write(screenshot_bytes)
+            os.replace(temp_path, object_path)
+            self.stats["stored"] += 1
+            self.stats["bytes_written"] += len(screenshot_bytes)
+        
+        entry = {"run": self.run_id, "step": step, "action": action, "hash": digest, "ts": round(time.time(), 3)}
+        with open(self.index_path, "a", encoding="utf-8") as index_file:
+            index_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        
+        self.stats["frames"] += 1
+        return digest
+    
+    def print_summary(self):
+        """Print how many frames were archived and how many were deduplicated."""
+        print(
+            f"Screenshot archive: {self.stats['frames']} frames, {self.stats['stored']} stored "
+            f"({self.stats['bytes_written'] / 1024:.0f} KB), {self.stats['deduplicated']} deduplicated"
+        )
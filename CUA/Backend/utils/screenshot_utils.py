@@ -6,6 +6,74 @@ import base64
 from PIL import Image
 from io import BytesIO
 
+PNG_DATA_URL_PREFIX = b"data:image/png;base64,"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Multiple of 3 so chunks encode without intermediate padding
+_ENCODE_CHUNK_SIZE = 3 * 64 * 1024
+
+class DataUrlEncoder:
+    """
+    Encodes screenshots to base64 data URLs through one reusable buffer.
+    
+    The prefix and base64 text are written into a preallocated bytearray in
+    small chunks, so the only full-size allocation per frame is the returned
+    string. The buffer is reused across frames and is not thread-safe.
+    """
+    
+    def __init__(self, prefix: bytes = PNG_DATA_URL_PREFIX):
+        """
+        Initialize the encoder.
+        
+        Args:
+            prefix: Data URL prefix written before the base64 payload
+        """
+        self.prefix = prefix
+        self._buffer = bytearray()
+    
+    def encode(self, screenshot_bytes: bytes) -> str:
+        """
+        Encode screenshot bytes as a data URL.
+        
+        Args:
+            screenshot_bytes: Raw screenshot bytes
+            
+        Returns:
+            Data URL string
+        """
+        total_length = len(self.prefix) + 4 * ((len(screenshot_bytes) + 2) // 3)
+        if len(self._buffer) < total_length:
+            # Grow with headroom so slightly larger frames do not reallocate
+            self._buffer = bytearray(total_length + total_length // 4)
+        
+        with memoryview(self._buffer) as view, memoryview(screenshot_bytes) as source:
+            offset = len(self.prefix)
+            view[:offset] = self.prefix
+            for start in range(0, len(source), _ENCODE_CHUNK_SIZE):
+                chunk = base64.b64encode(source[start:start + _ENCODE_CHUNK_SIZE])
+                view[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+            return str(view[:total_length], "ascii")
+    
+    @property
+    def buffer_size(self) -> int:
+        """Size of the reusable buffer in bytes."""
+        return len(self._buffer)
+
+_default_encoder = DataUrlEncoder()
+
+def encode_screenshot_data_url(screenshot_bytes: bytes) -> str:
+    """
+    Encode screenshot bytes to a PNG data URL using the shared buffer.
+    
+    Args:
+        screenshot_bytes: Raw screenshot bytes
+        
+    Returns:
+        Data URL string ("data:image/png;base64,...")
+    """
+    return _default_encoder.encode(screenshot_bytes)
+
 def encode_screenshot(screenshot_bytes: bytes) -> str:
     """
     Encode screenshot bytes to base64 string.
@@ -34,10 +102,18 @@ def save_screenshot(screenshot_bytes: bytes, filepath: str):
     """
     Save screenshot bytes to file.
     
+    PNG screenshots saved with a .png extension are written as-is; other
+    target formats are converted through PIL.
+    
     Args:
         screenshot_bytes: Raw screenshot bytes
         filepath: Path to save the screenshot
     """
+    if screenshot_bytes.startswith(PNG_SIGNATURE) and filepath.lower().endswith(".png"):
+        with open(filepath, "wb") as screenshot_file:
+            screenshot_file.write(screenshot_bytes)
+        return
+    
     image = Image.open(BytesIO(screenshot_bytes))
     image.save(filepath)
 
@@ -94,3 +170,43 @@ def resize_screenshot(screenshot_bytes: bytes, max_width: int = None, max_height
     output = BytesIO()
     image.save(output, format='PNG')
     return output.getvalue()
+
+def compute_screenshot_hash(screenshot_bytes: bytes, hash_size: int = 8) -> str:
+    """
+    Compute a perceptual difference hash (dHash) of a screenshot.
+    
+    Visually identical screens produce identical or near-identical hashes even
+    when the PNG bytes differ (e.g. caret blink or anti-aliasing noise).
+    
+    Args:
+        screenshot_bytes: Raw screenshot bytes
+        hash_size: Hash grid size; the hash has hash_size * hash_size bits
+        
+    Returns:
+        Hex encoded hash string
+    """
+    image = Image.open(BytesIO(screenshot_bytes)).convert("L")
+    image = image.resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = list(image.getdata())
+    
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    
+    return f"{value:0{hash_size * hash_size // 4}x}"
+
+def screenshot_hash_distance(hash_a: str, hash_b: str) -> int:
+    """
+    Compute the Hamming distance between two screenshot hashes.
+    
+    Args:
+        hash_a: First hex encoded hash
+        hash_b: Second hex encoded hash
+        
+    Returns:
+        Number of differing bits
+    """
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count("1")
@@ -0,0 +1,286 @@
+"""
+Per-iteration telemetry for the automation engine.
+"""
+
+import json
+import os
+import secrets
+import sys
+import time
+from contextlib import contextmanager
+from config.settings import settings
+
+class IterationSpan:
+    """Timing and size measurements for a single loop iteration."""
+    
+    def __init__(self, iteration: int):
+        """Initialize the span for the given iteration number."""
+        self.iteration = iteration
+        self.span_id = secrets.token_hex(8)
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = None
+        self.phases = {}
+        self.attributes = {"retries": 0, "retry_delay_s": 0, "throttle_delay_s": 0}
+    
+    def add_phase_time(self, phase: str, seconds: float):
+        """Accumulate time spent in a phase."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+    
+    def to_dict(self, run_id: str) -> dict:
+        """Convert the span to a flat dictionary for JSONL export."""
+        return {
+            "run_id": run_id,
+            "iteration": self.iteration,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": round((self.end_time_ns - self.start_time_ns) / 1e6, 3),
+            "phases_ms": {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()},
+            **self.attributes
+        }
+
+class Telemetry:
+    """Collects iteration spans for a run and exports them."""
+    
+    SERVICE_NAME = "cua-automation-engine"
+    
+    def __init__(self):
+        """Initialize an empty telemetry collector."""
+        self.run_id = None
+        self.run_start_ns = None
+        self.spans = []
+        self.current_span = None
+    
+    def start_run(self):
+        """Reset collected spans and start a new run (trace)."""
+        self.run_id = secrets.token_hex(16)
+        self.run_start_ns = time.time_ns()
+        self.spans = []
+        self.current_span = None
+    
+    def start_iteration(self, iteration: int) -> IterationSpan:
+        """Close any open span and start a new one for the iteration."""
+        self.end_iteration()
+        self.current_span = IterationSpan(iteration)
+        return self.current_span
+    
+    def end_iteration(self):
+        """Close the currently open span."""
+        if self.current_span is None:
+            return
+        self.current_span.end_time_ns = time.time_ns()
+        self.spans.append(self.current_span)
+        self.current_span = None
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as a phase of the current iteration."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current_span is not None:
+                self.current_span.add_phase_time(name, time.perf_counter() - start)
+    
+    def record(self, name: str, value):
+        """Set an attribute on the current iteration span."""
+        if self.current_span is not None:
+            self.current_span.attributes[name] = value
+    
+    def record_retry(self, delay: float):
+        """Count an API retry and its backoff delay on the current span."""
+        if self.current_span is not None:
+            self.current_span.attributes["retries"] += 1
+            self.current_span.attributes["retry_delay_s"] += delay
+    
+    def record_throttle(self, delay: float):
+        """Accumulate time spent waiting on the client-side rate limiter."""
+        if self.current_span is not None:
+            self.current_span.attributes["throttle_delay_s"] += delay
+    
+    def record_memory(self):
+        """Record the process peak resident set size on the current span."""
+        peak_rss_mb = get_peak_rss_mb()
+        if peak_rss_mb is not None:
+            self.record("peak_rss_mb", round(peak_rss_mb, 1))
+    
+    def export_jsonl(self, path: str):
+        """
+        Export one JSON object per iteration span.
+        
+        Args:
+            path: Output file path
+        """
+        with open(path, "w", encoding="utf-8") as jsonl_file:
+            for span in self.spans:
+                jsonl_file.write(json.dumps(span.to_dict(self.run_id)) + "\n")
+    
+    def export_otlp(self, path: str):
+        """
+        Export spans as OTLP/JSON (OpenTelemetry trace export format).
+        
+        The run is the root span; each iteration is a child span whose phase
+        timings and sizes are span attributes.
+        
+        Args:
+            path: Output file path
+        """
+        root_span_id = secrets.token_hex(8)
+        end_ns = self.spans[-1].end_time_ns if self.spans else time.time_ns()
+        otlp_spans = [{
+            "traceId": self.run_id,
+            "spanId": root_span_id,
+            "name": "run_automation",
+            "kind": 1,
+            "startTimeUnixNano": str(self.run_start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [_otlp_attribute("iterations", len(self.spans))]
+        }]
+        
+        for span in self.spans:
+            attributes = [_otlp_attribute("iteration", span.iteration)]
+            attributes += [
+                _otlp_attribute(f"phase.{phase}_ms", round(seconds * 1000, 3))
+                for phase, seconds in span.phases.items()
+            ]
+            attributes += [_otlp_attribute(key, value) for key, value in span.attributes.items()]
+            otlp_spans.append({
+                "traceId": self.run_id,
+                "spanId": span.span_id,
+                "parentSpanId": root_span_id,
+                "name": "iteration",
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_time_ns),
+                "endTimeUnixNano": str(span.end_time_ns),
+                "attributes": attributes
+            })
+        
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": "core.automation_engine"},
+                    "spans": otlp_spans
+                }]
+            }]
+        }
+        with open(path, "w", encoding="utf-8") as otlp_file:
+            json.dump(payload, otlp_file)
+    
+    def export(self, directory: str = None):
+        """
+        Export the run to JSONL and OTLP/JSON files in a directory.
+        
+        Args:
+            directory: Output directory (default from settings)
+        """
+        self.end_iteration()
+        if not self.spans:
+            return
+        
+        directory = directory or settings.TELEMETRY_DIR
+        os.makedirs(directory, exist_ok=True)
+        jsonl_path = os.path.join(directory, f"{self.run_id}.jsonl")
+        otlp_path = os.path.join(directory, f"{self.run_id}.otlp.json")
+        self.export_jsonl(jsonl_path)
+        self.export_otlp(otlp_path)
+        print(f"Telemetry exported to {jsonl_path} and {otlp_path}")
+    
+    def print_summary(self):
+        """Print a per-phase summary table for the run."""
+        self.end_iteration()
+        if not self.spans:
+            return
+        
+        phase_names = []
+        for span in self.spans:
+            for phase in span.phases:
+                if phase not in phase_names:
+                    phase_names.append(phase)
+        
+        grand_total = sum(sum(span.phases.values()) for span in self.spans) or 1.0
+        
+        print("=" * 72)
+        print(f"TELEMETRY SUMMARY ({len(self.spans)} iterations)")
+        print("=" * 72)
+        print(f"{'Phase':<20}{'Total (s)':>12}{'Mean (ms)':>12}{'P95 (ms)':>12}{'Max (ms)':>12}{'Share':>8}")
+        print("-" * 72)
+        for phase in phase_names:
+            samples = sorted(span.phases[phase] for span in self.spans if phase in span.phases)
+            total = sum(samples)
+            p95 = samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+            print(
+                f"{phase:<20}{total:>12.2f}{total / len(samples) * 1000:>12.1f}"
+                f"{p95 * 1000:>12.1f}{samples[-1] * 1000:>12.1f}{total / grand_total:>8.1%}"
+            )
+        print("-" * 72)
+        
+        payload_bytes = sum(span.attributes.get("payload_bytes", 0) for span in self.spans)
+        retries = sum(span.attributes["retries"] for span in self.spans)
+        retry_delay = sum(span.attributes["retry_delay_s"] for span in self.spans)
+        throttle_delay = sum(span.attributes["throttle_delay_s"] for span in self.spans)
+        print(
+            f"Payload sent: {payload_bytes / 1024 / 1024:.2f} MB | Retries: {retries} ({retry_delay:.1f}s backoff) "
+            f"| Throttled: {throttle_delay:.1f}s"
+        )
+        peak_rss = [span.attributes["peak_rss_mb"] for span in self.spans if "peak_rss_mb" in span.attributes]
+        if peak_rss:
+            print(f"Peak RSS: {peak_rss[0]:.1f} MB at first iteration, {peak_rss[-1]:.1f} MB at last iteration")
+        print("=" * 72)
+
+def get_peak_rss_mb() -> float:
+    """
+    Get the peak resident set size of the current process.
+    
+    Returns:
+        Peak RSS in megabytes, or None if it cannot be determined
+    """
+    try:
+        import resource
+    except ImportError:
+        return _get_windows_peak_rss_mb()
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def _get_windows_peak_rss_mb() -> float:
+    """Get the peak working set size on Windows via the process status API."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+        
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t)
+            ]
+        
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / 1024 / 1024
+    except (AttributeError, OSError):
+        return None
+
+def _otlp_attribute(key: str, value) -> dict:
+    """Convert a key/value pair into an OTLP attribute."""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+# Global telemetry instance
+telemetry = Telemetry()
@@ -0,0 +1,174 @@
+"""
+Bounded conversation history for long-running policy agent sessions.
+
+In memory the history keeps only the most recent turns, as compact records in a
+fixed-size ring: role and kind strings are interned and the content is cut to a
+short preview. Older turns fall out of the ring. Message counts are updated on
+every append, so a summary never has to scan the history.
+
+Keeping the full turns on disk is opt-in, because they contain the raw customer
+input: with a log directory (POLICY_HISTORY_DIR) every turn is written once, in
+full, to an append-only JSON Lines log readable by the current user only, and
+each record references its full payload (raw input, policy JSON, parsed intent)
+by its byte offset in the log.
+"""
+
+import json
+import os
+import sys
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional
+
+# Turns kept in memory
+DEFAULT_HISTORY_SIZE = int(os.getenv("POLICY_HISTORY_SIZE", "200"))
+# Directory of the on-disk history logs (unset or empty keeps only the in-memory ring)
+DEFAULT_HISTORY_DIR = os.getenv("POLICY_HISTORY_DIR", "")
+# Characters of the content kept in memory
+PREVIEW_CHARS = 200
+
+class HistoryEntry:
+    """Compact in-memory record of one conversation turn."""
+    
+    __slots__ = ("timestamp", "role", "kind", "content", "content_chars", "log_offset")
+    
+    def __init__(self, timestamp: str, role: str, kind: str, content: str, content_chars: int, log_offset: int):
+        """
+        Initialize the record.
+        
+        Args:
+            timestamp: ISO timestamp of the turn
+            role: 'user' or 'assistant'
+            kind: Name of the attached payload ('policy_data', 'intent', 'error') or ''
+            content: Content preview (at most PREVIEW_CHARS characters)
+            content_chars: Length of the full content
+            log_offset: Byte offset of the full turn in the history log (-1 if not logged)
+        """
+        self.timestamp = timestamp
+        self.role = role
+        self.kind = kind
+        self.content = content
+        self.content_chars = content_chars
+        self.log_offset = log_offset
+    
+    @property
+    def truncated(self) -> bool:
+        """Whether the in-memory content is only a preview."""
+        return self.content_chars > len(self.content)
+    
+    def __repr__(self) -> str:
+        return f"HistoryEntry({self.timestamp!r}, {self.role!r}, {self.kind!r}, {self.content!r})"
+
+class ConversationHistory:
+    """Fixed-size ring of recent turns, optionally backed by an append-only log of all turns."""
+    
+    def __init__(self, max_entries: int = DEFAULT_HISTORY_SIZE, log_dir: Optional[str] = DEFAULT_HISTORY_DIR):
+        """
+        Initialize the history.
+        
+        Args:
+            max_entries: Turns kept in memory
+            log_dir: Directory for the session's history log (default from
+                     POLICY_HISTORY_DIR; None or empty keeps no log, so turns older
+                     than the ring are dropped)
+        """
+        self.entries = deque(maxlen=max(1, max_entries))
+        self.counts = Counter()
+        self.total = 0
+        self.log_path = None
+        self._log_file = None
+        self._log_size = 0
+        
+        if log_dir:
+            # The directory and the log are created with the first turn
+            session_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+            self.log_path = os.path.join(log_dir, f"history_{session_id}.jsonl")
+    
+    def append(self, role: str, content: str, **payload: Any) -> HistoryEntry:
+        """
+        Record a turn.
+        
+        Args:
+            role: 'user' or 'assistant'
+            content: Full message text
+            payload: At most one attachment, e.g. policy_data=..., intent=... or error=...
+        
+        Returns:
+            The in-memory record
+        """
+        timestamp = datetime.now().isoformat()
+        role = sys.intern(role)
+        kind = sys.intern(next(iter(payload), ""))
+        content = content or ""
+        
+        log_offset = -1
+        if self.log_path:
+            record = {'timestamp': timestamp, 'role': role, 'content': content, **payload}
+            line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+            if self._log_file is None:
+                # The log holds customer input, so it is private to the current user
+                os.makedirs(os.path.dirname(self.log_path), mode=0o700, exist_ok=True)
+                fd = os.open(self.log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+                self._log_file = os.fdopen(fd, "ab")
+                self._log_size = self._log_file.tell()
+            log_offset = self._log_size
+            self._log_file.write(line)
+            self._log_file.flush()
+            self._log_size += len(line)
+        
+        entry = HistoryEntry(timestamp, role, kind, content[:PREVIEW_CHARS], len(content), log_offset)
+        self.entries.append(entry)
+        self.total += 1
+        self.counts[role] += 1
+        if kind:
+            self.counts[kind] += 1
+        return entry
+    
+    def load(self, entry: HistoryEntry) -> Dict[str, Any]:
+        """
+        Read the full turn of a record from the history log.
+        
+        Args:
+            entry: Record returned by append or found in entries
+        
+        Returns:
+            The turn with its full content and payload (only the in-memory fields
+            if the turn was not logged)
+        """
+        if entry.log_offset < 0 or not self.log_path:
+            return {'timestamp': entry.timestamp, 'role': entry.role, 'content': entry.content}
+        with open(self.log_path, "rb") as log_file:
+            log_file.seek(entry.log_offset)
+            return json.loads(log_file.readline())
+    
+    def iter_log(self) -> Iterator[Dict[str, Any]]:
+        """Yield every logged turn of the session, oldest first."""
+        if not self.log_path or not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "r", encoding="utf-8") as log_file:
+            for line in log_file:
+                yield json.loads(line)
+    
+    def summary(self) -> Dict[str, int]:
+        """Message counts of the session (no scan of the history)."""
+        return {
+            "total": self.total,
+            "user": self.counts["user"],
+            "assistant": self.counts["assistant"],
+            "policies": self.counts["policy_data"],
+            "errors": self.counts["error"],
+            "in_memory": len(self.entries)
+        }
+    
+    def close(self):
+        """Close the history log."""
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+    
+    def __len__(self) -> int:
+        return self.total
+    
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        return iter(self.entries)
@@ -4,22 +4,19 @@ This creates a comprehensive insurance policy with authentic Indian insurance fo
 """
 
 import asyncio
+from typing import Dict, Any, Optional
 from mcp_client import MCPPDFClient
+from policy_templates import build_page_chrome_style, render_template
 
-async def generate_insurance_policy_document():
-    """Generate a professional Indian health insurance policy document"""
+HEALTH_POLICY_STYLE_NAME = "global_secure_shield_policy"
     
-    # Create client instance
-    client = MCPPDFClient("src/index.js")
+# Bump the suffix when the layout or CSS changes so servers pick up the new template
+HEALTH_POLICY_TEMPLATE_NAME = "global_secure_shield_health_policy_v2"
+# Header and footer printed on every page of the template-rendered policy ({page} is the page number)
+HEALTH_POLICY_PAGE_HEADER = "Global Secure Shield - Health Insurance Policy Document"
+HEALTH_POLICY_PAGE_FOOTER = "Page {page} | Confidential Document | IRDAI Reg. No.: 123456"
     
-    try:
-        # Start the server
-        await client.start_server()
-        
-        # First, create a custom insurance policy style
-        print("🏥 Creating Global Secure Shield Insurance Policy Style...")
-        
-        insurance_style_css = """
+HEALTH_POLICY_CSS = """
         @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;500;700&family=Noto+Sans:wght@400;600&display=swap');
         
         body {
@@ -308,22 +305,8 @@ async def generate_insurance_policy_document():
         }
         """
         
-        style_result = await client.create_custom_style(
-            style_name="global_secure_shield_policy",
-            description="Professional Health Insurance Policy Document for Global Secure Shield",
-            prompt="Create a comprehensive insurance policy document with modern professional styling",
-            theme="professional",
-            format="A4",
-            page_numbers=True,
-            custom_css=insurance_style_css,
-            header='<div style="text-align: center; font-size: 10px; color: #666; border-bottom: 1px solid #ddd; padding-bottom: 5px;">Global Secure Shield - Health Insurance Policy Document</div>',
-            footer='<div style="text-align: center; font-size: 9px; color: #666;">Page {pageNumber} | Confidential Document | IRDAI Reg. No.: 123456</div>'
-        )
-        
-        print(f"✅ Insurance policy style created: {style_result['style_name']}")
-        
-        # Create the comprehensive insurance policy document content
-        policy_content = """<div class="policy-header">
+# Policy document layout; `{{variable}}` placeholders are filled per document
+HEALTH_POLICY_TEMPLATE = """<div class="policy-header">
     <div class="company-logo">🛡️ GLOBAL SECURE SHIELD</div>
     <div class="company-tagline">Your Health, Our Priority | Comprehensive Insurance Solutions</div>
 </div>
@@ -342,27 +325,27 @@ async def generate_insurance_policy_document():
 <div class="info-grid">
     <div class="info-card">
         <div class="info-label">Policyholder Name</div>
-        <div class="info-value">Rajesh Kumar Sharma</div>
+        <div class="info-value">{{customer_name}}</div>
     </div>
     <div class="info-card">
         <div class="info-label">Policy Number</div>
-        <div class="info-value">GSS-2025-123456</div>
+        <div class="info-value">{{policy_number}}</div>
     </div>
     <div class="info-card">
         <div class="info-label">Policy Start Date</div>
-        <div class="info-value">15 May 2023</div>
+        <div class="info-value">{{policy_start_date}}</div>
     </div>
     <div class="info-card">
         <div class="info-label">Policy End Date</div>
-        <div class="info-value">14 May 2026 (3-year policy)</div>
+        <div class="info-value">{{policy_end_date}}</div>
     </div>
     <div class="info-card">
         <div class="info-label">Contact Address</div>
-        <div class="info-value">Block A-123, Sector 15<br>New Delhi, India - 110025</div>
+        <div class="info-value">{{contact_address}}</div>
     </div>
     <div class="info-card">
         <div class="info-label">Contact Details</div>
-        <div class="info-value">📱 +91-9876543254<br>📧 rajesh.sharma@gmail.com</div>
+        <div class="info-value">📱 {{contact_phone}}<br>📧 {{contact_email}}</div>
     </div>
 </div>
 
@@ -379,7 +362,7 @@ async def generate_insurance_policy_document():
 <div class="section-header">🏥 COMPREHENSIVE COVERAGE INFORMATION</div>
 
 <div class="coverage-highlight">
-    <div class="coverage-amount">₹5,00,000</div>
+    <div class="coverage-amount">₹{{sum_insured}}</div>
     <div class="coverage-text">Sum Insured (Individual Coverage)</div>
 </div>
 
@@ -439,19 +422,19 @@ async def generate_insurance_policy_document():
 <div class="section-header">💰 PREMIUM & PAYMENT INFORMATION</div>
 
 <div class="premium-details">
-    <div class="premium-amount">₹22,500</div>
+    <div class="premium-amount">₹{{total_premium}}</div>
     <div style="text-align: center; opacity: 0.9;">Total Annual Premium (Including 18% GST)</div>
 </div>
 
 ### Payment Information
-- **Base Premium:** ₹19,068
-- **GST (18%):** ₹3,432
-- **Total Premium:** ₹22,500
+- **Base Premium:** ₹{{base_premium}}
+- **GST (18%):** ₹{{gst_amount}}
+- **Total Premium:** ₹{{total_premium}}
 - **Payment Frequency:** Annual
 - **Payment Mode:** Online Bank Transfer (NEFT/RTGS)
-- **Payment Date:** 12 May 2023
-- **Transaction ID:** GSS230512789456
-- **Next Renewal Due:** 15 May 2026
+- **Payment Date:** {{payment_date}}
+- **Transaction ID:** {{transaction_id}}
+- **Next Renewal Due:** {{renewal_date}}
 
 ### Premium Breakdown by Coverage
 
@@ -460,8 +443,8 @@ async def generate_insurance_policy_document():
 | Base Health Cover | ₹15,000 | 66.7% |
 | Maternity Benefit | ₹2,500 | 11.1% |
 | Critical Illness | ₹1,568 | 7.0% |
-| Service Tax & Fees | ₹3,432 | 15.2% |
-| **Total** | **₹22,500** | **100%** |
+| Service Tax & Fees | ₹{{gst_amount}} | 15.2% |
+| **Total** | **₹{{total_premium}}** | **100%** |
 
 ---
 
@@ -471,12 +454,12 @@ async def generate_insurance_policy_document():
 
 <div class="important-notice">
     <strong>🚨 Active Claim Details</strong><br>
-    <strong>Claim Reference Number:</strong> HCL-2025-00458<br>
-    <strong>Claim Amount:</strong> ₹1,85,000<br>
-    <strong>Claim Date:</strong> 8 August 2025<br>
-    <strong>Hospital:</strong> Apollo Hospital, New Delhi<br>
-    <strong>Treatment:</strong> Cardiac Surgery (Angioplasty)<br>
-    <strong>Status:</strong> Under Process - Pre-authorization Approved
+    <strong>Claim Reference Number:</strong> {{claim_reference}}<br>
+    <strong>Claim Amount:</strong> ₹{{claim_amount}}<br>
+    <strong>Claim Date:</strong> {{claim_date}}<br>
+    <strong>Hospital:</strong> {{hospital}}<br>
+    <strong>Treatment:</strong> {{treatment}}<br>
+    <strong>Status:</strong> {{claim_status}}
 </div>
 
 ### 📋 How to File a Claim
@@ -641,7 +624,7 @@ Senior Underwriting Manager<br>
 Global Secure Shield Insurance<br>
 Employee ID: GSS001234<br>
 <em>Digital Signature Applied</em><br>
-<em>Date: 15 May 2023</em>
+<em>Date: {{issue_date}}</em>
 </td>
 <td style="border: none; width: 50%; text-align: center; padding: 20px;">
 <strong>Verified By:</strong><br><br>
@@ -650,7 +633,7 @@ Chief Medical Officer<br>
 Global Secure Shield Insurance<br>
 Employee ID: GSS001567<br>
 <em>Medical Approval Applied</em><br>
-<em>Date: 15 May 2023</em>
+<em>Date: {{issue_date}}</em>
 </td>
 </tr>
 </table>
@@ -660,7 +643,7 @@ Employee ID: GSS001567<br>
 <div class="important-notice">
     <strong>🔒 Important Security Information</strong><br>
     This policy certificate is generated electronically and is valid without physical signature. 
-    Policy authenticity can be verified online at www.globalsecureshield.com using policy number GSS-2025-123456.
+    Policy authenticity can be verified online at www.globalsecureshield.com using policy number {{policy_number}}.
     Any alterations or modifications to this document will render it invalid.
 </div>
 
@@ -675,19 +658,85 @@ Employee ID: GSS001567<br>
 **Beware of Spurious/Fake Calls:** IRDAI clarifies to public that IRDAI or its officials do not involve in activities like sale of any kind of insurance or investment products nor invest premium or deposits. Public receiving such phone calls are requested to lodge a police complaint along with details of phone call, number.
 </div>"""
         
+# Variables of the sample Global Secure Shield health policy
+DEFAULT_POLICY_VARIABLES = {
+    "customer_name": "Rajesh Kumar Sharma",
+    "policy_number": "GSS-2025-123456",
+    "policy_start_date": "15 May 2023",
+    "issue_date": "15 May 2023",
+    "policy_end_date": "14 May 2026 (3-year policy)",
+    "contact_address": "Block A-123, Sector 15<br>New Delhi, India - 110025",
+    "contact_phone": "+91-9876543254",
+    "contact_email": "rajesh.sharma@gmail.com",
+    "sum_insured": "5,00,000",
+    "total_premium": "22,500",
+    "base_premium": "19,068",
+    "gst_amount": "3,432",
+    "payment_date": "12 May 2023",
+    "transaction_id": "GSS230512789456",
+    "renewal_date": "15 May 2026",
+    "claim_reference": "HCL-2025-00458",
+    "claim_amount": "1,85,000",
+    "claim_date": "8 August 2025",
+    "hospital": "Apollo Hospital, New Delhi",
+    "treatment": "Cardiac Surgery (Angioplasty)",
+    "claim_status": "Under Process - Pre-authorization Approved"
+}
+
+async def generate_insurance_policy_document(variables: Optional[Dict[str, Any]] = None, client: Optional[MCPPDFClient] = None):
+    """
+    Generate a professional Indian health insurance policy document.
+    
+    The layout is registered once per MCP server as a styled template, so each
+    document only sends its variable map.
+    
+    Args:
+        variables: Template variables overriding DEFAULT_POLICY_VARIABLES
+        client: Running MCP client to reuse (default: start and close a new server)
+    
+    Returns:
+        Render result delivered through the client's output sink, or None on failure
+    """
+    variables = {**DEFAULT_POLICY_VARIABLES, **(variables or {})}
+    owns_client = client is None
+    
+    # Create client instance
+    if owns_client:
+        client = MCPPDFClient("src/index.js")
+    
+    try:
+        # Start the server
+        if owns_client:
+            await client.start_server()
+        
         # Generate the insurance policy document
         print("🏥 Generating Global Secure Shield Insurance Policy Document...")
         
-        output_path = client.get_pdf_path("global_secure_shield_health_policy.pdf")
-        
-        pdf_result = await client.generate_pdf_with_style(
-            style_name="global_secure_shield_policy",
-            content=policy_content,
-            output_path=output_path
-        )
+        pdf_metadata = {"customer": variables["customer_name"], "policy_number": variables["policy_number"]}
+        output_path = client.get_pdf_path("global_secure_shield_health_policy.pdf", pdf_metadata)
+        
+        try:
+            # Templates have no header/footer options, so the page header and footer are part of the template
+            page_chrome = build_page_chrome_style(HEALTH_POLICY_PAGE_HEADER, HEALTH_POLICY_PAGE_FOOTER)
+            if await client.ensure_template(HEALTH_POLICY_TEMPLATE_NAME, HEALTH_POLICY_CSS, page_chrome + HEALTH_POLICY_TEMPLATE):
+                print(f"🏥 Registered Global Secure Shield policy template: {HEALTH_POLICY_TEMPLATE_NAME}")
+            
+            pdf_result = await client.generate_pdf_from_template(
+                content="",
+                template_name=HEALTH_POLICY_TEMPLATE_NAME,
+                output_path=output_path,
+                variables=variables
+            )
+            if 'output_path' not in pdf_result:
+                raise Exception(f"Unexpected template response: {pdf_result}")
+        except Exception as e:
+            print(f"⚠️ Template generation failed, falling back to a custom style: {e}")
+            pdf_result = await generate_with_custom_style(client, render_template(HEALTH_POLICY_TEMPLATE, variables), output_path)
+        
+        pdf_result = client.finalize_pdf(pdf_result, pdf_metadata)
         
         print(f"✅ Insurance policy document generated successfully!")
-        print(f"📄 File location: {pdf_result['output_path']}")
+        print(f"📄 File location: {pdf_result.get('uri') or pdf_result['output_path'] or 'kept in memory (not written to disk)'}")
         print(f"📊 File size: {pdf_result['file_size']:,} bytes")
         print(f"📋 Total pages: {pdf_result['page_count']}")
         print(f"⏱️ Generation time: {pdf_result['generation_time_ms']}ms")
@@ -696,13 +745,40 @@ Employee ID: GSS001567<br>
             print(f"⚠️ Warnings: {pdf_result['warnings']}")
         
         print(f"\n🎨 Document Style: {pdf_result.get('style_used', 'Global Secure Shield Policy Style')}")
+        return pdf_result
         
     except Exception as e:
         print(f"❌ Error generating insurance policy: {e}")
         import traceback
         traceback.print_exc()
+        return None
     finally:
-        await client.close()
+        if owns_client:
+            await client.close()
+
+async def generate_with_custom_style(client: MCPPDFClient, policy_content: str, output_path: str) -> Dict[str, Any]:
+    """Generate the policy by sending the full document with the custom insurance policy style"""
+    print("🏥 Creating Global Secure Shield Insurance Policy Style...")
+    
+    style_result = await client.create_custom_style(
+        style_name=HEALTH_POLICY_STYLE_NAME,
+        description="Professional Health Insurance Policy Document for Global Secure Shield",
+        prompt="Create a comprehensive insurance policy document with modern professional styling",
+        theme="professional",
+        format="A4",
+        page_numbers=True,
+        custom_css=HEALTH_POLICY_CSS,
+        header='<div style="text-align: center; font-size: 10px; color: #666; border-bottom: 1px solid #ddd; padding-bottom: 5px;">Global Secure Shield - Health Insurance Policy Document</div>',
+        footer='<div style="text-align: center; font-size: 9px; color: #666;">Page {pageNumber} | Confidential Document | IRDAI Reg. No.: 123456</div>'
+    )
+    
+    print(f"✅ Insurance policy style created: {style_result['style_name']}")
+    
+    return await client.generate_pdf_with_style(
+        style_name=HEALTH_POLICY_STYLE_NAME,
+        content=policy_content,
+        output_path=output_path
+    )
 
 if __name__ == "__main__":
     print("🛡️ Global Secure Shield - Health Insurance Policy Generator")
@@ -1,24 +1,63 @@
 import asyncio
 import json
+import logging
 import subprocess
 import sys
-from typing import Dict, Any, Optional, List
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 import tempfile
 import os
+from pdf_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_MB, get_pdf_cache, make_cache_key
+from output_sinks import DEFAULT_PDF_OUTPUT_DIR, OutputSink, create_output_sink
+
+# Server stderr is forwarded here line by line (DEBUG level, so it stays quiet by default)
+server_logger = logging.getLogger("mcp_client.server")
+
+# Number of recent stderr lines kept for crash diagnostics
+STDERR_TAIL_LINES = 200
 
 class MCPPDFClient:
-    def __init__(self, server_path: str):
+    def __init__(self, server_path: str, stderr_tail_lines: int = STDERR_TAIL_LINES,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, cache_max_mb: int = DEFAULT_CACHE_MAX_MB,
+                 output_sink: Optional[OutputSink] = None):
         self.server_path = server_path
         self.process = None
         self.request_id = 1
-        # Default PDF output directory
-        self.default_pdf_dir = r"C:\Users\t-ronak\OneDrive - Microsoft\Desktop\MCP\PDF"
-        
-    def get_pdf_path(self, filename: str) -> str:
-        """Get full path for PDF file in the default PDF directory"""
-        if not filename.endswith('.pdf'):
-            filename += '.pdf'
-        return os.path.join(self.default_pdf_dir, filename)
+        # Recent server stderr lines and totals, filled by the drainer thread
+        self.stderr_tail = deque(maxlen=stderr_tail_lines)
+        self.stderr_stats = {"lines": 0, "bytes": 0}
+        self._stderr_thread = None
+        # Templates registered on the running server process
+        self.registered_templates = set()
+        # JSON-RPC requests sent, their encoded size and responses nobody waited for any more
+        self.request_stats = {"requests": 0, "bytes_sent": 0, "stale_responses": 0}
+        # One request in flight per server process (created on first use inside the event loop)
+        self._request_lock = None
+        # Requests waiting for a response, by id; filled by send_request, resolved by the stdout reader
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._stdout_thread = None
+        self._stdout_closed = False
+        # Where generated PDFs are delivered (default from MCP_PDF_SINK)
+        self.output_sink = output_sink or create_output_sink()
+        # Content-addressed cache of generated PDFs (disabled when cache_dir is empty and for
+        # sinks that keep no files, since the cache would store every PDF on disk)
+        self.pdf_cache = None
+        if cache_dir and self.output_sink.keeps_files:
+            # Shared with every other client using the same directory
+            self.pdf_cache = get_pdf_cache(cache_dir, cache_max_mb * 1024 * 1024)
+        # Hashes of the styles and templates created by this client, part of the cache keys
+        self.style_fingerprints = {}
+        self.template_fingerprints = {}
+        
+    def get_pdf_path(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Get the path the server should write a PDF to, as chosen by the output sink"""
+        return self.output_sink.prepare(filename, metadata)
+    
+    def finalize_pdf(self, result: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Deliver a generated PDF through the output sink (adds `pdf_bytes` or `uri` for some sinks)"""
+        return self.output_sink.finalize(result, metadata)
         
     async def start_server(self):
         """Start the MCP server process"""
@@ -35,17 +74,26 @@ class MCPPDFClient:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,  # Keep stderr separate
                 text=True,
+                errors="replace",
                 bufsize=1,  # Line buffered
                 cwd=pdf_server_dir if os.path.exists(pdf_server_dir) else None
             )
             
+            # Keep reading stderr so a chatty server never blocks on a full pipe
+            self._start_stderr_drainer()
+            # Responses are read on one thread and handed to the request with the same id
+            self._start_stdout_reader()
+            
+            # A new server process has no templates yet
+            self.registered_templates.clear()
+            
             # Wait a bit for server to start
             await asyncio.sleep(3)
             
             # Check if server started successfully
             if self.process.poll() is not None:
-                stderr_output = self.process.stderr.read()
-                raise Exception(f"Server failed to start: {stderr_output}")
+                self._stderr_thread.join(timeout=1)
+                raise Exception(f"Server failed to start (exit code {self.process.returncode}): {self.get_stderr_tail()}")
                 
             print("✅ MCP Server started successfully")
             return True
@@ -54,11 +102,144 @@ class MCPPDFClient:
             print(f"❌ Failed to start server: {e}")
             return False
     
+    def _start_stderr_drainer(self):
+        """Start the background thread that drains the server's stderr."""
+        self.stderr_tail.clear()
+        self.stderr_stats = {"lines": 0, "bytes": 0}
+        self._stderr_thread = threading.Thread(
+            target=self._drain_stderr,
+            args=(self.process,),
+            name=f"mcp-stderr-{self.process.pid}",
+            daemon=True
+        )
+        self._stderr_thread.start()
+    
+    def _drain_stderr(self, process: subprocess.Popen):
+        """
+        Read server stderr until EOF.
+        
+        Each line is forwarded to the `mcp_client.server` logger with the server
+        pid attached and kept in the bounded `stderr_tail` ring buffer.
+        
+        Args:
+            process: Server process whose stderr is drained
+        """
+        log_context = {"mcp_server_pid": process.pid, "mcp_stream": "stderr"}
+        try:
+            for line in process.stderr:
+                line = line.rstrip("\n")
+                self.stderr_tail.append(line)
+                self.stderr_stats["lines"] += 1
+                self.stderr_stats["bytes"] += len(line) + 1
+                if server_logger.isEnabledFor(logging.DEBUG):
+                    server_logger.debug("%s", line, extra=log_context)
+        except (OSError, ValueError):
+            # The pipe was closed while reading
+            pass
+    
+    def _start_stdout_reader(self):
+        """Start the background thread that reads the server's stdout and dispatches responses."""
+        with self._pending_lock:
+            self._pending.clear()
+            self._stdout_closed = False
+        self._stdout_thread = threading.Thread(
+            target=self._read_stdout,
+            args=(self.process,),
+            name=f"mcp-stdout-{self.process.pid}",
+            daemon=True
+        )
+        self._stdout_thread.start()
+    
+    def _read_stdout(self, process: subprocess.Popen):
+        """
+        Read server stdout until EOF and resolve the request waiting for each response.
+        
+        Lines that are not JSON-RPC responses (startup messages, notifications) are
+        skipped. A response whose request is no longer waiting, because its task was
+        cancelled, is discarded so it can never be taken for a later request's answer.
+        At EOF the requests still waiting fail with the server's recent stderr.
+        
+        Args:
+            process: Server process whose stdout is read
+        """
+        try:
+            for line in process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    response = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(response, dict) or not isinstance(response.get("id"), int):
+                    continue
+                
+                with self._pending_lock:
+                    waiter = self._pending.pop(response["id"], None)
+                if waiter is None:
+                    self.request_stats["stale_responses"] += 1
+                    continue
+                loop, future = waiter
+                _resolve_threadsafe(loop, future, response)
+        except (OSError, ValueError):
+            # The pipe was closed while reading
+            pass
+        
+        with self._pending_lock:
+            self._stdout_closed = True
+            waiters = list(self._pending.values())
+            self._pending.clear()
+        if not waiters:
+            return
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        if self._stderr_thread:
+            self._stderr_thread.join(timeout=1)
+        error = Exception(
+            f"MCP server exited with code {process.returncode}; last stderr lines:\n{self.get_stderr_tail(20)}"
+        )
+        for loop, future in waiters:
+            _resolve_threadsafe(loop, future, error=error)
+    
+    def get_stderr_tail(self, lines: Optional[int] = None) -> str:
+        """
+        Get the most recent server stderr lines.
+        
+        Args:
+            lines: Number of lines to return (default: the whole ring buffer)
+        
+        Returns:
+            Recent stderr output joined by newlines, or "<no stderr output>"
+        """
+        tail = list(self.stderr_tail)
+        if lines is not None:
+            tail = tail[-lines:]
+        return "\n".join(tail) or "<no stderr output>"
+    
+    def _raise_if_server_exited(self):
+        """Raise with the recent stderr output if the server process has exited."""
+        if self.process.poll() is None:
+            return
+        if self._stderr_thread:
+            self._stderr_thread.join(timeout=1)
+        raise Exception(
+            f"MCP server exited with code {self.process.returncode}; last stderr lines:\n{self.get_stderr_tail(20)}"
+        )
+    
     async def send_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Send a JSON-RPC request to the MCP server"""
         if not self.process:
             raise Exception("Server not started")
             
+        if self._request_lock is None:
+            self._request_lock = asyncio.Lock()
+        async with self._request_lock:
+            return await self._send_request_locked(method, params)
+    
+    async def _send_request_locked(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Write one request and wait for the response with its id without blocking the event loop"""
         request = {
             "jsonrpc": "2.0",
             "id": self.request_id,
@@ -67,42 +248,39 @@ class MCPPDFClient:
         }
         self.request_id += 1
         
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._pending_lock:
+            stdout_closed = self._stdout_closed
+            if not stdout_closed:
+                self._pending[request["id"]] = (loop, future)
+        
         try:
+            if stdout_closed:
+                self._raise_if_server_exited()
+                raise Exception("MCP server closed its stdout")
+            
             # Send request
             request_str = json.dumps(request) + '\n'
             self.process.stdin.write(request_str)
             self.process.stdin.flush()
+            self.request_stats["requests"] += 1
+            self.request_stats["bytes_sent"] += len(request_str.encode('utf-8'))
             
-            # Read response - may need to skip non-JSON lines
-            max_attempts = 10
-            for attempt in range(max_attempts):
-                response_line = self.process.stdout.readline()
-                if not response_line:
-                    await asyncio.sleep(0.1)
-                    continue
+            # The stdout reader resolves the future when the response with this id arrives
+            response = await future
                 
-                response_line = response_line.strip()
+            if "error" in response:
+                raise Exception(f"Server error: {response['error']}")
                 
-                # Skip empty lines and server startup messages
-                if not response_line or "MCP server running" in response_line:
-                    continue
-                
-                try:
-                    response = json.loads(response_line)
-                    
-                    if "error" in response:
-                        raise Exception(f"Server error: {response['error']}")
-                        
-                    return response.get("result", {})
-                    
-                except json.JSONDecodeError:
-                    # This might be a partial line or server message, try next line
-                    continue
-            
-            raise Exception("No valid JSON response received after multiple attempts")
+            return response.get("result", {})
             
         except Exception as e:
             raise Exception(f"Request failed: {e}")
+        finally:
+            # A cancelled request stops waiting; its late response is then discarded by the reader
+            with self._pending_lock:
+                self._pending.pop(request["id"], None)
     
     def _extract_content_text(self, result: Dict[str, Any]) -> str:
         """Extract text content from MCP server response"""
@@ -135,9 +313,8 @@ class MCPPDFClient:
             }
         }
         
-        result = await self.send_request("tools/call", params)
-        text_content = self._extract_content_text(result)
-        return self._parse_json_from_text(text_content)
+        cache_key_parts = ("generate_pdf", content, options or {})
+        return await self._render_cached(cache_key_parts, output_path, lambda: self._call_tool(params))
     
     async def embed_images(self, markdown_content: str, image_sources: List[Dict[str, Any]], options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Embed images in markdown content"""
@@ -192,9 +369,9 @@ class MCPPDFClient:
             }
         }
         
-        result = await self.send_request("tools/call", params)
-        text_content = self._extract_content_text(result)
-        return self._parse_json_from_text(text_content)
+        result = await self._call_tool(params)
+        self.style_fingerprints[style_name] = make_cache_key(params["arguments"])
+        return result
     
     async def list_custom_styles(self) -> Dict[str, Any]:
         """List all custom styles"""
@@ -219,9 +396,10 @@ class MCPPDFClient:
             }
         }
         
-        result = await self.send_request("tools/call", params)
-        text_content = self._extract_content_text(result)
-        return self._parse_json_from_text(text_content)
+        # Styles created elsewhere may have changed under the same name, so only cache known ones
+        style_fingerprint = self.style_fingerprints.get(style_name)
+        cache_key_parts = ("generate_pdf_with_style", style_fingerprint, content, override_options or {}) if style_fingerprint else None
+        return await self._render_cached(cache_key_parts, output_path, lambda: self._call_tool(params))
     
     async def get_custom_style(self, style_name: str) -> Dict[str, Any]:
         """Get details of a specific custom style"""
@@ -247,9 +425,30 @@ class MCPPDFClient:
             }
         }
         
-        result = await self.send_request("tools/call", params)
-        text_content = self._extract_content_text(result)
-        return self._parse_json_from_text(text_content)
+        result = await self._call_tool(params)
+        self.template_fingerprints[template_name] = make_cache_key(params["arguments"])
+        return result
+    
+    async def ensure_template(self, template_name: str, css_content: str, html_template: str = "") -> bool:
+        """
+        Register a styled template unless the running server already has it.
+        
+        Args:
+            template_name: Template name
+            css_content: Template CSS
+            html_template: Template HTML with `{{variable}}` placeholders
+        
+        Returns:
+            True if the template was registered now, False if it was already registered
+        """
+        if template_name in self.registered_templates:
+            return False
+        
+        result = await self.create_styled_template(template_name, css_content, html_template)
+        if result.get("success") is False or "error" in result:
+            raise Exception(f"Template registration failed: {result}")
+        self.registered_templates.add(template_name)
+        return True
     
     async def generate_pdf_from_template(self, content: str, template_name: str, output_path: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate PDF using a predefined template"""
@@ -263,10 +462,44 @@ class MCPPDFClient:
             }
         }
         
+        template_fingerprint = self.template_fingerprints.get(template_name)
+        cache_key_parts = ("generate_pdf_from_template", template_fingerprint, content, variables or {}) if template_fingerprint else None
+        return await self._render_cached(cache_key_parts, output_path, lambda: self._call_tool(params))
+    
+    async def _call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call an MCP tool and parse its JSON text result"""
         result = await self.send_request("tools/call", params)
         text_content = self._extract_content_text(result)
         return self._parse_json_from_text(text_content)
     
+    async def _render_cached(self, cache_key_parts: Optional[tuple], output_path: str,
+                             render: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Serve a PDF render from the cache, or render it and cache the result.
+        
+        Args:
+            cache_key_parts: Inputs that determine the PDF bytes (None skips the cache)
+            output_path: Requested output path
+            render: Coroutine function performing the actual render
+        
+        Returns:
+            Render result; `cache_hit` is True when the PDF came from the cache
+        """
+        if not self.pdf_cache or cache_key_parts is None:
+            return await render()
+        
+        cache_key = make_cache_key(*cache_key_parts)
+        cached_result = self.pdf_cache.get(cache_key, output_path)
+        if cached_result is not None:
+            return cached_result
+        
+        self.pdf_cache.detach(output_path)
+        result = await render()
+        pdf_path = result.get("output_path") or output_path
+        if result.get("success", True) and "error" not in result and os.path.exists(pdf_path):
+            self.pdf_cache.put(cache_key, pdf_path, result)
+        return result
+    
     async def close(self):
         """Close the server process"""
         if self.process:
@@ -276,8 +509,28 @@ class MCPPDFClient:
             except subprocess.TimeoutExpired:
                 self.process.kill()
                 self.process.wait()
+            if self._stdout_thread:
+                self._stdout_thread.join(timeout=1)
+            if self._stderr_thread:
+                self._stderr_thread.join(timeout=1)
             print("✅ Server closed")
 
+def _resolve_threadsafe(loop: asyncio.AbstractEventLoop, future: asyncio.Future,
+                        result: Any = None, error: Optional[BaseException] = None):
+    """Set the result or exception of a future from another thread, unless it is already done."""
+    def resolve():
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    try:
+        loop.call_soon_threadsafe(resolve)
+    except RuntimeError:
+        # The event loop was closed; nobody is waiting any more
+        pass
+
 # Example usage and test functions
 async def example_basic_pdf():
     """Example: Generate a basic PDF"""
@@ -323,6 +576,7 @@ The PDF generation is working successfully with all formatting preserved.
             }
         )
         
+        result = client.finalize_pdf(result)
         print(f"✅ PDF generated successfully: {result}")
         
     except Exception as e:
@@ -402,6 +656,7 @@ The embedded images demonstrate successful integration.
                 }
             )
             
+            pdf_result = client.finalize_pdf(pdf_result)
             print(f"✅ PDF with images generated: {pdf_result}")
         
     except Exception as e:
@@ -472,6 +727,7 @@ The outlook for 2026 remains positive with continued growth expected.
             output_path=output_path
         )
         
+        pdf_result = client.finalize_pdf(pdf_result)
         print(f"✅ Corporate PDF generated: {pdf_result}")
         
     except Exception as e:
@@ -497,7 +753,7 @@ async def main():
         
         print("\n🎉 All examples completed successfully!")
         print("\nGenerated files:")
-        pdf_dir = r"C:\Users\t-ronak\OneDrive - Microsoft\Desktop\MCP\PDF"
+        pdf_dir = DEFAULT_PDF_OUTPUT_DIR
         for filename in ["example_basic.pdf", "example_with_images.pdf", "example_corporate.pdf"]:
             filepath = os.path.join(pdf_dir, filename)
             if os.path.exists(filepath):
@@ -0,0 +1,226 @@
+"""
+Output sinks that decide where generated PDFs end up.
+
+The MCP server always writes the PDF to the path it is given, so each sink
+chooses that path up front (`prepare`) and delivers the file afterwards
+(`finalize`) without writing the bytes a second time:
+
+- LocalDirectorySink: the server writes straight into the final directory,
+  optionally sharded by date or customer.
+- MemorySink: the server writes to a RAM-backed staging file (/dev/shm when
+  available); the bytes are returned in the result and the file is removed, so
+  nothing is kept on disk (e.g. when the document is only emailed).
+- ObjectStoreSink: local S3-compatible stand-in laid out as
+  `<root>/<bucket>/<key>`; the staged file is renamed into place and addressed
+  as `s3://<bucket>/<key>`.
+
+Select a sink with MCP_PDF_SINK (local, memory or object) or pass one to
+MCPPDFClient.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+MCP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_PDF_OUTPUT_DIR = os.getenv("MCP_PDF_OUTPUT_DIR", os.path.join(MCP_DIR, "PDF"))
+DEFAULT_SHARD_BY = os.getenv("MCP_PDF_SHARD_BY", "")  # "", "date" or "customer"
+DEFAULT_OBJECT_STORE_DIR = os.getenv("MCP_PDF_OBJECT_STORE_DIR", os.path.join(MCP_DIR, "object_store"))
+DEFAULT_BUCKET = os.getenv("MCP_PDF_BUCKET", "policy-documents")
+
+# RAM-backed directory used by MemorySink when the platform has one
+SHARED_MEMORY_DIR = "/dev/shm"
+
+def normalize_pdf_filename(filename: str) -> str:
+    """Append the .pdf extension if it is missing."""
+    if not filename.endswith('.pdf'):
+        filename += '.pdf'
+    return filename
+
+def safe_path_component(value: str) -> str:
+    """Turn a free-text value (e.g. a customer name) into a single path component."""
+    component = re.sub(r'[^a-z0-9]+', '_', str(value).lower()).strip('_')
+    return component or "unknown"
+
+class OutputSink(ABC):
+    """Base class: chooses the server's output path and delivers the result."""
+    
+    name = "base"
+    # False when delivered PDFs must not stay on disk (the client then skips the disk cache)
+    keeps_files = True
+    
+    @abstractmethod
+    def prepare(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get the path the MCP server should write the PDF to.
+        
+        Args:
+            filename: PDF file name
+            metadata: Document details used for placement (e.g. customer, policy_number)
+        
+        Returns:
+            Absolute output path
+        """
+    
+    def finalize(self, result: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Deliver a generated PDF.
+        
+        Args:
+            result: Render result returned by the MCP client
+            metadata: Document details passed to prepare
+        
+        Returns:
+            The result, updated with the sink's location fields
+        """
+        result["sink"] = self.name
+        return result
+
+class LocalDirectorySink(OutputSink):
+    """Writes PDFs straight into a local directory, optionally sharded."""
+    
+    name = "local"
+    
+    def __init__(self, base_dir: str = DEFAULT_PDF_OUTPUT_DIR, shard_by: str = DEFAULT_SHARD_BY):
+        """
+        Initialize the sink.
+        
+        Args:
+            base_dir: Output directory
+            shard_by: "" for a flat directory, "date" for YYYY/MM/DD subdirectories,
+                      "customer" for one subdirectory per customer
+        """
+        if shard_by not in ("", "date", "customer"):
+            raise ValueError(f"Unknown shard_by '{shard_by}'. Use '', 'date' or 'customer'.")
+        self.base_dir = base_dir
+        self.shard_by = shard_by
+    
+    def prepare(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Get the final path in the (sharded) output directory."""
+        directory = self.base_dir
+        if self.shard_by == "date":
+            directory = os.path.join(directory, *datetime.now().strftime("%Y/%m/%d").split("/"))
+        elif self.shard_by == "customer":
+            directory = os.path.join(directory, safe_path_component((metadata or {}).get("customer", "unknown")))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.abspath(os.path.join(directory, normalize_pdf_filename(filename)))
+
+class MemorySink(OutputSink):
+    """Returns the PDF bytes to the caller and keeps no file."""
+    
+    name = "memory"
+    keeps_files = False
+    
+    def __init__(self, staging_dir: Optional[str] = None):
+        """
+        Initialize the sink.
+        
+        Args:
+            staging_dir: Directory for the server's short-lived output file
+                         (default: /dev/shm if present, else the temp directory)
+        """
+        if staging_dir is None:
+            staging_dir = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else tempfile.gettempdir()
+        self.staging_dir = staging_dir
+    
+    def prepare(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Get a unique staging path for the server to write to."""
+        return os.path.join(self.staging_dir, f"mcp-pdf-{uuid.uuid4().hex}-{normalize_pdf_filename(filename)}")
+    
+    def finalize(self, result: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Read the staged PDF into `pdf_bytes` and delete the file."""
+        staged_path = result.get("output_path")
+        if staged_path and os.path.exists(staged_path):
+            with open(staged_path, "rb") as pdf_file:
+                result["pdf_bytes"] = pdf_file.read()
+            os.remove(staged_path)
+        result["output_path"] = None
+        return super().finalize(result, metadata)
+
+class ObjectStoreSink(OutputSink):
+    """Local S3-compatible stand-in storing objects as <root>/<bucket>/<key>."""
+    
+    name = "object"
+    
+    def __init__(self, root_dir: str = DEFAULT_OBJECT_STORE_DIR, bucket: str = DEFAULT_BUCKET, shard_by: str = "date"):
+        """
+        Initialize the sink.
+        
+        Args:
+            root_dir: Root directory of the object store
+            bucket: Bucket name
+            shard_by: Key prefix layout: "date", "customer" or "" (flat)
+        """
+        self.root_dir = root_dir
+        self.bucket = bucket
+        self.shard_by = shard_by
+        # Staging lives inside the store so finalize is a rename on the same file system
+        self.staging_dir = os.path.join(root_dir, ".staging")
+        os.makedirs(self.staging_dir, exist_ok=True)
+    
+    def object_key(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Build the object key of a PDF."""
+        filename = normalize_pdf_filename(filename)
+        if self.shard_by == "date":
+            return f"{datetime.now().strftime('%Y/%m/%d')}/{filename}"
+        if self.shard_by == "customer":
+            return f"{safe_path_component((metadata or {}).get('customer', 'unknown'))}/{filename}"
+        return filename
+    
+    def prepare(self, filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Get a staging path; the object key is remembered in the file name."""
+        return os.path.join(self.staging_dir, f"{uuid.uuid4().hex}-{normalize_pdf_filename(filename)}")
+    
+    def finalize(self, result: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Move the staged PDF to its object key and record size and ETag metadata."""
+        staged_path = result.get("output_path")
+        if not staged_path or not os.path.exists(staged_path):
+            return super().finalize(result, metadata)
+        
+        filename = os.path.basename(staged_path).split("-", 1)[1]
+        key = self.object_key(filename, metadata)
+        object_path = os.path.join(self.root_dir, self.bucket, *key.split("/"))
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        
+        etag = hashlib.md5()
+        with open(staged_path, "rb") as pdf_file:
+            for chunk in iter(lambda: pdf_file.read(1024 * 1024), b""):
+                etag.update(chunk)
+        os.replace(staged_path, object_path)
+        with open(f"{object_path}.meta.json", "w", encoding="utf-8") as meta_file:
+            json.dump({
+                "ContentType": "application/pdf",
+                "ContentLength": os.path.getsize(object_path),
+                "ETag": f'"{etag.hexdigest()}"',
+                "Metadata": {k: str(v) for k, v in (metadata or {}).items()}
+            }, meta_file)
+        
+        result["output_path"] = object_path
+        result["uri"] = f"s3://{self.bucket}/{key}"
+        return super().finalize(result, metadata)
+
+def create_output_sink(name: Optional[str] = None) -> OutputSink:
+    """
+    Create an output sink by name.
+    
+    Args:
+        name: "local", "memory" or "object" (default: MCP_PDF_SINK, else "local")
+    
+    Returns:
+        Output sink configured from the MCP_PDF_* environment variables
+    """
+    name = name or os.getenv("MCP_PDF_SINK", "local")
+    if name == "local":
+        return LocalDirectorySink()
+    if name == "memory":
+        return MemorySink()
+    if name == "object":
+        return ObjectStoreSink()
+    raise ValueError(f"Unknown PDF output sink '{name}'. Use 'local', 'memory' or 'object'.")
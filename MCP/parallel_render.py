@@ -0,0 +1,229 @@
+"""
+Parallel section rendering for long policy documents.
+
+A single MCP server renders one document at a time on one browser page. Long
+policies are therefore split at their `section-header` boundaries, the sections
+are rendered concurrently by a pool of MCP server processes, and the section
+PDFs are merged into one document. Page numbers are stamped after the merge so
+they run continuously ("Page 3 of 9") instead of restarting in every section.
+
+Merging needs pypdf (`pip install pypdf`).
+"""
+
+import asyncio
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Dict, Any, List, Optional
+from mcp_client import MCPPDFClient
+
+# Number of MCP servers used for section rendering (0 renders the document in one piece)
+DEFAULT_PARALLEL_WORKERS = int(os.getenv("MCP_PDF_PARALLEL_WORKERS", "0"))
+
+SECTION_BOUNDARY = re.compile(r'(?=<div class="section-header">)')
+
+def split_sections(html_content: str, max_parts: int = 0) -> List[str]:
+    """
+    Split a policy document at its section headers.
+    
+    The content in front of the first section header (company header and
+    policy title) stays with the first section. With max_parts, consecutive
+    sections are grouped into at most that many parts of similar size, since
+    every part costs one render request and starts on a new page.
+    
+    Args:
+        html_content: Policy HTML/markdown as produced by convert_markdown_to_html
+        max_parts: Maximum number of parts (0 keeps one part per section)
+    
+    Returns:
+        Document parts in document order
+    """
+    parts = [part for part in SECTION_BOUNDARY.split(html_content) if part.strip()]
+    if len(parts) > 1 and 'class="section-header"' not in parts[0]:
+        parts[1] = parts[0] + parts[1]
+        parts = parts[1:]
+    if max_parts <= 0 or len(parts) <= max_parts:
+        return parts
+    
+    target_size = sum(len(part) for part in parts) / max_parts
+    grouped = [""]
+    for part in parts:
+        if grouped[-1] and len(grouped[-1]) + len(part) / 2 > target_size and len(grouped) < max_parts:
+            grouped.append("")
+        grouped[-1] += part
+    return grouped
+
+def _pdf_text(text: str) -> str:
+    """Escape text for a PDF string literal."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _footer_overlay_pdf(width: float, height: float, text: str, font_size: float = 8) -> bytes:
+    """Build a one-page PDF that only contains a centred footer line."""
+    # Helvetica averages about half an em per character, which is close enough for centring
+    x = max(0.0, (width - len(text) * font_size * 0.5) / 2)
+    stream = f"BT /F1 {font_size} Tf 0.4 g {x:.2f} 20 Td ({_pdf_text(text)}) Tj ET".encode("latin-1", "replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width:.2f} {height:.2f}] "
+        f"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for index, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{index} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return pdf
+
+def merge_pdfs(section_paths: List[str], output_path: str, footer_template: str = "Page {page} of {pages}") -> int:
+    """
+    Merge section PDFs and stamp continuous page numbers.
+    
+    Args:
+        section_paths: Section PDFs in document order
+        output_path: Merged PDF path
+        footer_template: Footer text with {page} and {pages} placeholders (empty to skip numbering)
+    
+    Returns:
+        Number of pages in the merged PDF
+    """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError as e:
+        raise Exception("Parallel section rendering needs pypdf to merge PDFs (pip install pypdf)") from e
+    
+    writer = PdfWriter()
+    for section_path in section_paths:
+        writer.append(section_path)
+    
+    pages = len(writer.pages)
+    if footer_template:
+        for index, page in enumerate(writer.pages, start=1):
+            width, height = float(page.mediabox.width), float(page.mediabox.height)
+            overlay_pdf = _footer_overlay_pdf(width, height, footer_template.format(page=index, pages=pages))
+            page.merge_page(PdfReader(io.BytesIO(overlay_pdf)).pages[0])
+    
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "wb") as output_file:
+        writer.write(output_file)
+    return pages
+
+class MCPWorkerPool:
+    """Pool of MCP server processes that render document sections concurrently."""
+    
+    def __init__(self, size: int, server_path: str = "src/index.js", client_factory=MCPPDFClient):
+        """
+        Initialize the pool.
+        
+        Args:
+            size: Number of MCP server processes
+            server_path: MCP server entry point
+            client_factory: Callable(server_path) -> MCPPDFClient
+        """
+        self.size = size
+        self.server_path = server_path
+        self.client_factory = client_factory
+        self.workers = []
+        self._owned_workers = []
+    
+    async def start(self, existing_clients: Optional[List[MCPPDFClient]] = None) -> bool:
+        """
+        Start the servers concurrently.
+        
+        Args:
+            existing_clients: Running clients to use as workers (they are not closed by the pool)
+        
+        Returns:
+            True if at least one worker is available
+        """
+        existing_clients = list(existing_clients or [])[:self.size]
+        clients = [self.client_factory(self.server_path) for _ in range(self.size - len(existing_clients))]
+        started = await asyncio.gather(*(client.start_server() for client in clients))
+        self._owned_workers = [client for client, ok in zip(clients, started) if ok]
+        self.workers = existing_clients + self._owned_workers
+        print(f"✅ MCP worker pool ready: {len(self.workers)}/{self.size} servers")
+        return bool(self.workers)
+    
+    async def ensure_style(self, style: Dict[str, Any]):
+        """
+        Create the section style on every worker that does not have it yet.
+        
+        Args:
+            style: create_custom_style arguments, including `style_name`
+                   (page numbers are stamped after merging)
+        """
+        style = {**style, "page_numbers": False}
+        # The fingerprint shows whether a client already created the style on its server
+        await asyncio.gather(*(
+            client.create_custom_style(**style)
+            for client in self.workers if style["style_name"] not in client.style_fingerprints
+        ))
+    
+    async def render_sections(self, sections: List[str], output_path: str, style: Dict[str, Any],
+                              footer_template: str = "Page {page} of {pages}") -> Dict[str, Any]:
+        """
+        Render sections concurrently and merge them into one PDF.
+        
+        Args:
+            sections: Section contents in document order
+            output_path: Merged PDF path
+            style: create_custom_style arguments for the sections, including
+                   `style_name` (page numbers are stamped after merging)
+            footer_template: Footer text with {page} and {pages} placeholders
+        
+        Returns:
+            Render result like generate_pdf_with_style, plus `sections`
+        """
+        if not self.workers:
+            raise Exception("MCP worker pool is not started")
+        
+        start = time.perf_counter()
+        await self.ensure_style(style)
+        style_name = style["style_name"]
+        temp_dir = tempfile.mkdtemp(prefix="mcp-sections-")
+        section_paths = [os.path.join(temp_dir, f"section_{index:03d}.pdf") for index in range(len(sections))]
+        queue = asyncio.Queue()
+        for index in range(len(sections)):
+            queue.put_nowait(index)
+        
+        async def run_worker(client: MCPPDFClient):
+            while not queue.empty():
+                index = queue.get_nowait()
+                result = await client.generate_pdf_with_style(
+                    style_name=style_name,
+                    content=sections[index],
+                    output_path=section_paths[index]
+                )
+                if not os.path.exists(section_paths[index]):
+                    raise Exception(f"Section {index + 1} was not rendered: {result}")
+        
+        try:
+            await asyncio.gather(*(run_worker(client) for client in self.workers[:len(sections)]))
+            page_count = merge_pdfs(section_paths, output_path, footer_template)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        return {
+            "success": True,
+            "output_path": output_path,
+            "file_size": os.path.getsize(output_path),
+            "page_count": page_count,
+            "generation_time_ms": round((time.perf_counter() - start) * 1000),
+            "sections": len(sections),
+            "workers": min(len(self.workers), len(sections))
+        }
+    
+    async def close(self):
+        """Stop the servers started by the pool."""
+        await asyncio.gather(*(client.close() for client in self._owned_workers))
+        self.workers = []
+        self._owned_workers = []
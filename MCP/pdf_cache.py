@@ -0,0 +1,214 @@
+"""
+Content-addressed cache of generated PDF files.
+
+PDFs are stored under the SHA-256 of everything that determines their bytes
+(tool, content, style or template definition, options). A repeated request is
+answered by hard-linking (or copying) the cached file into the requested output
+path instead of rendering again. The cache directory is bounded in size and the
+least recently used entries are evicted first. Clients share one PDFCache per
+directory (`get_pdf_cache`), so the size bound and the index hold across every
+client in the process, e.g. the servers of a parallel rendering pool.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# Empty MCP_PDF_CACHE_DIR disables the cache
+DEFAULT_CACHE_DIR = os.getenv("MCP_PDF_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".pdf_cache"))
+DEFAULT_CACHE_MAX_MB = int(os.getenv("MCP_PDF_CACHE_MAX_MB", "256"))
+
+# One cache instance per directory, shared by all clients in the process
+_caches = {}
+_caches_lock = threading.Lock()
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Hash the inputs of a PDF generation request.
+    
+    Args:
+        parts: JSON-serializable request inputs
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class PDFCache:
+    """Size-bounded LRU cache of PDF files keyed by content hash."""
+    
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Initialize the cache and index the files already in the cache directory.
+        
+        Args:
+            cache_dir: Directory holding cached PDFs and their result metadata
+            max_bytes: Total size of cached PDFs before the oldest are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        existing = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".pdf"):
+                path = os.path.join(cache_dir, name)
+                existing.append((os.path.getmtime(path), name[:-4], os.path.getsize(path)))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+    
+    def _pdf_path(self, key: str) -> str:
+        """Path of the cached PDF for a key."""
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+    
+    def _meta_path(self, key: str) -> str:
+        """Path of the cached result metadata for a key."""
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str, output_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Place a cached PDF at the output path.
+        
+        Args:
+            key: Cache key from make_cache_key
+            output_path: Requested output path
+        
+        Returns:
+            Result of the original generation with `output_path` updated and
+            `cache_hit` set, or None on a cache miss
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        
+        cached_path = self._pdf_path(key)
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as meta_file:
+                result = json.load(meta_file)
+            if os.path.abspath(output_path) != os.path.abspath(cached_path):
+                self._place(cached_path, output_path)
+            os.utime(cached_path)
+        except (OSError, ValueError):
+            # Entry removed or damaged behind our back: treat as a miss
+            self._forget(key)
+            return None
+        
+        result["output_path"] = output_path
+        result["cache_hit"] = True
+        return result
+    
+    def put(self, key: str, pdf_path: str, result: Dict[str, Any]):
+        """
+        Add a freshly generated PDF to the cache.
+        
+        Args:
+            key: Cache key from make_cache_key
+            pdf_path: Generated PDF file
+            result: Result returned by the MCP server for this PDF
+        """
+        cached_path = self._pdf_path(key)
+        temp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+        try:
+            self._place(pdf_path, temp_path)
+            os.replace(temp_path, cached_path)
+            with open(self._meta_path(key), "w", encoding="utf-8") as meta_file:
+                json.dump({k: v for k, v in result.items() if k != "cache_hit"}, meta_file)
+        except OSError as e:
+            print(f"⚠️ Could not cache PDF {pdf_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        
+        size = os.path.getsize(cached_path)
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self.stats["stores"] += 1
+            evicted = self._evict()
+        for evicted_key in evicted:
+            self._remove_files(evicted_key)
+    
+    def detach(self, output_path: str):
+        """
+        Unlink an output file that shares its data with a cache entry.
+        
+        Renderers overwrite existing files in place, which would also change the
+        hard-linked cache entry, so the path is removed before rendering into it.
+        
+        Args:
+            output_path: Path the server is about to write
+        """
+        try:
+            if os.stat(output_path).st_nlink > 1:
+                os.remove(output_path)
+        except FileNotFoundError:
+            pass
+    
+    def _evict(self) -> list:
+        """Drop least recently used entries until the cache fits (lock held)."""
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+            evicted.append(key)
+        return evicted
+    
+    def _forget(self, key: str):
+        """Remove an entry from the index and disk."""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+        self._remove_files(key)
+    
+    def _remove_files(self, key: str):
+        """Delete the cached PDF and metadata of a key."""
+        for path in (self._pdf_path(key), self._meta_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    @staticmethod
+    def _place(source_path: str, target_path: str):
+        """Hard-link a file to the target path, copying when linking is not possible."""
+        target_dir = os.path.dirname(os.path.abspath(target_path))
+        os.makedirs(target_dir, exist_ok=True)
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        try:
+            os.link(source_path, target_path)
+        except OSError:
+            shutil.copy2(source_path, target_path)
+
+def get_pdf_cache(cache_dir: str, max_bytes: int) -> PDFCache:
+    """
+    Get the shared cache of a directory, creating it on first use.
+    
+    Args:
+        cache_dir: Directory holding cached PDFs and their result metadata
+        max_bytes: Size bound; when clients ask for different bounds, the smallest applies
+    
+    Returns:
+        The process-wide PDFCache for the directory
+    """
+    key = os.path.realpath(cache_dir)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = PDFCache(cache_dir, max_bytes)
+        elif max_bytes < cache.max_bytes:
+            cache.max_bytes = max_bytes
+        return cache
@@ -14,11 +14,17 @@ Features:
 
 Usage:
     python policy_agent.py
+    python policy_agent.py --no-llm   # fast mode: certificates from the JSON data only
 """
 
+import argparse
 import asyncio
+import functools
 import json
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 import re
@@ -28,16 +34,37 @@ from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 
 # Local imports
+from conversation_history import ConversationHistory
 from mcp_client import MCPPDFClient
 from insurance_policy_generator import generate_insurance_policy_document
+from parallel_render import DEFAULT_PARALLEL_WORKERS, MCPWorkerPool, split_sections
+from policy_markdown import format_policy_markdown
+from policy_templates import (
+    POLICY_CERTIFICATE_CSS,
+    build_certificate_template,
+    build_certificate_variables,
+    get_certificate_template_name,
+    render_template
+)
+
+# The Azure AI Projects client is synchronous; its calls run on this shared executor so
+# the event loop (MCP I/O, other sessions) keeps running during an agent run
+AZURE_AI_MAX_CONCURRENCY = int(os.getenv("AZURE_AI_MAX_CONCURRENCY", "8"))
+AZURE_AI_EXECUTOR = ThreadPoolExecutor(max_workers=AZURE_AI_MAX_CONCURRENCY, thread_name_prefix="azure-ai")
 
 class ConversationalPolicyAgent:
     """
     A conversational agent for insurance policy generation and management.
     """
     
-    def __init__(self):
-        """Initialize the conversational policy agent."""
+    def __init__(self, use_llm: bool = True):
+        """
+        Initialize the conversational policy agent.
+        
+        Args:
+            use_llm: Have the AI agent write the policy body for JSON input; False
+                     (fast mode) renders the certificate from the JSON fields only
+        """
         self.project_client = AIProjectClient.from_connection_string(
             credential=DefaultAzureCredential(),
             conn_str="eastus2.api.azureml.ms;aee23923-3bba-468d-8dcd-7c4bc1ce218f;rg-ronakofficial1414-9323_ai;ronakofficial1414-8644"
@@ -50,7 +77,8 @@ class ConversationalPolicyAgent:
         self.thread = None
         
         # Conversation state
-        self.conversation_history = []
+        # Recent turns in memory, every turn in the session's on-disk history log
+        self.conversation_history = ConversationHistory()
         self.user_profile = {}
         self.policy_requirements = {}
         self.conversation_active = True
@@ -58,13 +86,46 @@ class ConversationalPolicyAgent:
         # MCP client for PDF generation
         self.mcp_client = None
         
+        # Render certificates from a registered server-side template (variables only per document)
+        self.use_pdf_templates = True
+        
+        # Result of the latest PDF generation (holds `pdf_bytes` when the memory sink is used)
+        self.last_pdf_result = None
+        
+        # Render long documents section by section on this many MCP servers (0 = single render)
+        self.parallel_render_workers = DEFAULT_PARALLEL_WORKERS
+        self.mcp_pool = None
+        
+        # Start the MCP server and register the certificate layout while the AI writes the policy
+        self.overlap_pdf_warm_up = True
+        # Stage timings (ms) of the latest JSON policy generation
+        self.last_stage_timings = {}
+        
+        # Fast mode (use_llm=False): policy JSON is rendered straight into the certificate
+        # template; the AI agent still answers general questions
+        self.use_llm = use_llm
+        
         print("🤖 Insurance Policy Agent initialized!")
         print("💡 I can help you create and customize insurance policies through conversation.")
     
+    async def _run_agent_call(self, func, *args, **kwargs):
+        """
+        Run a blocking Azure AI Projects call on the shared executor.
+        
+        Args:
+            func: SDK method, e.g. self.project_client.agents.create_message
+            *args, **kwargs: Arguments of the call
+        
+        Returns:
+            The SDK call's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(AZURE_AI_EXECUTOR, functools.partial(func, *args, **kwargs))
+    
     async def start_conversation(self):
         """Start a new conversation thread."""
         try:
-            self.thread = self.project_client.agents.create_thread()
+            self.thread = await self._run_agent_call(self.project_client.agents.create_thread)
             print(f"✅ Started new conversation thread: {self.thread.id}")
             
             # Send welcome message
@@ -119,20 +180,22 @@ What can I help you with today?
         """Send a message to the Azure AI agent and get response."""
         try:
             # Create message in the thread
-            message = self.project_client.agents.create_message(
+            message = await self._run_agent_call(
+                self.project_client.agents.create_message,
                 thread_id=self.thread.id,
                 role="user",
                 content=user_input
             )
             
             # Process the message with the agent
-            run = self.project_client.agents.create_and_process_run(
+            run = await self._run_agent_call(
+                self.project_client.agents.create_and_process_run,
                 thread_id=self.thread.id,
                 agent_id=self.agent.id
             )
             
             # Get the latest messages
-            messages = self.project_client.agents.list_messages(thread_id=self.thread.id)
+            messages = await self._run_agent_call(self.project_client.agents.list_messages, thread_id=self.thread.id)
             
             # Get the latest assistant response
             for message in messages:
@@ -517,7 +580,7 @@ New Delhi - 110001, India
             
             # For now, generate the default health insurance policy
             # This can be extended to handle different policy types
-            await generate_insurance_policy_document()
+            await generate_insurance_policy_document(client=self.mcp_client)
             
             print("✅ Policy document generated successfully!")
             print("📁 Check the PDF folder for your new policy document.")
@@ -630,20 +693,22 @@ User input: {user_input}
         """Helper method to send message to Azure AI and get response."""
         try:
             # Create message in the thread
-            message_obj = self.project_client.agents.create_message(
+            message_obj = await self._run_agent_call(
+                self.project_client.agents.create_message,
                 thread_id=self.thread.id,
                 role="user",
                 content=message
             )
             
             # Process the message with the agent
-            run = self.project_client.agents.create_and_process_run(
+            run = await self._run_agent_call(
+                self.project_client.agents.create_and_process_run,
                 thread_id=self.thread.id,
                 agent_id=self.agent.id
             )
             
             # Get the latest messages
-            messages = self.project_client.agents.list_messages(thread_id=self.thread.id)
+            messages = await self._run_agent_call(self.project_client.agents.list_messages, thread_id=self.thread.id)
             
             # Try different methods to extract the response content
             response_content = None
@@ -746,8 +811,8 @@ User input: {user_input}
 
 """
         
-        # Clean and format the AI content
-        cleaned_content = self.format_agent_response(ai_content)
+        # AI content is normalized together with the header and footer in one pass below
+        cleaned_content = self.extract_response_text(ai_content)
         
         # Add professional footer
         footer = f"""
@@ -786,13 +851,61 @@ For actual insurance needs, please consult with licensed insurance professionals
 **Document ID:** {policy_number}-ENHANCED-{datetime.now().strftime('%Y%m%d')}
 """
         
-        # Combine header, AI content, and footer
-        enhanced_document = header + cleaned_content + footer
+        # Combine header, AI content, and footer and apply the formatting in one pass
+        return self.apply_professional_formatting(header + cleaned_content + footer)
+    
+    async def warm_up_pdf_infrastructure(self, policy_data: Dict[str, Any]) -> float:
+        """
+        Start the MCP server and register what the policy's PDF will need.
+        
+        Runs concurrently with the agent call in handle_user_input. Failures are
+        only reported; generate_pdf_document retries the same steps.
         
-        # Apply final formatting touches
-        enhanced_document = self.apply_professional_formatting(enhanced_document)
+        Args:
+            policy_data: Parsed policy JSON
         
-        return enhanced_document
+        Returns:
+            Warm-up duration in milliseconds
+        """
+        start = time.perf_counter()
+        claim_type = policy_data.get('claimType', 'health').lower()
+        try:
+            if not self.mcp_client:
+                self.mcp_client = MCPPDFClient("src/index.js")
+                # The section pool's other servers start alongside the main one
+                starts = [self.mcp_client.start_server()]
+                if self.parallel_render_workers > 0:
+                    starts.append(self.ensure_mcp_pool())
+                if not (await asyncio.gather(*starts))[0]:
+                    self.mcp_client = None
+                    if self.mcp_pool:
+                        await self.mcp_pool.close()
+                        self.mcp_pool = None
+                    raise Exception("MCP server did not start")
+            
+            if self.parallel_render_workers > 0:
+                await self.ensure_mcp_pool()
+                await self.mcp_pool.ensure_style(self.get_section_style(claim_type))
+            elif self.use_pdf_templates:
+                await self.ensure_certificate_template(claim_type)
+        except Exception as e:
+            print(f"⚠️ PDF warm-up failed, retrying when the PDF is generated: {e}")
+        return (time.perf_counter() - start) * 1000
+    
+    def print_stage_timings(self):
+        """Print the stage timings of the latest JSON policy generation."""
+        labels = {
+            'llm_ms': "AI agent",
+            'formatting_ms': "formatting",
+            'mcp_warm_up_ms': "MCP warm-up (overlapped)",
+            'warm_up_wait_ms': "waited for warm-up",
+            'pdf_ms': "PDF",
+            'total_ms': "total"
+        }
+        print("⏱️ Stage timings: " + " | ".join(
+            f"{label} {self.last_stage_timings[stage]:,.0f} ms"
+            for stage, label in labels.items() if stage in self.last_stage_timings
+        ))
     
     async def generate_pdf_document(self, ai_content: str, policy_data: Dict[str, Any]) -> bool:
         """Generate a PDF document using the MCP server with AI content and professional styling."""
@@ -805,385 +918,41 @@ For actual insurance needs, please consult with licensed insurance professionals
             
             # Extract policy information
             customer_name = policy_data.get('customerName', 'Valued Customer')
-            policy_number = policy_data.get('policyNumber', f'GSS-{datetime.now().year}-{datetime.now().strftime("%m%d%H%M")}')
             claim_type = policy_data.get('claimType', 'health').lower()
             
-            # Create custom style for this policy type
-            print(f"🎨 Creating custom style for {claim_type} insurance policy...")
-            
-            # Use the professional insurance style from insurance_policy_generator.py
-            insurance_style_css = """
-            @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;500;700&family=Noto+Sans:wght@400;600&display=swap');
-            
-            body {
-                font-family: 'Roboto', 'Noto Sans', Arial, sans-serif;
-                line-height: 1.5;
-                color: #2c3e50;
-                font-size: 11pt;
-                margin: 0;
-                padding: 20px;
-            }
-            
-            .policy-header {
-                background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%);
-                color: white;
-                padding: 25px;
-                margin: -20px -20px 30px -20px;
-                text-align: center;
-                border-radius: 0 0 15px 15px;
-            }
-            
-            .company-logo {
-                font-size: 28pt;
-                font-weight: 700;
-                margin-bottom: 5px;
-                text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-            }
-            
-            .company-tagline {
-                font-size: 12pt;
-                opacity: 0.9;
-                font-weight: 300;
-            }
-            
-            .policy-title {
-                background-color: #f8fafc;
-                border: 2px solid #e2e8f0;
-                border-left: 6px solid #3b82f6;
-                padding: 20px;
-                margin: 20px 0;
-                font-size: 16pt;
-                font-weight: 600;
-                color: #1e40af;
-                text-align: center;
-            }
-            
-            .section-header {
-                background: linear-gradient(90deg, #3b82f6, #60a5fa);
-                color: white;
-                padding: 12px 20px;
-                margin: 25px 0 15px 0;
-                font-weight: 600;
-                font-size: 13pt;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }
-            
-            .info-grid {
-                display: grid;
-                grid-template-columns: 1fr 1fr;
-                gap: 20px;
-                margin: 20px 0;
-            }
-            
-            .info-card {
-                background-color: #f8fafc;
-                border: 1px solid #e2e8f0;
-                border-radius: 8px;
-                padding: 15px;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }
-            
-            .info-label {
-                font-weight: 600;
-                color: #4b5563;
-                font-size: 10pt;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-                margin-bottom: 5px;
-            }
-            
-            .info-value {
-                font-weight: 500;
-                color: #1f2937;
-                font-size: 12pt;
-            }
-            
-            .coverage-highlight {
-                background: linear-gradient(135deg, #10b981, #34d399);
-                color: white;
-                padding: 20px;
-                border-radius: 12px;
-                text-align: center;
-                margin: 20px 0;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            }
-            
-            .coverage-amount {
-                font-size: 24pt;
-                font-weight: 700;
-                margin-bottom: 5px;
-            }
-            
-            .coverage-text {
-                font-size: 12pt;
-                opacity: 0.9;
-            }
-            
-            .benefits-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 15px;
-                margin: 20px 0;
-            }
-            
-            .benefit-item {
-                background-color: #f0f9ff;
-                border: 1px solid #bae6fd;
-                border-left: 4px solid #0ea5e9;
-                padding: 12px;
-                border-radius: 6px;
-            }
-            
-            .benefit-title {
-                font-weight: 600;
-                color: #0c4a6e;
-                margin-bottom: 5px;
-            }
-            
-            .benefit-detail {
-                color: #475569;
-                font-size: 10pt;
-            }
-            
-            .exclusions-box {
-                background-color: #fef2f2;
-                border: 2px solid #fecaca;
-                border-radius: 8px;
-                padding: 15px;
-                margin: 20px 0;
-            }
-            
-            .exclusions-title {
-                color: #dc2626;
-                font-weight: 600;
-                margin-bottom: 10px;
-                font-size: 12pt;
-            }
-            
-            .claim-process {
-                background-color: #f0fdf4;
-                border: 2px solid #bbf7d0;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 20px 0;
-            }
-            
-            .claim-steps {
-                counter-reset: step-counter;
-            }
-            
-            .claim-step {
-                counter-increment: step-counter;
-                margin: 10px 0;
-                padding-left: 30px;
-                position: relative;
-            }
-            
-            .claim-step::before {
-                content: counter(step-counter);
-                position: absolute;
-                left: 0;
-                top: 0;
-                background-color: #22c55e;
-                color: white;
-                width: 20px;
-                height: 20px;
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 9pt;
-                font-weight: 600;
-            }
-            
-            .premium-details {
-                background: linear-gradient(135deg, #fbbf24, #f59e0b);
-                color: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin: 20px 0;
-            }
-            
-            .premium-amount {
-                font-size: 20pt;
-                font-weight: 700;
-                text-align: center;
-                margin-bottom: 10px;
-            }
-            
-            table {
-                width: 100%;
-                border-collapse: collapse;
-                margin: 15px 0;
-                background-color: white;
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }
-            
-            th {
-                background: linear-gradient(135deg, #6b7280, #9ca3af);
-                color: white;
-                padding: 12px;
-                text-align: left;
-                font-weight: 600;
-            }
-            
-            td {
-                padding: 10px 12px;
-                border-bottom: 1px solid #e5e7eb;
-            }
-            
-            tr:nth-child(even) {
-                background-color: #f9fafb;
-            }
-            
-            .signature-section {
-                margin-top: 40px;
-                padding-top: 20px;
-                border-top: 2px solid #d1d5db;
-            }
-            
-            .regulatory-info {
-                background-color: #f3f4f6;
-                border: 1px solid #d1d5db;
-                padding: 15px;
-                border-radius: 8px;
-                margin: 20px 0;
-                font-size: 10pt;
-                color: #4b5563;
-            }
-            
-            .important-notice {
-                background-color: #fef3c7;
-                border: 2px solid #fcd34d;
-                padding: 15px;
-                border-radius: 8px;
-                margin: 20px 0;
-            }
-            
-            .exclusions-section {
-                background-color: #fef2f2;
-                border: 1px solid #fca5a5;
-                border-left: 4px solid #ef4444;
-                padding: 15px;
-                border-radius: 6px;
-                margin: 15px 0;
-            }
-            
-            .contact-info {
-                background: linear-gradient(135deg, #1e3a8a, #3b82f6);
-                color: white;
-                padding: 25px;
-                border-radius: 12px;
-                margin: 20px 0;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }
-            
-            .contact-info h3 {
-                margin-top: 0;
-                color: white;
-                font-size: 16pt;
-                margin-bottom: 15px;
-            }
-            
-            .contact-info strong {
-                color: #fbbf24;
-                font-weight: 600;
-            }
-            
-            .footer-disclaimer {
-                font-size: 9pt;
-                color: #6b7280;
-                text-align: center;
-                margin-top: 30px;
-                padding-top: 15px;
-                border-top: 1px solid #e5e7eb;
-            }
-            
-            h1, h2, h3 {
-                color: #1e40af;
-                margin-top: 25px;
-                margin-bottom: 15px;
-            }
-            
-            h1 {
-                font-size: 18pt;
-                border-bottom: 3px solid #3b82f6;
-                padding-bottom: 10px;
-            }
-            
-            h2 {
-                font-size: 14pt;
-                background: linear-gradient(90deg, #3b82f6, #60a5fa);
-                color: white;
-                padding: 12px 20px;
-                border-radius: 8px;
-                margin: 25px 0 15px 0;
-            }
-            
-            h3 {
-                font-size: 13pt;
-                color: #1e40af;
-            }
-            
-            p {
-                margin: 10px 0;
-                text-align: justify;
-            }
-            
-            ul, li {
-                margin: 5px 0;
-            }
-            
-            strong {
-                color: #1f2937;
-                font-weight: 600;
-            }
-            
-            hr {
-                border: none;
-                border-top: 2px solid #e2e8f0;
-                margin: 25px 0;
-            }
-            """
-            
-            # Create the style with MCP server
-            style_name = f"ai_policy_{claim_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            style_result = await self.mcp_client.create_custom_style(
-                style_name=style_name,
-                description=f"AI-Generated {claim_type.title()} Insurance Policy for {customer_name}",
-                prompt=f"Professional {claim_type} insurance policy document with modern styling",
-                theme="professional",
-                format="A4",
-                page_numbers=True,
-                custom_css=insurance_style_css,
-                header=f'<div style="text-align: center; font-size: 10px; color: #666; border-bottom: 1px solid #ddd; padding-bottom: 5px;">Global Secure Shield - AI-Generated {claim_type.title()} Insurance Policy</div>',
-                footer='<div style="text-align: center; font-size: 9px; color: #666;">Page {pageNumber} | AI-Generated Document | IRDAI Reg. No.: 157</div>'
-            )
-            
-            print(f"✅ Custom style created: {style_result['style_name']}")
+            # Create filename based on customer and policy details
+            safe_customer_name = customer_name.replace(' ', '_').replace('.', '').lower()
+            pdf_filename = f"ai_policy_{safe_customer_name}_{claim_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
             
-            # Convert AI content to HTML format suitable for PDF generation
-            html_content = self.convert_markdown_to_html(ai_content, policy_data)
+            pdf_metadata = {"customer": customer_name, "claim_type": claim_type, "policy_number": policy_data.get('policyNumber', '')}
+            output_path = self.mcp_client.get_pdf_path(pdf_filename, pdf_metadata)
             
             # Generate the PDF
             print(f"📄 Generating PDF for {customer_name}...")
             
-            # Create filename based on customer and policy details
-            safe_customer_name = customer_name.replace(' ', '_').replace('.', '').lower()
-            pdf_filename = f"ai_policy_{safe_customer_name}_{claim_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            pdf_result = None
+            if self.parallel_render_workers > 0:
+                try:
+                    pdf_result = await self.generate_pdf_in_sections(ai_content, policy_data, output_path)
+                except Exception as e:
+                    print(f"⚠️ Parallel section rendering failed, rendering in one piece: {e}")
+            
+            if pdf_result is None and self.use_pdf_templates:
+                try:
+                    pdf_result = await self.generate_pdf_from_certificate_template(policy_data, output_path)
+                except Exception as e:
+                    print(f"⚠️ Template generation failed, falling back to a custom style: {e}")
             
-            output_path = self.mcp_client.get_pdf_path(pdf_filename)
+            if pdf_result is None:
+                pdf_result = await self.generate_pdf_with_custom_style(ai_content, policy_data, output_path)
             
-            pdf_result = await self.mcp_client.generate_pdf_with_style(
-                style_name=style_name,
-                content=html_content,
-                output_path=output_path
-            )
+            pdf_result = self.mcp_client.finalize_pdf(pdf_result, pdf_metadata)
+            self.last_pdf_result = pdf_result
             
             print(f"✅ PDF generated successfully!")
-            print(f"📄 File: {pdf_result['output_path']}")
+            if pdf_result.get('cache_hit'):
+                print("♻️ Identical document found in the PDF cache; rendering skipped")
+            print(f"📄 File: {pdf_result.get('uri') or pdf_result['output_path'] or 'kept in memory (not written to disk)'}")
             print(f"📊 Size: {pdf_result['file_size']:,} bytes")
             print(f"📋 Pages: {pdf_result['page_count']}")
             print(f"⏱️ Time: {pdf_result['generation_time_ms']}ms")
@@ -1196,435 +965,128 @@ For actual insurance needs, please consult with licensed insurance professionals
             traceback.print_exc()
             return False
     
-    def convert_markdown_to_html(self, markdown_content: str, policy_data: Dict[str, Any]) -> str:
-        """Convert AI-generated markdown content to professional HTML format matching insurance_policy_generator.py styling."""
+    async def generate_pdf_from_certificate_template(self, policy_data: Dict[str, Any], output_path: str) -> Dict[str, Any]:
+        """Render the certificate from the server-side template, sending only the per-document variables."""
+        claim_type = policy_data.get('claimType', 'health').lower()
+        template_name = get_certificate_template_name(claim_type)
         
-        # Extract policy details
-        customer_name = policy_data.get('customerName', 'Valued Customer')
-        policy_number = policy_data.get('policyNumber', f'GSS-{datetime.now().year}-{datetime.now().strftime("%m%d%H%M")}')
+        if await self.ensure_certificate_template(claim_type):
+            print(f"🎨 Registered policy certificate template: {template_name}")
+        
+        pdf_result = await self.mcp_client.generate_pdf_from_template(
+            content="",
+            template_name=template_name,
+            output_path=output_path,
+            variables=build_certificate_variables(policy_data)
+        )
+        if 'output_path' not in pdf_result:
+            raise Exception(f"Unexpected template response: {pdf_result}")
+        return pdf_result
+    
+    async def ensure_certificate_template(self, claim_type: str) -> bool:
+        """
+        Register the certificate template of a claim type unless the MCP server already has it.
+        
+        Templates take no header/footer options, so the registered template prints
+        the per-page header and footer itself (CSS @page margin boxes).
+        
+        Args:
+            claim_type: Policy type (health, auto, life, ...)
+        
+        Returns:
+            True if the template was registered now
+        """
+        return await self.mcp_client.ensure_template(
+            get_certificate_template_name(claim_type),
+            POLICY_CERTIFICATE_CSS,
+            build_certificate_template(claim_type, page_chrome=True)
+        )
+    
+    async def generate_pdf_in_sections(self, ai_content: str, policy_data: Dict[str, Any], output_path: str) -> Dict[str, Any]:
+        """Render the certificate section by section across a pool of MCP servers and merge the PDFs."""
         claim_type = policy_data.get('claimType', 'health').lower()
-        claim_amount = policy_data.get('claimAmount', 0)
-        policy_start_date = policy_data.get('policyStartDate', datetime.now().strftime('%Y-%m-%d'))
+        await self.ensure_mcp_pool()
         
-        # Parse AI content to extract sections and structure them professionally
-        lines = markdown_content.split('\n')
+        sections = split_sections(self.convert_markdown_to_html(ai_content, policy_data), len(self.mcp_pool.workers))
+        print(f"🧩 Rendering {len(sections)} sections on {len(self.mcp_pool.workers)} MCP servers...")
         
-        # Start with professional header matching insurance_policy_generator.py
-        html_content = f"""<div class="policy-header">
-    <div class="company-logo">🛡️ GLOBAL SECURE SHIELD</div>
-    <div class="company-tagline">AI-Powered Insurance Solutions | {claim_type.title()} Insurance Policy</div>
-</div>
-
-<div class="policy-title">
-    {claim_type.upper()} INSURANCE POLICY CERTIFICATE<br>
-    <span style="font-size: 12pt; font-weight: 400;">(AI-Generated Document)</span>
-</div>
-
----
-
-<div class="section-header">📋 POLICY & CUSTOMER DETAILS</div>
-
-<div class="info-grid">
-    <div class="info-card">
-        <div class="info-label">Policyholder Name</div>
-        <div class="info-value">{customer_name}</div>
-    </div>
-    <div class="info-card">
-        <div class="info-label">Policy Number</div>
-        <div class="info-value">{policy_number}</div>
-    </div>
-    <div class="info-card">
-        <div class="info-label">Policy Start Date</div>
-        <div class="info-value">{policy_start_date}</div>
-    </div>
-    <div class="info-card">
-        <div class="info-label">Policy End Date</div>
-        <div class="info-value">{datetime.now().replace(year=datetime.now().year + 1).strftime('%d %B %Y')} (1-year policy)</div>
-    </div>
-    <div class="info-card">
-        <div class="info-label">Contact Address</div>
-        <div class="info-value">B-204, Green Valley Apartments<br>Sector 21, Noida, UP - 201301</div>
-    </div>
-    <div class="info-card">
-        <div class="info-label">Contact Details</div>
-        <div class="info-value">📱 +91-98765-43210<br>📧 {customer_name.lower().replace(' ', '.')}@gmail.com</div>
-    </div>
-</div>
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Insurer Information</h3>
-**Company:** Global Secure Shield Insurance Company Limited  
-**Licensed Office:** Global Secure Shield Tower, Plot No. 45, Financial District, Bandra Kurla Complex, Mumbai - 400051  
-**Customer Service:** 1800-12-SECURE (Toll Free)  
-**Website:** www.globalsecureshield.com
-
----
-
-<div class="section-header">🏥 COMPREHENSIVE COVERAGE INFORMATION</div>
-
-<div class="coverage-highlight">
-    <div class="coverage-amount">₹{claim_amount:,}</div>
-    <div class="coverage-text">Sum Insured ({claim_type.title()} Coverage)</div>
-</div>
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Policy Type</h3>
-**Comprehensive {claim_type.title()} Insurance** - AI-Generated Policy Plan
-"""
-
-        # Add coverage details based on policy type
-        if claim_type == 'health':
-            html_content += f"""
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Coverage Inclusions</h3>
-
-<div class="benefits-grid">
-    <div class="benefit-item">
-        <div class="benefit-title">🏨 Hospitalization</div>
-        <div class="benefit-detail">In-patient treatment for minimum 24 hours</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🏥 Room Rent</div>
-        <div class="benefit-detail">Up to ₹8,000 per day (Private AC Room)</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🚑 Ambulance Services</div>
-        <div class="benefit-detail">Up to ₹5,000 per claim incident</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🔬 ICU Charges</div>
-        <div class="benefit-detail">Intensive Care Unit expenses covered</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">💉 Day Care Treatments</div>
-        <div class="benefit-detail">Same day discharge procedures</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🏥 Pre & Post Hospitalization</div>
-        <div class="benefit-detail">60 days before, 90 days after</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">👶 Maternity Cover</div>
-        <div class="benefit-detail">Up to ₹75,000 (after waiting period)</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🩺 Annual Health Check-up</div>
-        <div class="benefit-detail">Up to ₹3,000 per policy year</div>
-    </div>
-</div>
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Waiting Periods</h3>
-
-| Condition Type | Waiting Period | Coverage Details |
-|----------------|----------------|------------------|
-| **General Illnesses** | 30 days | All acute conditions after policy inception |
-| **Pre-existing Diseases** | 2 years | Conditions existing before policy start |
-| **Maternity & Newborn** | 3 years | Pregnancy, delivery, and infant care |
-| **Specific Diseases** | 2 years | Heart disease, cancer, kidney ailments |
-"""
-        elif claim_type == 'auto':
-            html_content += f"""
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Coverage Inclusions</h3>
-
-<div class="benefits-grid">
-    <div class="benefit-item">
-        <div class="benefit-title">🚗 Own Damage</div>
-        <div class="benefit-detail">Complete vehicle damage coverage</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🛡️ Third Party Liability</div>
-        <div class="benefit-detail">₹15,00,000 as per Motor Tariff</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🔧 Engine Protection</div>
-        <div class="benefit-detail">Water ingress damage coverage</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🆘 Roadside Assistance</div>
-        <div class="benefit-detail">24x7 emergency services</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🔑 Key Replacement</div>
-        <div class="benefit-detail">Lost key reimbursement</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🛞 Tyre Protection</div>
-        <div class="benefit-detail">Damage to tyres and tubes</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">💰 Return to Invoice</div>
-        <div class="benefit-detail">Gap between IDV and invoice value</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🎯 Zero Depreciation</div>
-        <div class="benefit-detail">Brand new spare parts replacement</div>
-    </div>
-</div>
-"""
-        elif claim_type == 'life':
-            html_content += f"""
-### Coverage Inclusions
-
-<div class="benefits-grid">
-    <div class="benefit-item">
-        <div class="benefit-title">💖 Death Benefit</div>
-        <div class="benefit-detail">100% sum assured to nominee</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🏥 Terminal Illness</div>
-        <div class="benefit-detail">50% of sum assured</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🚑 Accidental Death</div>
-        <div class="benefit-detail">Additional ₹{claim_amount:,}</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">💰 Maturity Benefit</div>
-        <div class="benefit-detail">105% of premiums paid (if survived)</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🏦 Loan Facility</div>
-        <div class="benefit-detail">After 3 years (up to 90% surrender value)</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">📋 Premium Waiver</div>
-        <div class="benefit-detail">On permanent disability</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">💳 Tax Benefits</div>
-        <div class="benefit-detail">Under Section 80C and 10(10D)</div>
-    </div>
-    <div class="benefit-item">
-        <div class="benefit-title">🕐 Grace Period</div>
-        <div class="benefit-detail">30 days for premium payment</div>
-    </div>
-</div>
-"""
-
-        # Add premium section
-        html_content += f"""
----
-
-## 3. Premium Details
-
-<div class="section-header">💰 PREMIUM & PAYMENT INFORMATION</div>
-
-<div class="premium-details">
-    <div class="premium-amount">₹{max(25000, claim_amount // 15):,}</div>
-    <div style="text-align: center; opacity: 0.9;">Total Annual Premium (Including 18% GST)</div>
-</div>
-
-### Payment Information
-- **Base Premium:** ₹{max(21000, claim_amount // 18):,}
-- **GST (18%):** ₹{max(4000, claim_amount // 100):,}
-- **Total Premium:** ₹{max(25000, claim_amount // 15):,}
-- **Payment Frequency:** Annual
-- **Payment Mode:** Online Bank Transfer (NEFT/RTGS)
-- **Payment Date:** {datetime.now().strftime('%d %B %Y')}
-- **Transaction ID:** GSS{datetime.now().strftime('%y%m%d')}AI{policy_number[-6:]}
-- **Next Renewal Due:** {datetime.now().replace(year=datetime.now().year + 1).strftime('%d %B %Y')}
-
-### Premium Breakdown by Coverage
-
-| Coverage Component | Premium Amount | Percentage |
-|-------------------|----------------|------------|
-| Base {claim_type.title()} Cover | ₹{max(18000, claim_amount // 20):,} | 72.0% |
-| Additional Benefits | ₹{max(3000, claim_amount // 100):,} | 12.0% |
-| Administrative Fees | ₹{max(1000, claim_amount // 300):,} | 4.0% |
-| Service Tax & GST | ₹{max(4000, claim_amount // 100):,} | 16.0% |
-| **Total** | **₹{max(25000, claim_amount // 15):,}** | **100%** |
-
----
-
-<div class="section-header">📋 CLAIM INFORMATION & PROCESS</div>
-
-<div class="claim-process">
-<h3 style="color: #22c55e; margin-top: 0;">📋 How to File a Claim</h3>
+        return await self.mcp_pool.render_sections(
+            sections,
+            output_path,
+            style=self.get_section_style(claim_type),
+            footer_template="Page {page} of {pages} | AI-Generated Document | IRDAI Reg. No.: 157"
+        )
     
-<div class="claim-steps">
-<div class="claim-step"><strong>Inform Immediately:</strong> Call our 24x7 helpline within 24 hours of incident</div>
-<div class="claim-step"><strong>Pre-authorization:</strong> For cashless treatment, get pre-approval from network providers</div>
-<div class="claim-step"><strong>Submit Documents:</strong> Provide all required documents within 15 days</div>
-<div class="claim-step"><strong>Claim Processing:</strong> Our team will process your claim within 30 working days</div>
-<div class="claim-step"><strong>Settlement:</strong> Approved amount will be settled directly or reimbursed</div>
-</div>
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Required Documents for Claims</h3>
-
-<h4 style="color: #1e40af; margin: 15px 0 10px 0;">For {claim_type.title()} Claims:</h4>
-- ✅ Duly filled and signed claim form
-- ✅ Original bills and payment receipts
-- ✅ Medical reports and discharge summary (if applicable)
-- ✅ Diagnostic reports and test results (if applicable)
-- ✅ Photo ID proof and policy document
-- ✅ Bank account details for reimbursement
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Claim Submission Channels</h3>
-
-| Method | Details | Processing Time |
-|--------|---------|----------------|
-| **Online Portal** | www.globalsecureshield.com/claims | 24-48 hours |
-| **Mobile App** | GSS Claims App (Android/iOS) | 24-48 hours |
-| **Email** | claims@globalsecureshield.com | 48-72 hours |
-| **Toll-Free** | 1800-12-SECURE | Immediate assistance |
-| **Branch Visit** | Any GSS branch office | Same day |
-
----
-
-<div class="section-header">🚫 POLICY EXCLUSIONS</div>
-
-<div class="exclusions-box">
-    <h3 style="color: #dc2626; margin-top: 0; margin-bottom: 15px; font-size: 13pt;">⚠️ What's NOT Covered</h3>
+    async def ensure_mcp_pool(self):
+        """Start the section rendering pool; the agent's MCP client is one of its workers."""
+        if not self.mcp_pool:
+            pool = MCPWorkerPool(self.parallel_render_workers, self.mcp_client.server_path, client_factory=type(self.mcp_client))
+            await pool.start(existing_clients=[self.mcp_client])
+            self.mcp_pool = pool
     
-<h4 style="color: #dc2626; margin: 15px 0 10px 0;">General Exclusions:</h4>
-- Self-inflicted injuries and attempted suicide
-- War, nuclear risks, and acts of terrorism
-- Experimental or unproven treatments
-- Pre-existing conditions (first 2 years)
-- Fraudulent claims and misrepresentation
-
-<h4 style="color: #dc2626; margin: 15px 0 10px 0;">Treatment Exclusions:</h4>
-- Cosmetic and plastic surgery (unless medically necessary)
-- Routine check-ups and preventive care (except covered benefits)
-- Treatment outside India (except emergency)
-- Alternative medicine (unless specified)
-- Mental illness and psychiatric disorders (unless covered)
-
-</div>
-
----
-
-<div class="section-header">📋 IMPORTANT TERMS & CONDITIONS</div>
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">General Terms</h3>
-
-1. **Grace Period:** 30 days from due date for premium payment
-2. **Free Look Period:** 15 days from policy receipt to review and return
-3. **Renewal:** Lifetime renewability guaranteed (subject to terms)
-4. **Age Limits:** Entry age 18-65 years, renewable up to 80 years
-5. **Network:** 12,000+ authorized service providers across India
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Policy Conditions</h3>
-
-<h4 style="color: #1e40af; margin: 15px 0 10px 0;">Medical Examination (for Health Insurance)</h4>
-- Not required for sum insured up to ₹5 lakhs for age below 45 years
-- Pre-medical screening required for higher sum insured or older age
-
-<h4 style="color: #1e40af; margin: 15px 0 10px 0;">Pre-existing Conditions</h4>
-- Must be declared at the time of proposal
-- Covered after completion of waiting period
-- Medical records may be verified before claim settlement
-
----
-
-<div class="section-header">📞 REGULATORY COMPLIANCE & CONTACT DETAILS</div>
-
-<div class="contact-info">
-    <h3 style="color: white; margin-top: 0; margin-bottom: 15px; font-size: 13pt;">🏛️ Regulatory Information</h3>
-    <strong>IRDAI Registration No.:</strong> 157<br>
-    <strong>Valid until:</strong> 31 March 2026<br>
-    <strong>Category:</strong> General Insurance Company<br>
-    <strong>License Date:</strong> 15 April 2001<br>
-    <strong>Complaint Reference:</strong> IRDAI Complaint Portal - www.irdai.gov.in
-</div>
-
-<div class="contact-info">
-    <h3 style="color: white; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">📞 Customer Care & Support</h3>
-    <strong>24x7 Helpline:</strong> 1800-12-SECURE<br>
-    <strong>Email:</strong> support@globalsecureshield.com<br>
-    <strong>Website:</strong> www.globalsecureshield.com<br>
-    <strong>Mobile App:</strong> GSS Insurance (iOS/Android)<br>
-    <strong>WhatsApp:</strong> +91-98765-SECURE
-</div>
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Branch Offices</h3>
-
-| City | Address | Contact |
-|------|---------|---------|
-| **New Delhi** | Connaught Place, CP Metro Station | +91-11-2341-5678 |
-| **Mumbai** | Nariman Point, Near RBI Building | +91-22-6789-0123 |
-| **Bangalore** | MG Road, Brigade Center | +91-80-4567-8901 |
-| **Chennai** | Anna Salai, Express Towers | +91-44-2890-1234 |
-| **Kolkata** | Park Street, AJC Bose Road | +91-33-5678-9012 |
-
----
-
-<div class="signature-section">
-
-<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Digital Signatures & Validation</h3>
-
-<table style="border: none;">
-<tr style="border: none;">
-<td style="border: none; width: 50%; text-align: center; padding: 20px;">
-<strong>AI Policy Generated By:</strong><br><br>
-<strong>Azure AI Insurance Expert</strong><br>
-AI-Powered Policy Generation<br>
-Global Secure Shield Insurance<br>
-System ID: AI-GSS-2025<br>
-<em>Digital Signature Applied</em><br>
-<em>Date: {datetime.now().strftime('%d %B %Y')}</em>
-</td>
-<td style="border: none; width: 50%; text-align: center; padding: 20px;">
-<strong>Processed & Validated By:</strong><br><br>
-<strong>Automated Underwriting System</strong><br>
-Risk Assessment & Policy Validation<br>
-Global Secure Shield Insurance<br>
-System ID: AUTO-UW-2025<br>
-<em>Automated Validation Applied</em><br>
-<em>Date: {datetime.now().strftime('%d %B %Y')}</em>
-</td>
-</tr>
-</table>
-
-</div>
-
-<div class="important-notice">
-    <strong>🔒 Important Security Information</strong><br>
-    This policy certificate is generated using advanced AI technology and is valid for demonstration purposes. 
-    Policy authenticity can be verified online at www.globalsecureshield.com using policy number {policy_number}.
-    For actual insurance coverage, please consult with licensed insurance professionals.
-</div>
-
-<div class="footer-disclaimer">
-    <strong>AI-Generated Document Notice:</strong> This policy document has been created using advanced artificial intelligence technology 
-    and professional insurance industry standards. The content is generated based on the provided customer data and comprehensive 
-    insurance knowledge base. While this demonstrates the capabilities of AI in insurance document generation, 
-    for actual insurance coverage and legal validity, please consult with licensed insurance professionals and authorized insurance companies.<br><br>
-    <strong>Disclaimer:</strong> This policy is subject to terms, conditions, and exclusions mentioned in the policy wordings. 
-    For complete terms and conditions, please refer to the policy document. In case of any dispute, 
-    the English version of the policy shall prevail. This policy is regulated by the Insurance Regulatory 
-    and Development Authority of India (IRDAI).<br><br>
-    <strong>Document Generation Info:</strong><br>
-    • Generated on: {datetime.now().strftime('%d %B %Y at %I:%M %p')}<br>
-    • Customer: {customer_name}<br>
-    • Policy Type: {claim_type.title()} Insurance<br>
-    • Document ID: AI-{policy_number}-{datetime.now().strftime('%Y%m%d%H%M')}<br>
-    • AI System: Azure OpenAI + Global Secure Shield Platform
-</div>"""
-        
-        return html_content
+    def get_section_style(self, claim_type: str) -> Dict[str, Any]:
+        """Get the custom style used for section rendering of a policy type."""
+        return {
+            "style_name": f"ai_policy_{claim_type}_sections",
+            "description": f"AI-Generated {claim_type.title()} Insurance Policy sections",
+            "prompt": f"Professional {claim_type} insurance policy document with modern styling",
+            "theme": "professional",
+            "format": "A4",
+            "custom_css": POLICY_CERTIFICATE_CSS,
+            "header": f'<div style="text-align: center; font-size: 10px; color: #666; border-bottom: 1px solid #ddd; padding-bottom: 5px;">Global Secure Shield - AI-Generated {claim_type.title()} Insurance Policy</div>'
+        }
     
-    def apply_professional_formatting(self, content: str) -> str:
-        """Apply professional formatting to the policy document."""
+    async def generate_pdf_with_custom_style(self, ai_content: str, policy_data: Dict[str, Any], output_path: str) -> Dict[str, Any]:
+        """Render the certificate by sending the full HTML with a per-document custom style."""
+        customer_name = policy_data.get('customerName', 'Valued Customer')
+        claim_type = policy_data.get('claimType', 'health').lower()
         
-        # Ensure proper spacing around sections
-        content = re.sub(r'\n#{1,3}\s*([^\n]+)', r'\n\n## 📋 \1\n', content)
+        # Create custom style for this policy type
+        print(f"🎨 Creating custom style for {claim_type} insurance policy...")
         
-        # Format important notices
-        content = re.sub(r'\*\*([^*]+)\*\*', r'**\1**', content)
+        # Create the style with MCP server
+        style_name = f"ai_policy_{claim_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        # Add emoji indicators for different sections
-        content = content.replace('COVERAGE', '🛡️ COVERAGE')
-        content = content.replace('PREMIUM', '💰 PREMIUM')
-        content = content.replace('CLAIMS', '📄 CLAIMS')
-        content = content.replace('CONTACT', '📞 CONTACT')
-        content = content.replace('BENEFITS', '✅ BENEFITS')
-        content = content.replace('EXCLUSIONS', '❌ EXCLUSIONS')
+        style_result = await self.mcp_client.create_custom_style(
+            style_name=style_name,
+            description=f"AI-Generated {claim_type.title()} Insurance Policy for {customer_name}",
+            prompt=f"Professional {claim_type} insurance policy document with modern styling",
+            theme="professional",
+            format="A4",
+            page_numbers=True,
+            custom_css=POLICY_CERTIFICATE_CSS,
+            header=f'<div style="text-align: center; font-size: 10px; color: #666; border-bottom: 1px solid #ddd; padding-bottom: 5px;">Global Secure Shield - AI-Generated {claim_type.title()} Insurance Policy</div>',
+            footer='<div style="text-align: center; font-size: 9px; color: #666;">Page {pageNumber} | AI-Generated Document | IRDAI Reg. No.: 157</div>'
+        )
         
-        # Clean up excessive newlines
-        content = re.sub(r'\n{4,}', '\n\n\n', content)
+        print(f"✅ Custom style created: {style_result['style_name']}")
+        
+        # Convert AI content to HTML format suitable for PDF generation
+        html_content = self.convert_markdown_to_html(ai_content, policy_data)
+        
+        return await self.mcp_client.generate_pdf_with_style(
+            style_name=style_name,
+            content=html_content,
+            output_path=output_path
+        )
+    
+    def convert_markdown_to_html(self, markdown_content: str, policy_data: Dict[str, Any]) -> str:
+        """Convert AI-generated markdown content to professional HTML format matching insurance_policy_generator.py styling."""
         
-        return content.strip()
+        # Same layout that is registered on the MCP server as the certificate template
+        claim_type = policy_data.get('claimType', 'health').lower()
+        return render_template(build_certificate_template(claim_type), build_certificate_variables(policy_data))
+    
+    def apply_professional_formatting(self, content: str) -> str:
+        """Apply professional formatting (headings, section emojis, spacing) to the policy document."""
+        return format_policy_markdown(content)
     
     def format_agent_response(self, response: str) -> str:
         """Format the agent response for better readability."""
+        return format_policy_markdown(self.extract_response_text(response), decorate=False)
+    
+    def extract_response_text(self, response: str) -> str:
+        """Get the plain text of an agent response, unwrapping SDK dictionary artifacts."""
         if not response:
             return "I'm sorry, I couldn't process that response."
         
@@ -1642,19 +1104,50 @@ System ID: AUTO-UW-2025<br>
             except:
                 pass
         
-        # Clean up the response
-        formatted = response.strip()
+        return response
+    
+    async def generate_ai_policy_content(self, user_input: str, policy_data: Dict[str, Any], stage_timings: Dict[str, float]) -> str:
+        """
+        Have the AI agent write the policy document while the PDF side warms up.
+        
+        Args:
+            user_input: Policy JSON as entered by the user
+            policy_data: Parsed policy JSON
+            stage_timings: Receives the agent, formatting and warm-up timings (ms)
+        
+        Returns:
+            Formatted policy document
+        """
+        print("\n📝 Generating comprehensive policy document using AI agent...")
+        
+        # Warm up the PDF side concurrently so it is ready when the AI text arrives
+        warm_up_task = None
+        if self.overlap_pdf_warm_up:
+            warm_up_task = asyncio.create_task(self.warm_up_pdf_infrastructure(policy_data))
+            # Let the task launch the server process before the agent call takes over
+            await asyncio.sleep(0)
+        
+        # Send JSON to Azure AI agent for intelligent content generation
+        stage_start = time.perf_counter()
+        raw_policy_content = await self.send_message_to_agent(user_input)
+        stage_timings['llm_ms'] = (time.perf_counter() - stage_start) * 1000
+        
+        # Format the AI-generated content with local formatting enhancements
+        stage_start = time.perf_counter()
+        formatted_policy = self.enhance_policy_formatting(raw_policy_content, policy_data)
+        stage_timings['formatting_ms'] = (time.perf_counter() - stage_start) * 1000
         
-        # Remove any double formatting that might have occurred
-        formatted = formatted.replace('💰 💰', '�')
-        formatted = formatted.replace('🛡️ 🛡️', '�️')
-        formatted = formatted.replace('💳 💳', '💳')
+        print("\n🎉 AI-Generated Policy Document Created Successfully!")
+        print("\n" + "="*80)
+        print(formatted_policy)
+        print("="*80)
         
-        # Clean up extra newlines and spaces
-        formatted = re.sub(r'\n{3,}', '\n\n', formatted)
-        formatted = re.sub(r' {2,}', ' ', formatted)
+        if warm_up_task:
+            stage_start = time.perf_counter()
+            stage_timings['mcp_warm_up_ms'] = await warm_up_task
+            stage_timings['warm_up_wait_ms'] = (time.perf_counter() - stage_start) * 1000
         
-        return formatted.strip()
+        return formatted_policy
     
     async def handle_user_input(self, user_input: str):
         """Process user input and generate appropriate responses."""
@@ -1667,22 +1160,24 @@ System ID: AUTO-UW-2025<br>
             print(f"📄 Policy Type: {policy_data.get('claimType', 'Unknown').title()}")
             print(f"💰 Amount: ₹{policy_data.get('claimAmount', 0):,}")
             
-            print("\n📝 Generating comprehensive policy document using AI agent...")
+            stage_timings = {}
+            turn_start = time.perf_counter()
             
-            # Send JSON to Azure AI agent for intelligent content generation
-            raw_policy_content = await self.send_message_to_agent(user_input)
-            
-            # Format the AI-generated content with local formatting enhancements
-            formatted_policy = self.enhance_policy_formatting(raw_policy_content, policy_data)
-            
-            print("\n🎉 AI-Generated Policy Document Created Successfully!")
-            print("\n" + "="*80)
-            print(formatted_policy)
-            print("="*80)
+            if self.use_llm:
+                formatted_policy = await self.generate_ai_policy_content(user_input, policy_data, stage_timings)
+            else:
+                # The certificate layout and every value in it come from the JSON and the built-in templates
+                print("\n⚡ Fast mode: rendering the policy certificate from the policy data (no AI agent call)")
+                formatted_policy = ""
             
             # Generate PDF using MCP server
             print("\n📄 Converting to professional PDF document...")
+            stage_start = time.perf_counter()
             pdf_success = await self.generate_pdf_document(formatted_policy, policy_data)
+            stage_timings['pdf_ms'] = (time.perf_counter() - stage_start) * 1000
+            stage_timings['total_ms'] = (time.perf_counter() - turn_start) * 1000
+            self.last_stage_timings = {stage: round(ms, 1) for stage, ms in stage_timings.items()}
+            self.print_stage_timings()
             
             if pdf_success:
                 print("✅ PDF document generated successfully!")
@@ -1691,18 +1186,11 @@ System ID: AUTO-UW-2025<br>
                 print("⚠️ Document generated but PDF creation encountered issues.")
             
             # Add to conversation history
-            self.conversation_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'role': 'user',
-                'content': user_input,
-                'policy_data': policy_data
-            })
-            
-            self.conversation_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'role': 'assistant',
-                'content': f"Generated AI-powered {policy_data.get('claimType', 'insurance')} policy document with PDF for {policy_data.get('customerName', 'customer')}"
-            })
+            self.conversation_history.append('user', user_input, policy_data=policy_data)
+            self.conversation_history.append(
+                'assistant',
+                f"Generated {'AI-powered' if self.use_llm else 'template-based'} {policy_data.get('claimType', 'insurance')} policy document with PDF for {policy_data.get('customerName', 'customer')}"
+            )
             
             return
         
@@ -1725,18 +1213,8 @@ System ID: AUTO-UW-2025<br>
             print("• Dates should be in YYYY-MM-DD format")
             
             # Add to conversation history
-            self.conversation_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'role': 'user',
-                'content': user_input,
-                'error': 'JSON parsing failed'
-            })
-            
-            self.conversation_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'role': 'assistant',
-                'content': "Provided JSON formatting help due to parsing error"
-            })
+            self.conversation_history.append('user', user_input, error='JSON parsing failed')
+            self.conversation_history.append('assistant', "Provided JSON formatting help due to parsing error")
             
             return
         
@@ -1747,12 +1225,7 @@ System ID: AUTO-UW-2025<br>
         self.update_user_profile(intent_data)
         
         # Add to conversation history
-        self.conversation_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'role': 'user',
-            'content': user_input,
-            'intent': intent_data
-        })
+        self.conversation_history.append('user', user_input, intent=intent_data)
         
         # Handle generation request
         if intent_data['generate_request'] and intent_data['policy_type']:
@@ -1780,11 +1253,7 @@ System ID: AUTO-UW-2025<br>
             print(f"\n🤖 Agent:\n{response}")
         
         # Add agent response to history
-        self.conversation_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'role': 'assistant',
-            'content': response
-        })
+        self.conversation_history.append('assistant', response)
     
     async def run_conversation_loop(self):
         """Main conversation loop."""
@@ -1819,8 +1288,11 @@ System ID: AUTO-UW-2025<br>
     
     async def cleanup(self):
         """Clean up resources."""
+        if self.mcp_pool:
+            await self.mcp_pool.close()
         if self.mcp_client:
-            await self.mcp_client.cleanup()
+            await self.mcp_client.close()
+        self.conversation_history.close()
     
     def print_conversation_summary(self):
         """Print a summary of the conversation."""
@@ -1830,7 +1302,15 @@ System ID: AUTO-UW-2025<br>
         print("\n" + "="*60)
         print("📊 CONVERSATION SUMMARY")
         print("="*60)
-        print(f"💬 Total messages: {len(self.conversation_history)}")
+        # Counts are kept up to date by ConversationHistory.append
+        counts = self.conversation_history.summary()
+        print(f"💬 Total messages: {counts['total']} ({counts['user']} from you, {counts['assistant']} from the agent)")
+        if counts['policies']:
+            print(f"📄 Policy documents requested: {counts['policies']}")
+        if counts['errors']:
+            print(f"⚠️ Inputs that could not be parsed: {counts['errors']}")
+        if self.conversation_history.log_path:
+            print(f"🗂️ Full history: {self.conversation_history.log_path}")
         
         if self.user_profile:
             print(f"👤 User profile: {self.user_profile}")
@@ -1840,9 +1320,14 @@ System ID: AUTO-UW-2025<br>
         
         print("="*60)
 
-async def main():
-    """Main function to run the conversational policy agent."""
-    agent = ConversationalPolicyAgent()
+async def main(use_llm: bool = True):
+    """
+    Main function to run the conversational policy agent.
+    
+    Args:
+        use_llm: False runs the agent in fast mode (policies rendered without the AI agent)
+    """
+    agent = ConversationalPolicyAgent(use_llm=use_llm)
     
     try:
         # Start the conversation
@@ -1851,6 +1336,11 @@ async def main():
             print("❌ Failed to start conversation. Exiting.")
             return
         
+        if not agent.use_llm:
+            # Fast mode only renders templates, so have the PDF server ready for the first policy
+            print("⚡ Fast mode: policies are rendered from the JSON data without the AI agent")
+            await agent.warm_up_pdf_infrastructure({})
+        
         # Run the conversation loop
         await agent.run_conversation_loop()
         
@@ -1864,5 +1354,10 @@ async def main():
         await agent.cleanup()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Insurance Policy Conversational Agent")
+    parser.add_argument("--no-llm", action="store_true",
+                        help="Fast mode: render policy JSON straight into the certificate template without the AI agent")
+    args = parser.parse_args()
+    
     print("🚀 Starting Insurance Policy Conversational Agent...")
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(use_llm=not args.no_llm))
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Single-pass post-processing of AI-written policy markdown.
+
+The document is scanned once, line by line:
+- headings up to level 3 become `## <emoji> <title>`, where the emoji is the
+  one already on the heading, else the section emoji of the first keyword in
+  the title, else 📋
+- upper-case section keywords in the text (COVERAGE, PREMIUM, ...) get their
+  emoji unless it is already there
+- repeated emojis ("💰 💰") are collapsed, runs of spaces inside a line become
+  one space, trailing whitespace is removed and blank lines are collapsed to
+  one, with one blank line around every heading
+- fenced code blocks are left untouched
+
+Applying the formatter to its own output returns the same text.
+"""
+
+import re
+from typing import List
+
+# Section keywords and the emoji placed in front of them
+SECTION_EMOJIS = {
+    "COVERAGE": "🛡️",
+    "PREMIUM": "💰",
+    "CLAIMS": "📄",
+    "CONTACT": "📞",
+    "BENEFITS": "✅",
+    "EXCLUSIONS": "❌"
+}
+DEFAULT_HEADING_EMOJI = "📋"
+
+HEADING = re.compile(r"(#{1,6})[ \t]+(.*)")
+FENCE = re.compile(r"(```|~~~)")
+# The patterns start with a literal so the regex engine can skip ahead quickly;
+# the word-boundary and line-start checks are done in the replacement callbacks
+SPACES = re.compile(r" [ \t]+|\t[ \t]*")
+KEYWORD = re.compile(r"(?:" + "|".join(SECTION_EMOJIS) + r")")
+# A run of symbol characters (an emoji with its variation selectors) standing alone
+EMOJI_TOKEN = r"[^\w\s\x00-\x7f]+"
+REPEATED_EMOJI = re.compile(r"(?<!\S)(" + EMOJI_TOKEN + r")(?: \1)+(?!\S)")
+# Cheap precheck for REPEATED_EMOJI: a space between two non-ASCII characters
+NON_ASCII_PAIR = re.compile(r" (?<=[^\x00-\x7f] )(?=[^\x00-\x7f])")
+LEADING_EMOJIS = re.compile(r"(?:" + EMOJI_TOKEN + r" )+")
+
+def _collapse_spaces(match) -> str:
+    """Collapse a run of spaces/tabs inside a line; leading indentation is kept."""
+    text = match.string
+    position = match.start()
+    line_start = text.rfind("\n", 0, position) + 1
+    if not text[line_start:position].strip():
+        return match.group(0)
+    return " "
+
+def _decorate_keyword(match) -> str:
+    """Put the section emoji in front of a keyword unless it is already there."""
+    keyword = match.group(0)
+    position = match.start()
+    text = match.string
+    if position > 0 and (text[position - 1].isalnum() or text[position - 1] == "_"):
+        return keyword
+    emoji = SECTION_EMOJIS[keyword]
+    while position > 0 and text[position - 1] == " ":
+        position -= 1
+    if text.endswith(emoji, 0, position) or text.endswith(emoji.replace("\ufe0f", ""), 0, position):
+        return keyword
+    return f"{emoji} {keyword}"
+
+def _format_inline(text: str, decorate: bool) -> str:
+    """Normalize lines of text: collapse spaces and repeated emojis, add keyword emojis."""
+    # Each scan runs only when the cheap check finds something to do
+    if "  " in text or "\t" in text:
+        text = SPACES.sub(_collapse_spaces, text)
+    if NON_ASCII_PAIR.search(text):
+        text = REPEATED_EMOJI.sub(r"\1", text)
+    if decorate:
+        text = KEYWORD.sub(_decorate_keyword, text)
+    return text
+
+def _format_heading(title: str) -> str:
+    """Build a `## <emoji> <title>` heading from a heading title."""
+    title = _format_inline(title, decorate=False).strip() + " "
+    emoji = None
+    leading = LEADING_EMOJIS.match(title)
+    if leading:
+        # Keep the emoji the title already had; duplicates such as "📋 📋" are dropped
+        emoji = leading.group(0).split()[0]
+        title = title[leading.end():]
+    title = title.strip()
+    if emoji is None or emoji == DEFAULT_HEADING_EMOJI:
+        keyword = KEYWORD.search(title)
+        emoji = SECTION_EMOJIS[keyword.group(0)] if keyword else DEFAULT_HEADING_EMOJI
+    return f"## {emoji} {title}".rstrip()
+
+def format_policy_markdown(text: str, decorate: bool = True) -> str:
+    """
+    Normalize headings, section emojis and whitespace of a markdown document.
+    
+    Args:
+        text: Markdown text
+        decorate: Rewrite headings and add section emojis; False only
+                  normalizes whitespace and repeated emojis
+    
+    Returns:
+        Formatted markdown (formatting it again returns the same text)
+    """
+    output: List[str] = []
+    # Consecutive ordinary lines are normalized together by _format_inline
+    block: List[str] = []
+    blank_pending = False
+    in_fence = None
+    
+    def flush_block():
+        if block:
+            output.append(_format_inline("\n".join(block), decorate))
+            block.clear()
+    
+    for line in text.split("\n"):
+        stripped = line.strip()
+        
+        if in_fence:
+            output.append(line.rstrip())
+            if stripped.startswith(in_fence):
+                in_fence = None
+            continue
+        
+        if not stripped:
+            blank_pending = bool(output or block)
+            continue
+        
+        first = stripped[0]
+        heading = HEADING.match(stripped) if decorate and first == "#" else None
+        if heading and len(heading.group(1)) <= 3 and heading.group(2):
+            if output or block:
+                block.append("")
+            flush_block()
+            output.append(_format_heading(heading.group(2)))
+            # The line after a heading is always preceded by one blank line
+            blank_pending = True
+            continue
+        
+        if blank_pending:
+            block.append("")
+            blank_pending = False
+        
+        fence = FENCE.match(stripped) if first in "`~" else None
+        if fence:
+            flush_block()
+            in_fence = fence.group(1)
+            output.append(line.rstrip())
+            continue
+        
+        block.append(line.rstrip())
+    
+    flush_block()
+    return "\n".join(output)
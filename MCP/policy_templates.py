@@ -0,0 +1,865 @@
+"""
+Policy certificate layout registered once per MCP server as a styled template.
+
+The certificate HTML uses `{{variable}}` placeholders. It is registered with
+`create_styled_template` (one template per claim type, because the coverage
+block differs), and each document then only sends its variable map through
+`generate_pdf_from_template`. `render_template` produces the same HTML locally.
+
+Templates carry no header or footer options, so the registered template adds
+the per-page header and footer itself as CSS `@page` margin boxes
+(`build_page_chrome_style`, needs Chromium 131+ in the MCP server).
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+TEMPLATE_VARIABLE = re.compile(r"\{\{(\w+)\}\}")
+
+# Bump when the layout or CSS changes so servers pick up the new template
+CERTIFICATE_TEMPLATE_VERSION = 2
+
+# Per-page header and footer of AI-generated certificates ({page} is the page number)
+CERTIFICATE_PAGE_HEADER = "Global Secure Shield - AI-Generated {claim_type_title} Insurance Policy"
+CERTIFICATE_PAGE_FOOTER = "Page {page} | AI-Generated Document | IRDAI Reg. No.: 157"
+
+PAGE_CHROME_STYLE = """<style>
+@page {
+    margin: 18mm 12mm 16mm 12mm;
+    @top-center {
+        content: HEADER_CONTENT;
+        font-family: Arial, sans-serif;
+        font-size: 10px;
+        color: #666;
+        border-bottom: 1px solid #ddd;
+        padding-bottom: 5px;
+        vertical-align: bottom;
+    }
+    @bottom-center {
+        content: FOOTER_CONTENT;
+        font-family: Arial, sans-serif;
+        font-size: 9px;
+        color: #666;
+        vertical-align: top;
+    }
+}
+</style>
+"""
+
+POLICY_CERTIFICATE_CSS = """
+@import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;500;700&family=Noto+Sans:wght@400;600&display=swap');
+
+body {
+    font-family: 'Roboto', 'Noto Sans', Arial, sans-serif;
+    line-height: 1.5;
+    color: #2c3e50;
+    font-size: 11pt;
+    margin: 0;
+    padding: 20px;
+}
+
+.policy-header {
+    background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%);
+    color: white;
+    padding: 25px;
+    margin: -20px -20px 30px -20px;
+    text-align: center;
+    border-radius: 0 0 15px 15px;
+}
+
+.company-logo {
+    font-size: 28pt;
+    font-weight: 700;
+    margin-bottom: 5px;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
+}
+
+.company-tagline {
+    font-size: 12pt;
+    opacity: 0.9;
+    font-weight: 300;
+}
+
+.policy-title {
+    background-color: #f8fafc;
+    border: 2px solid #e2e8f0;
+    border-left: 6px solid #3b82f6;
+    padding: 20px;
+    margin: 20px 0;
+    font-size: 16pt;
+    font-weight: 600;
+    color: #1e40af;
+    text-align: center;
+}
+
+.section-header {
+    background: linear-gradient(90deg, #3b82f6, #60a5fa);
+    color: white;
+    padding: 12px 20px;
+    margin: 25px 0 15px 0;
+    font-weight: 600;
+    font-size: 13pt;
+    border-radius: 8px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+
+.info-grid {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 20px;
+    margin: 20px 0;
+}
+
+.info-card {
+    background-color: #f8fafc;
+    border: 1px solid #e2e8f0;
+    border-radius: 8px;
+    padding: 15px;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+}
+
+.info-label {
+    font-weight: 600;
+    color: #4b5563;
+    font-size: 10pt;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+    margin-bottom: 5px;
+}
+
+.info-value {
+    font-weight: 500;
+    color: #1f2937;
+    font-size: 12pt;
+}
+
+.coverage-highlight {
+    background: linear-gradient(135deg, #10b981, #34d399);
+    color: white;
+    padding: 20px;
+    border-radius: 12px;
+    text-align: center;
+    margin: 20px 0;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+}
+
+.coverage-amount {
+    font-size: 24pt;
+    font-weight: 700;
+    margin-bottom: 5px;
+}
+
+.coverage-text {
+    font-size: 12pt;
+    opacity: 0.9;
+}
+
+.benefits-grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+    gap: 15px;
+    margin: 20px 0;
+}
+
+.benefit-item {
+    background-color: #f0f9ff;
+    border: 1px solid #bae6fd;
+    border-left: 4px solid #0ea5e9;
+    padding: 12px;
+    border-radius: 6px;
+}
+
+.benefit-title {
+    font-weight: 600;
+    color: #0c4a6e;
+    margin-bottom: 5px;
+}
+
+.benefit-detail {
+    color: #475569;
+    font-size: 10pt;
+}
+
+.exclusions-box {
+    background-color: #fef2f2;
+    border: 2px solid #fecaca;
+    border-radius: 8px;
+    padding: 15px;
+    margin: 20px 0;
+}
+
+.exclusions-title {
+    color: #dc2626;
+    font-weight: 600;
+    margin-bottom: 10px;
+    font-size: 12pt;
+}
+
+.claim-process {
+    background-color: #f0fdf4;
+    border: 2px solid #bbf7d0;
+    border-radius: 8px;
+    padding: 20px;
+    margin: 20px 0;
+}
+
+.claim-steps {
+    counter-reset: step-counter;
+}
+
+.claim-step {
+    counter-increment: step-counter;
+    margin: 10px 0;
+    padding-left: 30px;
+    position: relative;
+}
+
+.claim-step::before {
+    content: counter(step-counter);
+    position: absolute;
+    left: 0;
+    top: 0;
+    background-color: #22c55e;
+    color: white;
+    width: 20px;
+    height: 20px;
+    border-radius: 50%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 9pt;
+    font-weight: 600;
+}
+
+.premium-details {
+    background: linear-gradient(135deg, #fbbf24, #f59e0b);
+    color: white;
+    padding: 20px;
+    border-radius: 10px;
+    margin: 20px 0;
+}
+
+.premium-amount {
+    font-size: 20pt;
+    font-weight: 700;
+    text-align: center;
+    margin-bottom: 10px;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 15px 0;
+    background-color: white;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+}
+
+th {
+    background: linear-gradient(135deg, #6b7280, #9ca3af);
+    color: white;
+    padding: 12px;
+    text-align: left;
+    font-weight: 600;
+}
+
+td {
+    padding: 10px 12px;
+    border-bottom: 1px solid #e5e7eb;
+}
+
+tr:nth-child(even) {
+    background-color: #f9fafb;
+}
+
+.signature-section {
+    margin-top: 40px;
+    padding-top: 20px;
+    border-top: 2px solid #d1d5db;
+}
+
+.regulatory-info {
+    background-color: #f3f4f6;
+    border: 1px solid #d1d5db;
+    padding: 15px;
+    border-radius: 8px;
+    margin: 20px 0;
+    font-size: 10pt;
+    color: #4b5563;
+}
+
+.important-notice {
+    background-color: #fef3c7;
+    border: 2px solid #fcd34d;
+    padding: 15px;
+    border-radius: 8px;
+    margin: 20px 0;
+}
+
+.exclusions-section {
+    background-color: #fef2f2;
+    border: 1px solid #fca5a5;
+    border-left: 4px solid #ef4444;
+    padding: 15px;
+    border-radius: 6px;
+    margin: 15px 0;
+}
+
+.contact-info {
+    background: linear-gradient(135deg, #1e3a8a, #3b82f6);
+    color: white;
+    padding: 25px;
+    border-radius: 12px;
+    margin: 20px 0;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+}
+
+.contact-info h3 {
+    margin-top: 0;
+    color: white;
+    font-size: 16pt;
+    margin-bottom: 15px;
+}
+
+.contact-info strong {
+    color: #fbbf24;
+    font-weight: 600;
+}
+
+.footer-disclaimer {
+    font-size: 9pt;
+    color: #6b7280;
+    text-align: center;
+    margin-top: 30px;
+    padding-top: 15px;
+    border-top: 1px solid #e5e7eb;
+}
+
+h1, h2, h3 {
+    color: #1e40af;
+    margin-top: 25px;
+    margin-bottom: 15px;
+}
+
+h1 {
+    font-size: 18pt;
+    border-bottom: 3px solid #3b82f6;
+    padding-bottom: 10px;
+}
+
+h2 {
+    font-size: 14pt;
+    background: linear-gradient(90deg, #3b82f6, #60a5fa);
+    color: white;
+    padding: 12px 20px;
+    border-radius: 8px;
+    margin: 25px 0 15px 0;
+}
+
+h3 {
+    font-size: 13pt;
+    color: #1e40af;
+}
+
+p {
+    margin: 10px 0;
+    text-align: justify;
+}
+
+ul, li {
+    margin: 5px 0;
+}
+
+strong {
+    color: #1f2937;
+    font-weight: 600;
+}
+
+hr {
+    border: none;
+    border-top: 2px solid #e2e8f0;
+    margin: 25px 0;
+}
+"""
+
+CERTIFICATE_HEADER = """<div class="policy-header">
+    <div class="company-logo">🛡️ GLOBAL SECURE SHIELD</div>
+    <div class="company-tagline">AI-Powered Insurance Solutions | {{claim_type_title}} Insurance Policy</div>
+</div>
+
+<div class="policy-title">
+    {{claim_type_upper}} INSURANCE POLICY CERTIFICATE<br>
+    <span style="font-size: 12pt; font-weight: 400;">(AI-Generated Document)</span>
+</div>
+
+---
+
+<div class="section-header">📋 POLICY & CUSTOMER DETAILS</div>
+
+<div class="info-grid">
+    <div class="info-card">
+        <div class="info-label">Policyholder Name</div>
+        <div class="info-value">{{customer_name}}</div>
+    </div>
+    <div class="info-card">
+        <div class="info-label">Policy Number</div>
+        <div class="info-value">{{policy_number}}</div>
+    </div>
+    <div class="info-card">
+        <div class="info-label">Policy Start Date</div>
+        <div class="info-value">{{policy_start_date}}</div>
+    </div>
+    <div class="info-card">
+        <div class="info-label">Policy End Date</div>
+        <div class="info-value">{{renewal_date}} (1-year policy)</div>
+    </div>
+    <div class="info-card">
+        <div class="info-label">Contact Address</div>
+        <div class="info-value">B-204, Green Valley Apartments<br>Sector 21, Noida, UP - 201301</div>
+    </div>
+    <div class="info-card">
+        <div class="info-label">Contact Details</div>
+        <div class="info-value">📱 +91-98765-43210<br>📧 {{customer_email}}</div>
+    </div>
+</div>
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Insurer Information</h3>
+**Company:** Global Secure Shield Insurance Company Limited  
+**Licensed Office:** Global Secure Shield Tower, Plot No. 45, Financial District, Bandra Kurla Complex, Mumbai - 400051  
+**Customer Service:** 1800-12-SECURE (Toll Free)  
+**Website:** www.globalsecureshield.com
+
+---
+
+<div class="section-header">🏥 COMPREHENSIVE COVERAGE INFORMATION</div>
+
+<div class="coverage-highlight">
+    <div class="coverage-amount">₹{{claim_amount}}</div>
+    <div class="coverage-text">Sum Insured ({{claim_type_title}} Coverage)</div>
+</div>
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Policy Type</h3>
+**Comprehensive {{claim_type_title}} Insurance** - AI-Generated Policy Plan
+"""
+
+# Coverage inclusions per claim type (other types have no coverage block)
+COVERAGE_SECTIONS = {
+    "health": """
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Coverage Inclusions</h3>
+
+<div class="benefits-grid">
+    <div class="benefit-item">
+        <div class="benefit-title">🏨 Hospitalization</div>
+        <div class="benefit-detail">In-patient treatment for minimum 24 hours</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🏥 Room Rent</div>
+        <div class="benefit-detail">Up to ₹8,000 per day (Private AC Room)</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🚑 Ambulance Services</div>
+        <div class="benefit-detail">Up to ₹5,000 per claim incident</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🔬 ICU Charges</div>
+        <div class="benefit-detail">Intensive Care Unit expenses covered</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">💉 Day Care Treatments</div>
+        <div class="benefit-detail">Same day discharge procedures</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🏥 Pre & Post Hospitalization</div>
+        <div class="benefit-detail">60 days before, 90 days after</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">👶 Maternity Cover</div>
+        <div class="benefit-detail">Up to ₹75,000 (after waiting period)</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🩺 Annual Health Check-up</div>
+        <div class="benefit-detail">Up to ₹3,000 per policy year</div>
+    </div>
+</div>
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Waiting Periods</h3>
+
+| Condition Type | Waiting Period | Coverage Details |
+|----------------|----------------|------------------|
+| **General Illnesses** | 30 days | All acute conditions after policy inception |
+| **Pre-existing Diseases** | 2 years | Conditions existing before policy start |
+| **Maternity & Newborn** | 3 years | Pregnancy, delivery, and infant care |
+| **Specific Diseases** | 2 years | Heart disease, cancer, kidney ailments |
+""",
+    "auto": """
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Coverage Inclusions</h3>
+
+<div class="benefits-grid">
+    <div class="benefit-item">
+        <div class="benefit-title">🚗 Own Damage</div>
+        <div class="benefit-detail">Complete vehicle damage coverage</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🛡️ Third Party Liability</div>
+        <div class="benefit-detail">₹15,00,000 as per Motor Tariff</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🔧 Engine Protection</div>
+        <div class="benefit-detail">Water ingress damage coverage</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🆘 Roadside Assistance</div>
+        <div class="benefit-detail">24x7 emergency services</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🔑 Key Replacement</div>
+        <div class="benefit-detail">Lost key reimbursement</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🛞 Tyre Protection</div>
+        <div class="benefit-detail">Damage to tyres and tubes</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">💰 Return to Invoice</div>
+        <div class="benefit-detail">Gap between IDV and invoice value</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🎯 Zero Depreciation</div>
+        <div class="benefit-detail">Brand new spare parts replacement</div>
+    </div>
+</div>
+""",
+    "life": """
+### Coverage Inclusions
+
+<div class="benefits-grid">
+    <div class="benefit-item">
+        <div class="benefit-title">💖 Death Benefit</div>
+        <div class="benefit-detail">100% sum assured to nominee</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🏥 Terminal Illness</div>
+        <div class="benefit-detail">50% of sum assured</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🚑 Accidental Death</div>
+        <div class="benefit-detail">Additional ₹{{claim_amount}}</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">💰 Maturity Benefit</div>
+        <div class="benefit-detail">105% of premiums paid (if survived)</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🏦 Loan Facility</div>
+        <div class="benefit-detail">After 3 years (up to 90% surrender value)</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">📋 Premium Waiver</div>
+        <div class="benefit-detail">On permanent disability</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">💳 Tax Benefits</div>
+        <div class="benefit-detail">Under Section 80C and 10(10D)</div>
+    </div>
+    <div class="benefit-item">
+        <div class="benefit-title">🕐 Grace Period</div>
+        <div class="benefit-detail">30 days for premium payment</div>
+    </div>
+</div>
+"""
+}
+
+CERTIFICATE_FOOTER = """
+---
+
+## 3. Premium Details
+
+<div class="section-header">💰 PREMIUM & PAYMENT INFORMATION</div>
+
+<div class="premium-details">
+    <div class="premium-amount">₹{{total_premium}}</div>
+    <div style="text-align: center; opacity: 0.9;">Total Annual Premium (Including 18% GST)</div>
+</div>
+
+### Payment Information
+- **Base Premium:** ₹{{base_premium}}
+- **GST (18%):** ₹{{gst_amount}}
+- **Total Premium:** ₹{{total_premium}}
+- **Payment Frequency:** Annual
+- **Payment Mode:** Online Bank Transfer (NEFT/RTGS)
+- **Payment Date:** {{issue_date}}
+- **Transaction ID:** {{transaction_id}}
+- **Next Renewal Due:** {{renewal_date}}
+
+### Premium Breakdown by Coverage
+
+| Coverage Component | Premium Amount | Percentage |
+|-------------------|----------------|------------|
+| Base {{claim_type_title}} Cover | ₹{{base_cover_premium}} | 72.0% |
+| Additional Benefits | ₹{{additional_benefits_premium}} | 12.0% |
+| Administrative Fees | ₹{{administrative_fees}} | 4.0% |
+| Service Tax & GST | ₹{{gst_amount}} | 16.0% |
+| **Total** | **₹{{total_premium}}** | **100%** |
+
+---
+
+<div class="section-header">📋 CLAIM INFORMATION & PROCESS</div>
+
+<div class="claim-process">
+<h3 style="color: #22c55e; margin-top: 0;">📋 How to File a Claim</h3>
+
+<div class="claim-steps">
+<div class="claim-step"><strong>Inform Immediately:</strong> Call our 24x7 helpline within 24 hours of incident</div>
+<div class="claim-step"><strong>Pre-authorization:</strong> For cashless treatment, get pre-approval from network providers</div>
+<div class="claim-step"><strong>Submit Documents:</strong> Provide all required documents within 15 days</div>
+<div class="claim-step"><strong>Claim Processing:</strong> Our team will process your claim within 30 working days</div>
+<div class="claim-step"><strong>Settlement:</strong> Approved amount will be settled directly or reimbursed</div>
+</div>
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Required Documents for Claims</h3>
+
+<h4 style="color: #1e40af; margin: 15px 0 10px 0;">For {{claim_type_title}} Claims:</h4>
+- ✅ Duly filled and signed claim form
+- ✅ Original bills and payment receipts
+- ✅ Medical reports and discharge summary (if applicable)
+- ✅ Diagnostic reports and test results (if applicable)
+- ✅ Photo ID proof and policy document
+- ✅ Bank account details for reimbursement
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Claim Submission Channels</h3>
+
+| Method | Details | Processing Time |
+|--------|---------|----------------|
+| **Online Portal** | www.globalsecureshield.com/claims | 24-48 hours |
+| **Mobile App** | GSS Claims App (Android/iOS) | 24-48 hours |
+| **Email** | claims@globalsecureshield.com | 48-72 hours |
+| **Toll-Free** | 1800-12-SECURE | Immediate assistance |
+| **Branch Visit** | Any GSS branch office | Same day |
+
+---
+
+<div class="section-header">🚫 POLICY EXCLUSIONS</div>
+
+<div class="exclusions-box">
+    <h3 style="color: #dc2626; margin-top: 0; margin-bottom: 15px; font-size: 13pt;">⚠️ What's NOT Covered</h3>
+
+<h4 style="color: #dc2626; margin: 15px 0 10px 0;">General Exclusions:</h4>
+- Self-inflicted injuries and attempted suicide
+- War, nuclear risks, and acts of terrorism
+- Experimental or unproven treatments
+- Pre-existing conditions (first 2 years)
+- Fraudulent claims and misrepresentation
+
+<h4 style="color: #dc2626; margin: 15px 0 10px 0;">Treatment Exclusions:</h4>
+- Cosmetic and plastic surgery (unless medically necessary)
+- Routine check-ups and preventive care (except covered benefits)
+- Treatment outside India (except emergency)
+- Alternative medicine (unless specified)
+- Mental illness and psychiatric disorders (unless covered)
+
+</div>
+
+---
+
+<div class="section-header">📋 IMPORTANT TERMS & CONDITIONS</div>
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">General Terms</h3>
+
+1. **Grace Period:** 30 days from due date for premium payment
+2. **Free Look Period:** 15 days from policy receipt to review and return
+3. **Renewal:** Lifetime renewability guaranteed (subject to terms)
+4. **Age Limits:** Entry age 18-65 years, renewable up to 80 years
+5. **Network:** 12,000+ authorized service providers across India
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Policy Conditions</h3>
+
+<h4 style="color: #1e40af; margin: 15px 0 10px 0;">Medical Examination (for Health Insurance)</h4>
+- Not required for sum insured up to ₹5 lakhs for age below 45 years
+- Pre-medical screening required for higher sum insured or older age
+
+<h4 style="color: #1e40af; margin: 15px 0 10px 0;">Pre-existing Conditions</h4>
+- Must be declared at the time of proposal
+- Covered after completion of waiting period
+- Medical records may be verified before claim settlement
+
+---
+
+<div class="section-header">📞 REGULATORY COMPLIANCE & CONTACT DETAILS</div>
+
+<div class="contact-info">
+    <h3 style="color: white; margin-top: 0; margin-bottom: 15px; font-size: 13pt;">🏛️ Regulatory Information</h3>
+    <strong>IRDAI Registration No.:</strong> 157<br>
+    <strong>Valid until:</strong> 31 March 2026<br>
+    <strong>Category:</strong> General Insurance Company<br>
+    <strong>License Date:</strong> 15 April 2001<br>
+    <strong>Complaint Reference:</strong> IRDAI Complaint Portal - www.irdai.gov.in
+</div>
+
+<div class="contact-info">
+    <h3 style="color: white; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">📞 Customer Care & Support</h3>
+    <strong>24x7 Helpline:</strong> 1800-12-SECURE<br>
+    <strong>Email:</strong> support@globalsecureshield.com<br>
+    <strong>Website:</strong> www.globalsecureshield.com<br>
+    <strong>Mobile App:</strong> GSS Insurance (iOS/Android)<br>
+    <strong>WhatsApp:</strong> +91-98765-SECURE
+</div>
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Branch Offices</h3>
+
+| City | Address | Contact |
+|------|---------|---------|
+| **New Delhi** | Connaught Place, CP Metro Station | +91-11-2341-5678 |
+| **Mumbai** | Nariman Point, Near RBI Building | +91-22-6789-0123 |
+| **Bangalore** | MG Road, Brigade Center | +91-80-4567-8901 |
+| **Chennai** | Anna Salai, Express Towers | +91-44-2890-1234 |
+| **Kolkata** | Park Street, AJC Bose Road | +91-33-5678-9012 |
+
+---
+
+<div class="signature-section">
+
+<h3 style="color: #1e40af; margin-top: 25px; margin-bottom: 15px; font-size: 13pt;">Digital Signatures & Validation</h3>
+
+<table style="border: none;">
+<tr style="border: none;">
+<td style="border: none; width: 50%; text-align: center; padding: 20px;">
+<strong>AI Policy Generated By:</strong><br><br>
+<strong>Azure AI Insurance Expert</strong><br>
+AI-Powered Policy Generation<br>
+Global Secure Shield Insurance<br>
+System ID: AI-GSS-2025<br>
+<em>Digital Signature Applied</em><br>
+<em>Date: {{issue_date}}</em>
+</td>
+<td style="border: none; width: 50%; text-align: center; padding: 20px;">
+<strong>Processed & Validated By:</strong><br><br>
+<strong>Automated Underwriting System</strong><br>
+Risk Assessment & Policy Validation<br>
+Global Secure Shield Insurance<br>
+System ID: AUTO-UW-2025<br>
+<em>Automated Validation Applied</em><br>
+<em>Date: {{issue_date}}</em>
+</td>
+</tr>
+</table>
+
+</div>
+
+<div class="important-notice">
+    <strong>🔒 Important Security Information</strong><br>
+    This policy certificate is generated using advanced AI technology and is valid for demonstration purposes. 
+    Policy authenticity can be verified online at www.globalsecureshield.com using policy number {{policy_number}}.
+    For actual insurance coverage, please consult with licensed insurance professionals.
+</div>
+
+<div class="footer-disclaimer">
+    <strong>AI-Generated Document Notice:</strong> This policy document has been created using advanced artificial intelligence technology 
+    and professional insurance industry standards. The content is generated based on the provided customer data and comprehensive 
+    insurance knowledge base. While this demonstrates the capabilities of AI in insurance document generation, 
+    for actual insurance coverage and legal validity, please consult with licensed insurance professionals and authorized insurance companies.<br><br>
+    <strong>Disclaimer:</strong> This policy is subject to terms, conditions, and exclusions mentioned in the policy wordings. 
+    For complete terms and conditions, please refer to the policy document. In case of any dispute, 
+    the English version of the policy shall prevail. This policy is regulated by the Insurance Regulatory 
+    and Development Authority of India (IRDAI).<br><br>
+    <strong>Document Generation Info:</strong><br>
+    • Generated on: {{generated_at}}<br>
+    • Customer: {{customer_name}}<br>
+    • Policy Type: {{claim_type_title}} Insurance<br>
+    • Document ID: AI-{{policy_number}}-{{document_timestamp}}<br>
+    • AI System: Azure OpenAI + Global Secure Shield Platform
+</div>"""
+
+def render_template(template: str, variables: Dict[str, Any]) -> str:
+    """
+    Substitute `{{variable}}` placeholders in a template.
+    
+    Args:
+        template: Template text
+        variables: Placeholder values; unknown placeholders are left unchanged
+    
+    Returns:
+        Rendered text
+    """
+    return TEMPLATE_VARIABLE.sub(lambda match: str(variables.get(match.group(1), match.group(0))), template)
+
+def _css_content(text: str) -> str:
+    """Build a CSS `content` value from text where {page} becomes the page counter."""
+    return ' counter(page) '.join(
+        '"' + part.replace("\\", "\\\\").replace('"', '\\"') + '"' for part in text.split("{page}")
+    )
+
+def build_page_chrome_style(header_text: str, footer_text: str) -> str:
+    """
+    Build a style block that prints a header and footer on every page.
+    
+    Args:
+        header_text: Text at the top of each page
+        footer_text: Text at the bottom of each page; {page} is replaced by the page number
+    
+    Returns:
+        `<style>` element with `@page` margin boxes
+    """
+    return PAGE_CHROME_STYLE.replace("HEADER_CONTENT", _css_content(header_text)).replace(
+        "FOOTER_CONTENT", _css_content(footer_text)
+    )
+
+def get_certificate_template_name(claim_type: str) -> str:
+    """Get the server-side template name for a claim type."""
+    return f"gss_policy_certificate_{claim_type}_v{CERTIFICATE_TEMPLATE_VERSION}"
+
+def build_certificate_template(claim_type: str, page_chrome: bool = False) -> str:
+    """
+    Build the certificate template for a claim type.
+    
+    Args:
+        claim_type: Policy type (health, auto, life, ...)
+        page_chrome: Add the per-page header and footer (for the registered
+                     template; custom styles add them through their options)
+    
+    Returns:
+        Certificate HTML with `{{variable}}` placeholders
+    """
+    template = CERTIFICATE_HEADER + COVERAGE_SECTIONS.get(claim_type, "") + CERTIFICATE_FOOTER
+    if page_chrome:
+        header_text = CERTIFICATE_PAGE_HEADER.format(claim_type_title=claim_type.title())
+        template = build_page_chrome_style(header_text, CERTIFICATE_PAGE_FOOTER) + template
+    return template
+
+def build_certificate_variables(policy_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Build the per-document variable map of the certificate template.
+    
+    Args:
+        policy_data: Parsed policy JSON (customerName, policyNumber, claimType, claimAmount, policyStartDate)
+        now: Generation time (default: current time)
+    
+    Returns:
+        Placeholder values for `build_certificate_template`
+    """
+    now = now or datetime.now()
+    customer_name = policy_data.get('customerName', 'Valued Customer')
+    policy_number = policy_data.get('policyNumber', f'GSS-{now.year}-{now.strftime("%m%d%H%M")}')
+    claim_type = policy_data.get('claimType', 'health').lower()
+    claim_amount = policy_data.get('claimAmount', 0)
+    policy_start_date = policy_data.get('policyStartDate', now.strftime('%Y-%m-%d'))
+    
+    return {
+        "customer_name": customer_name,
+        "customer_email": f"{customer_name.lower().replace(' ', '.')}@gmail.com",
+        "policy_number": policy_number,
+        "policy_start_date": policy_start_date,
+        "claim_type_title": claim_type.title(),
+        "claim_type_upper": claim_type.upper(),
+        "claim_amount": f"{claim_amount:,}",
+        "total_premium": f"{max(25000, claim_amount // 15):,}",
+        "base_premium": f"{max(21000, claim_amount // 18):,}",
+        "gst_amount": f"{max(4000, claim_amount // 100):,}",
+        "base_cover_premium": f"{max(18000, claim_amount // 20):,}",
+        "additional_benefits_premium": f"{max(3000, claim_amount // 100):,}",
+        "administrative_fees": f"{max(1000, claim_amount // 300):,}",
+        "transaction_id": f"GSS{now.strftime('%y%m%d')}AI{policy_number[-6:]}",
+        "issue_date": now.strftime('%d %B %Y'),
+        "renewal_date": now.replace(year=now.year + 1).strftime('%d %B %Y'),
+        "generated_at": now.strftime('%d %B %Y at %I:%M %p'),
+        "document_timestamp": now.strftime('%Y%m%d%H%M')
+    }
@@ -0,0 +1,251 @@
+"""
+Local fakes for the external services used by the benchmark suite.
+
+- FakeAIProjectClient: stands in for `azure.ai.projects.AIProjectClient` and
+  answers agent runs from recorded fixtures.
+- FakeLogicAppServer: local HTTP endpoint for the Logic App email trigger.
+- FAKE_MCP_SERVER: node script replacing the pdf-mcp-server.
+
+Importing this package registers stand-in `azure.ai.projects` and
+`azure.identity` modules when the Azure SDKs are not installed, so the agents
+import without them; their clients are the fakes below.
+"""
+
+import importlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+FAKE_MCP_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_pdf_mcp_server.js")
+
+class FakeTextMessage:
+    """Text message shaped like the Azure AI Projects MessageTextContent model."""
+    
+    def __init__(self, value: str):
+        """Initialize the message with its text value."""
+        self.text = {"value": value, "annotations": []}
+    
+    def as_dict(self) -> dict:
+        """Return the message as a dictionary like the SDK model."""
+        return {"type": "text", "text": self.text}
+
+class FakeAgentsClient:
+    """
+    In-memory stand-in for `AIProjectClient.agents`.
+    
+    Replies come from a responder callable that receives the latest user message
+    and returns either a reply string or a dict with a "tool_call" to request.
+    """
+    
+    def __init__(self, responder, latency_ms: float = 0, in_progress_polls: int = 0):
+        """
+        Initialize the fake agents client.
+        
+        Args:
+            responder: Callable(user_message) -> str or {"tool_call": {...}, "reply": str}
+            latency_ms: Simulated model latency per run
+            in_progress_polls: Number of get_run polls that report "in_progress"
+        """
+        self.responder = responder
+        self.latency_ms = latency_ms
+        self.in_progress_polls = in_progress_polls
+        self._ids = itertools.count(1)
+        self._threads = {}
+        self._runs = {}
+        self.calls = {"runs": 0, "tool_calls": 0}
+    
+    def get_agent(self, agent_id: str):
+        """Return a fake agent object."""
+        return SimpleNamespace(id=agent_id)
+    
+    def create_thread(self):
+        """Create a new conversation thread."""
+        thread = SimpleNamespace(id=f"thread_{next(self._ids)}")
+        self._threads[thread.id] = []
+        return thread
+    
+    def create_message(self, thread_id: str, role: str, content: str):
+        """Append a message to a thread."""
+        self._threads[thread_id].append({"role": role, "content": content})
+        return SimpleNamespace(id=f"msg_{next(self._ids)}", role=role, content=content)
+    
+    def create_and_process_run(self, thread_id: str, agent_id: str, **kwargs):
+        """Run the agent to completion (no tool calls)."""
+        self.calls["runs"] += 1
+        self._simulate_latency()
+        reply = self._respond(thread_id)
+        self._threads[thread_id].append({"role": "assistant", "content": reply.get("reply", "")})
+        return SimpleNamespace(id=f"run_{next(self._ids)}", status="completed")
+    
+    def create_run(self, thread_id: str, agent_id: str, **kwargs):
+        """Start a run that may request a tool call."""
+        self.calls["runs"] += 1
+        run_id = f"run_{next(self._ids)}"
+        self._runs[run_id] = {"thread_id": thread_id, "polls": 0, "stage": "started", "reply": None}
+        return SimpleNamespace(id=run_id, status="queued")
+    
+    def get_run(self, run_id: str, thread_id: str):
+        """Poll a run started with create_run."""
+        run = self._runs[run_id]
+        if run["polls"] < self.in_progress_polls:
+            run["polls"] += 1
+            return SimpleNamespace(id=run_id, status="in_progress")
+        
+        if run["stage"] == "started":
+            self._simulate_latency()
+            run["reply"] = self._respond(thread_id)
+            tool_call = run["reply"].get("tool_call")
+            if tool_call:
+                run["stage"] = "requires_action"
+                self.calls["tool_calls"] += 1
+                call = SimpleNamespace(
+                    id=f"call_{next(self._ids)}",
+                    function=SimpleNamespace(name=tool_call["name"], arguments=json.dumps(tool_call["arguments"]))
+                )
+                return SimpleNamespace(
+                    id=run_id,
+                    status="requires_action",
+                    required_action=SimpleNamespace(submit_tool_outputs=SimpleNamespace(tool_calls=[call]))
+                )
+            run["stage"] = "tool_outputs_submitted"
+        
+        if run["stage"] == "tool_outputs_submitted":
+            self._threads[thread_id].append({"role": "assistant", "content": run["reply"].get("reply", "")})
+            run["stage"] = "completed"
+        return SimpleNamespace(id=run_id, status="completed")
+    
+    def submit_tool_outputs_to_run(self, thread_id: str, run_id: str, tool_outputs: list):
+        """Accept tool outputs for a run waiting on requires_action."""
+        run = self._runs[run_id]
+        run["stage"] = "tool_outputs_submitted"
+        run["polls"] = 0
+        return SimpleNamespace(id=run_id, status="in_progress")
+    
+    def list_messages(self, thread_id: str):
+        """List thread messages, newest assistant text first (like the SDK)."""
+        assistant_messages = [
+            message for message in reversed(self._threads[thread_id]) if message["role"] == "assistant"
+        ]
+        return SimpleNamespace(text_messages=[FakeTextMessage(message["content"]) for message in assistant_messages])
+    
+    def _respond(self, thread_id: str) -> dict:
+        """Ask the responder for a reply to the latest user message."""
+        user_messages = [message["content"] for message in self._threads[thread_id] if message["role"] == "user"]
+        reply = self.responder(user_messages[-1] if user_messages else "")
+        return reply if isinstance(reply, dict) else {"reply": reply}
+    
+    def _simulate_latency(self):
+        """Sleep for the configured model latency."""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+class FakeAIProjectClient:
+    """Stand-in for `azure.ai.projects.AIProjectClient` backed by FakeAgentsClient."""
+    
+    agents_factory = None
+    
+    def __init__(self, agents: FakeAgentsClient):
+        """Initialize with a fake agents client."""
+        self.agents = agents
+    
+    @classmethod
+    def from_connection_string(cls, credential=None, conn_str: str = None):
+        """Create a client the same way the application code does."""
+        return cls(cls.agents_factory())
+
+class FakeCredential:
+    """Stand-in for `DefaultAzureCredential`."""
+    
+    def __init__(self, *args, **kwargs):
+        """Accept and ignore credential options."""
+
+def install_azure_stubs():
+    """
+    Register stand-in Azure SDK modules in sys.modules unless the SDKs are installed.
+    
+    The stubs expose what the agents import: `AIProjectClient` (FakeAIProjectClient),
+    `DefaultAzureCredential` (FakeCredential) and `azure.ai.projects.models.ToolDefinition`.
+    
+    Returns:
+        True if the stubs were installed, False if the real SDKs are used
+    """
+    try:
+        importlib.import_module("azure.ai.projects")
+        importlib.import_module("azure.identity")
+        return False
+    except ImportError:
+        pass
+    
+    modules = {}
+    for name in ("azure", "azure.ai", "azure.ai.projects", "azure.ai.projects.models", "azure.identity"):
+        module = type(sys)(name)
+        module.__path__ = []
+        modules[name] = module
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(modules[parent], child, module)
+    modules["azure.ai.projects"].AIProjectClient = FakeAIProjectClient
+    modules["azure.ai.projects.models"].ToolDefinition = dict
+    modules["azure.identity"].DefaultAzureCredential = FakeCredential
+    sys.modules.update(modules)
+    return True
+
+class _LogicAppRequestHandler(BaseHTTPRequestHandler):
+    """Accepts Logic App trigger posts."""
+    
+    def do_POST(self):
+        """Record the request and reply with 202 Accepted after the configured latency."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.fake.record(len(body))
+        time.sleep(self.server.fake.latency_ms / 1000)
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+class FakeLogicAppServer:
+    """Local HTTP endpoint standing in for the Logic App email trigger."""
+    
+    def __init__(self, latency_ms: float = 0, port: int = 0):
+        """
+        Initialize the fake Logic App endpoint.
+        
+        Args:
+            latency_ms: Simulated trigger latency
+            port: Local port (0 picks a free port)
+        """
+        self.latency_ms = latency_ms
+        self.stats = {"requests": 0, "request_bytes": 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _LogicAppRequestHandler)
+        self._server.fake = self
+    
+    @property
+    def url(self) -> str:
+        """Trigger URL to use in place of the Logic App endpoint."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}/api/Insurance/triggers/manual/invoke"
+    
+    def record(self, request_bytes: int):
+        """Count a received request."""
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["request_bytes"] += request_bytes
+    
+    def __enter__(self):
+        """Start serving in a background thread."""
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+install_azure_stubs()
@@ -0,0 +1,152 @@
+#!/usr/bin/env node
+// Stand-in for the pdf-mcp-server used by benchmarks.
+// Speaks the same line-delimited JSON-RPC over stdio and writes a small
+// placeholder PDF (one blank A4 page per 4000 characters of content) instead
+// of rendering with a headless browser.
+//
+// Environment:
+//   FAKE_MCP_RENDER_MS         simulated render time per PDF (default 250)
+//   FAKE_MCP_RENDER_MS_PER_KB  additional render time per KB of content (default 0)
+//   FAKE_MCP_STDERR_BYTES  bytes of log lines written to stderr per PDF (default 0),
+//                          mimicking a chatty Playwright/markdown-it server
+
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+
+const RENDER_MS = parseInt(process.env.FAKE_MCP_RENDER_MS || '250', 10);
+const RENDER_MS_PER_KB = parseFloat(process.env.FAKE_MCP_RENDER_MS_PER_KB || '0');
+const STDERR_BYTES = parseInt(process.env.FAKE_MCP_STDERR_BYTES || '0', 10);
+const styles = {};
+const templates = {};
+
+function pageCountFor(content) {
+  return Math.max(1, Math.ceil((content || '').length / 4000));
+}
+
+function renderDelayMs(content) {
+  return RENDER_MS + Math.round(RENDER_MS_PER_KB * Buffer.byteLength(content || '') / 1024);
+}
+
+// Minimal valid PDF with blank A4 pages, so merging tools can read it
+function buildPlaceholderPdf(pageCount, note) {
+  const objects = ['<< /Type /Catalog /Pages 2 0 R >>'];
+  const kids = [];
+  for (let index = 0; index < pageCount; index++) kids.push(`${index + 3} 0 R`);
+  objects.push(`<< /Type /Pages /Kids [${kids.join(' ')}] /Count ${pageCount} >>`);
+  for (let index = 0; index < pageCount; index++) objects.push('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>');
+
+  let body = `%PDF-1.4\n% ${note}\n`;
+  const offsets = [];
+  objects.forEach((object, index) => {
+    offsets.push(Buffer.byteLength(body));
+    body += `${index + 1} 0 obj\n${object}\nendobj\n`;
+  });
+  const xrefOffset = Buffer.byteLength(body);
+  body += `xref\n0 ${objects.length + 1}\n0000000000 65535 f \n`;
+  body += offsets.map((offset) => `${String(offset).padStart(10, '0')} 00000 n \n`).join('');
+  body += `trailer\n<< /Size ${objects.length + 1} /Root 1 0 R >>\nstartxref\n${xrefOffset}\n%%EOF\n`;
+  return body;
+}
+
+function writePlaceholderPdf(outputPath, content) {
+  fs.mkdirSync(path.dirname(outputPath), { recursive: true });
+  const body = buildPlaceholderPdf(pageCountFor(content), `benchmark placeholder (${Buffer.byteLength(content || '')} bytes of content)`);
+  fs.writeFileSync(outputPath, body);
+  return Buffer.byteLength(body);
+}
+
+const sleepCell = new Int32Array(new SharedArrayBuffer(4));
+
+// Blocking write, like a native process sharing the server's stderr: when the
+// pipe is full the server stalls until the reader catches up
+function writeBlocking(fd, text) {
+  let buffer = Buffer.from(text);
+  while (buffer.length) {
+    try {
+      buffer = buffer.subarray(fs.writeSync(fd, buffer));
+    } catch (error) {
+      if (error.code !== 'EAGAIN') throw error;
+      Atomics.wait(sleepCell, 0, 0, 1);
+    }
+  }
+}
+
+function writeRenderLog(outputPath) {
+  let written = 0;
+  let line = 0;
+  while (written < STDERR_BYTES) {
+    const message = `[render] ${outputPath} step ${line++}: layout pass ${'.'.repeat(80)}\n`;
+    writeBlocking(2, message);
+    written += Buffer.byteLength(message);
+  }
+}
+
+function renderResult(outputPath, content, extra) {
+  const started = Date.now();
+  writeRenderLog(outputPath);
+  const fileSize = writePlaceholderPdf(outputPath, content);
+  return {
+    success: true,
+    output_path: outputPath,
+    file_size: fileSize,
+    page_count: pageCountFor(content),
+    generation_time_ms: renderDelayMs(content) + (Date.now() - started),
+    ...extra
+  };
+}
+
+const tools = {
+  generate_pdf: (args) => renderResult(args.output_path, args.content),
+  generate_pdf_with_style: (args) => renderResult(args.output_path, args.content, { style_name: args.style_name }),
+  generate_pdf_from_template: (args) => {
+    const template = templates[args.template_name];
+    if (!template) return { success: false, error: `Unknown template: ${args.template_name}` };
+    const variables = args.variables || {};
+    const html = (template.html_template || '').replace(/\{\{(\w+)\}\}/g, (match, name) => (name in variables ? String(variables[name]) : match));
+    return renderResult(args.output_path, html + (args.content || ''), { template_name: args.template_name });
+  },
+  create_custom_style: (args) => {
+    styles[args.style_name] = args;
+    return { success: true, style_name: args.style_name };
+  },
+  create_styled_template: (args) => {
+    templates[args.template_name] = args;
+    return { success: true, template_name: args.template_name };
+  },
+  list_custom_styles: () => ({ styles: Object.keys(styles) }),
+  get_custom_style: (args) => styles[args.style_name] || { error: `Unknown style: ${args.style_name}` },
+  get_available_themes: () => ({ themes: ['default', 'professional'] })
+};
+
+const RENDER_TOOLS = new Set(['generate_pdf', 'generate_pdf_with_style', 'generate_pdf_from_template']);
+
+function respond(id, result) {
+  process.stdout.write(JSON.stringify({ jsonrpc: '2.0', id, result }) + '\n');
+}
+
+function respondError(id, message) {
+  process.stdout.write(JSON.stringify({ jsonrpc: '2.0', id, error: { code: -32601, message } }) + '\n');
+}
+
+const rl = readline.createInterface({ input: process.stdin });
+rl.on('line', (line) => {
+  if (!line.trim()) return;
+  const request = JSON.parse(line);
+
+  if (request.method === 'tools/list') {
+    respond(request.id, { tools: Object.keys(tools).map((name) => ({ name })) });
+    return;
+  }
+  if (request.method !== 'tools/call' || !tools[request.params.name]) {
+    respondError(request.id, `Unsupported request: ${request.method} ${request.params && request.params.name}`);
+    return;
+  }
+
+  const name = request.params.name;
+  const result = tools[name](request.params.arguments || {});
+  const delay = RENDER_TOOLS.has(name) && result.success ? result.generation_time_ms : 0;
+  setTimeout(() => respond(request.id, { content: [{ type: 'text', text: JSON.stringify(result) }] }), delay);
+});
+
+console.error('Fake PDF MCP server running on stdio');
@@ -0,0 +1,111 @@
+"""
+Memory benchmark of the Policy Agent conversation history in long sessions.
+
+Records --turns policy JSON turns (a policy with a --payload-kb terms field plus
+the agent reply) in an unbounded list of dicts, as the agent used to, and in a
+ConversationHistory with an on-disk log. Reports the memory held by each
+(tracemalloc), the append time per turn and the summary time. The check fails
+(exit code 1) when the history does not stay within its ring or a turn that
+left the ring cannot be read back from the log.
+
+Usage (from the repository root):
+    python benchmarks/history_benchmark.py --turns 5000 --payload-kb 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from stats import write_json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_DIR = os.path.join(ROOT_DIR, "MCP")
+
+def make_turn(index: int, payload_kb: int):
+    """Build the raw JSON input and parsed policy data of one turn."""
+    policy_data = {
+        "customerName": f"Customer {index}",
+        "policyNumber": f"GSS-2025-{index:06d}",
+        "claimType": "health",
+        "claimAmount": 500000,
+        "policyStartDate": "2025-04-01",
+        "terms": "Hospitalization and day-care treatment are covered. " * (payload_kb * 1024 // 54)
+    }
+    return json.dumps(policy_data, indent=2), policy_data
+
+def record_list(history: list, user_input: str, policy_data: dict):
+    """Record a turn the way the agent did before the bounded history."""
+    history.append({'timestamp': datetime.now().isoformat(), 'role': 'user', 'content': user_input, 'policy_data': policy_data})
+    history.append({'timestamp': datetime.now().isoformat(), 'role': 'assistant', 'content': "Generated AI-powered health policy document with PDF"})
+
+def measure(record, history, turns: int, payload_kb: int):
+    """Record the turns and return (retained bytes, append microseconds per turn)."""
+    tracemalloc.start()
+    elapsed = 0.0
+    for index in range(turns):
+        # Inputs are built outside the timing; only what the history keeps stays allocated
+        user_input, policy_data = make_turn(index, payload_kb)
+        start = time.perf_counter()
+        record(history, user_input, policy_data)
+        elapsed += time.perf_counter() - start
+        del user_input, policy_data
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, elapsed / turns * 1e6
+
+def main():
+    """Run the benchmark and print or store a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=5000, help="Policy turns in the session")
+    parser.add_argument("--payload-kb", type=int, default=4, help="Size of the policy JSON per turn")
+    parser.add_argument("--ring", type=int, default=200, help="Turns kept in memory by ConversationHistory")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    sys.path.insert(0, MCP_DIR)
+    from conversation_history import ConversationHistory
+    
+    def record_history(history, user_input: str, policy_data: dict):
+        history.append('user', user_input, policy_data=policy_data)
+        history.append('assistant', "Generated AI-powered health policy document with PDF")
+    
+    list_bytes, list_us = measure(record_list, [], args.turns, args.payload_kb)
+    
+    with tempfile.TemporaryDirectory() as log_dir:
+        history = ConversationHistory(max_entries=args.ring, log_dir=log_dir)
+        history_bytes, history_us = measure(record_history, history, args.turns, args.payload_kb)
+        
+        start = time.perf_counter()
+        counts = history.summary()
+        summary_us = (time.perf_counter() - start) * 1e6
+        
+        oldest = next(iter(history))
+        restored = history.load(oldest)
+        log_mb = os.path.getsize(history.log_path) / (1024 * 1024)
+        history.close()
+    
+    summary = {
+        "turns": args.turns,
+        "list_mb": round(list_bytes / (1024 * 1024), 2),
+        "history_mb": round(history_bytes / (1024 * 1024), 3),
+        "log_mb": round(log_mb, 1),
+        "list_append_us": round(list_us, 1),
+        "history_append_us": round(history_us, 1),
+        "summary_us": round(summary_us, 1),
+        "in_memory": counts["in_memory"],
+        "total_messages": counts["total"]
+    }
+    
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_json(args.output, summary)
+    if counts["in_memory"] > args.ring or counts["total"] != 2 * args.turns or restored.get("content", "")[:len(oldest.content)] != oldest.content:
+        print("❌ Conversation history is not bounded or the log does not match")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
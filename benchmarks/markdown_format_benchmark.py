@@ -0,0 +1,99 @@
+"""
+Benchmark of the policy markdown post-processor on large AI documents.
+
+Builds a document of --size-kb from the recorded policy replies and formats it
+with the single-pass formatter (policy_markdown.format_policy_markdown) and with
+the previous three-step regex/replace chain, reporting the time per document,
+throughput and whether formatting the output again changes it.
+
+Usage (from the repository root):
+    python benchmarks/markdown_format_benchmark.py --size-kb 100
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from stats import write_json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_DIR = os.path.join(ROOT_DIR, "MCP")
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "policy_turns.json")
+
+def legacy_format(content: str) -> str:
+    """The previous format_agent_response + apply_professional_formatting chain."""
+    formatted = content.strip()
+    formatted = formatted.replace('💰 💰', '💰')
+    formatted = formatted.replace('🛡️ 🛡️', '🛡️')
+    formatted = formatted.replace('💳 💳', '💳')
+    formatted = re.sub(r'\n{3,}', '\n\n', formatted)
+    formatted = re.sub(r' {2,}', ' ', formatted).strip()
+    
+    formatted = re.sub(r'\n#{1,3}\s*([^\n]+)', r'\n\n## 📋 \1\n', formatted)
+    formatted = re.sub(r'\*\*([^*]+)\*\*', r'**\1**', formatted)
+    for keyword, emoji in (("COVERAGE", "🛡️"), ("PREMIUM", "💰"), ("CLAIMS", "📄"),
+                           ("CONTACT", "📞"), ("BENEFITS", "✅"), ("EXCLUSIONS", "❌")):
+        formatted = formatted.replace(keyword, f"{emoji} {keyword}")
+    formatted = re.sub(r'\n{4,}', '\n\n\n', formatted)
+    return formatted.strip()
+
+def build_document(size_kb: int) -> str:
+    """Concatenate recorded policy replies (with upper-case section titles) up to the target size."""
+    with open(FIXTURE, "r", encoding="utf-8") as fixture_file:
+        replies = [turn["reply"] for turn in json.load(fixture_file)["turns"]]
+    extra = "\n\n## COVERAGE SUMMARY\nPREMIUM, CLAIMS and CONTACT details  follow.   BENEFITS and EXCLUSIONS apply.\n\n\n\n"
+    parts, size, index = [], 0, 0
+    while size < size_kb * 1024:
+        part = replies[index % len(replies)] + extra
+        parts.append(part)
+        size += len(part.encode("utf-8"))
+        index += 1
+    return "".join(parts)
+
+def time_formatter(formatter, document: str, runs: int) -> float:
+    """Median time in milliseconds of formatting the document."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        formatter(document)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+def main():
+    """Run the benchmark and print or store a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=100, help="Document size")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per formatter (the median is reported)")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    sys.path.insert(0, MCP_DIR)
+    from policy_markdown import format_policy_markdown
+    
+    document = build_document(args.size_kb)
+    size_mb = len(document.encode("utf-8")) / (1024 * 1024)
+    single_pass_ms = time_formatter(format_policy_markdown, document, args.runs)
+    legacy_ms = time_formatter(legacy_format, document, args.runs)
+    formatted = format_policy_markdown(document)
+    legacy_formatted = legacy_format(document)
+    
+    summary = {
+        "document_kb": round(size_mb * 1024, 1),
+        "single_pass_ms": round(single_pass_ms, 2),
+        "single_pass_mb_per_s": round(size_mb / (single_pass_ms / 1000), 1),
+        "legacy_ms": round(legacy_ms, 2),
+        "legacy_mb_per_s": round(size_mb / (legacy_ms / 1000), 1),
+        "single_pass_idempotent": format_policy_markdown(formatted) == formatted,
+        "legacy_idempotent": legacy_format(legacy_formatted) == legacy_formatted
+    }
+    
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_json(args.output, summary)
+    if not summary["single_pass_idempotent"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
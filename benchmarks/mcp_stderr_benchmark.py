@@ -0,0 +1,107 @@
+"""
+Stress test of MCP server stderr handling under megabytes of server logging.
+
+Runs PDF generations against the fake MCP server configured to write a large
+amount of log output to stderr per render. With the client's stderr drainer
+every request completes; with --no-drain the unread pipe fills up, the server
+blocks mid-render and the watchdog reports the stall.
+
+Usage (from the repository root, with node installed):
+    python benchmarks/mcp_stderr_benchmark.py --renders 20 --stderr-mb 2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from fakes import FAKE_MCP_SERVER
+from stats import summarize_latencies, write_json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_DIR = os.path.join(ROOT_DIR, "MCP")
+
+async def run_benchmark(args, output_dir: str) -> dict:
+    """Run the renders and collect timings and stderr totals."""
+    sys.path.insert(0, MCP_DIR)
+    from mcp_client import MCPPDFClient
+    
+    client = MCPPDFClient(FAKE_MCP_SERVER, cache_dir=None)
+    if args.no_drain:
+        client._start_stderr_drainer = lambda: None
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = await client.start_server()
+    if not started:
+        raise RuntimeError("Fake MCP server failed to start")
+    
+    latencies_ms = []
+    stalled = False
+    error = None
+    start = time.perf_counter()
+    try:
+        for index in range(args.renders):
+            # send_request blocks on the server's stdout; kill the server if it stops answering
+            watchdog = threading.Timer(args.timeout_s, client.process.kill)
+            watchdog.start()
+            render_start = time.perf_counter()
+            try:
+                await client.generate_pdf(
+                    content=f"# Render {index}\n\nStress test document.",
+                    output_path=os.path.join(output_dir, f"render_{index}.pdf")
+                )
+            except Exception as e:
+                stalled = not watchdog.is_alive()
+                error = str(e)
+                break
+            finally:
+                watchdog.cancel()
+            latencies_ms.append((time.perf_counter() - render_start) * 1000)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            await client.close()
+    wall_seconds = time.perf_counter() - start
+    
+    if error:
+        print(f"❌ Render {len(latencies_ms)} failed{' (stalled, killed by watchdog)' if stalled else ''}: {error[:500]}")
+    
+    return {
+        **summarize_latencies(latencies_ms, wall_seconds),
+        "renders": args.renders,
+        "completed": len(latencies_ms),
+        "stalled": stalled,
+        "stderr_mb": round(client.stderr_stats["bytes"] / (1024 * 1024), 3),
+        "stderr_lines": client.stderr_stats["lines"],
+        "stderr_tail_lines": len(client.stderr_tail)
+    }
+
+def main():
+    """Run the stress test and print or store a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=20, help="PDF generations to run")
+    parser.add_argument("--stderr-mb", type=float, default=2, help="Megabytes of server stderr logging per render")
+    parser.add_argument("--render-ms", type=int, default=10, help="Simulated PDF render time in the fake MCP server")
+    parser.add_argument("--timeout-s", type=float, default=10, help="Per-render watchdog timeout")
+    parser.add_argument("--no-drain", action="store_true", help="Disable the stderr drainer to reproduce the pipe stall")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    os.environ["FAKE_MCP_RENDER_MS"] = str(args.render_ms)
+    os.environ["FAKE_MCP_STDERR_BYTES"] = str(int(args.stderr_mb * 1024 * 1024))
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        summary = asyncio.run(run_benchmark(args, output_dir))
+    
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_json(args.output, summary)
+    if summary["completed"] < args.renders:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of Customer Communication Agent turns and notification tool calls.
+
+Runs the real `interact_with_insurance_agent` loop with AIProjectClient.agents
+answered from recorded fixtures and the Logic App trigger served locally.
+
+Usage (from the repository root, with the agent's requirements installed):
+    python benchmarks/notification_benchmark.py --conversations 20 --logic-app-latency-ms 80
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from fakes import FakeAgentsClient, FakeAIProjectClient, FakeCredential, FakeLogicAppServer
+from stats import summarize_latencies, write_json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENT_DIR = os.path.join(ROOT_DIR, "Agents", "Insurance Customer Communication Agent")
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "notification_turns.json")
+
+class ScriptedInput:
+    """Replacement for input() that replays user messages and times each turn."""
+    
+    def __init__(self, messages: list):
+        """Initialize with the user messages of one conversation."""
+        self.messages = list(messages)
+        self.turn_latencies_ms = []
+        self._turn_start = None
+    
+    def __call__(self, prompt: str = "") -> str:
+        """Return the next user message (or "exit"), closing the timing of the previous turn."""
+        now = time.perf_counter()
+        if self._turn_start is not None:
+            self.turn_latencies_ms.append((now - self._turn_start) * 1000)
+        
+        if not self.messages:
+            self._turn_start = None
+            return "exit"
+        self._turn_start = now
+        return self.messages.pop(0)
+
+def make_responder(turns: list):
+    """Build a fake agent responder from recorded turns."""
+    by_message = {turn["user"]: turn for turn in turns}
+    
+    def respond(user_message: str):
+        turn = by_message.get(user_message, turns[0])
+        if "tool_call" in turn:
+            return {"tool_call": turn["tool_call"], "reply": turn["reply"]}
+        return turn["reply"]
+    
+    return respond
+
+def main():
+    """Run the benchmark and print or store a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=20, help="Number of conversations")
+    parser.add_argument("--agent-latency-ms", type=float, default=0, help="Simulated model latency per run")
+    parser.add_argument("--in-progress-polls", type=int, default=0, help="Run polls reporting in_progress")
+    parser.add_argument("--logic-app-latency-ms", type=float, default=50, help="Simulated Logic App latency")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    with open(FIXTURE, "r", encoding="utf-8") as fixture_file:
+        turns = json.load(fixture_file)["turns"]
+    user_messages = [turn["user"] for turn in turns[1:]]
+    agents = FakeAgentsClient(make_responder(turns), args.agent_latency_ms, args.in_progress_polls)
+    
+    with FakeLogicAppServer(args.logic_app_latency_ms) as logic_app:
+        os.environ["INSURANCE_LOGIC_APP_URL"] = logic_app.url
+        
+        import azure.ai.projects
+        import azure.identity
+        FakeAIProjectClient.agents_factory = lambda: agents
+        azure.ai.projects.AIProjectClient = FakeAIProjectClient
+        azure.identity.DefaultAzureCredential = FakeCredential
+        
+        sys.path.insert(0, AGENT_DIR)
+        import agent as agent_module
+        from tool_handler import InsuranceToolHandler
+        
+        tool_latencies_ms = []
+        handle_tool_calls = InsuranceToolHandler.handle_tool_calls
+        
+        def timed_handle_tool_calls(self, tool_calls):
+            start = time.perf_counter()
+            try:
+                return handle_tool_calls(self, tool_calls)
+            finally:
+                tool_latencies_ms.append((time.perf_counter() - start) * 1000)
+        
+        InsuranceToolHandler.handle_tool_calls = timed_handle_tool_calls
+        
+        turn_latencies_ms = []
+        original_input = builtins.input
+        start = time.perf_counter()
+        try:
+            for _ in range(args.conversations):
+                scripted_input = ScriptedInput(user_messages)
+                builtins.input = scripted_input
+                with contextlib.redirect_stdout(io.StringIO()):
+                    agent_module.interact_with_insurance_agent()
+                turn_latencies_ms.extend(scripted_input.turn_latencies_ms)
+        finally:
+            builtins.input = original_input
+        wall_seconds = time.perf_counter() - start
+        
+        tool_summary = summarize_latencies(tool_latencies_ms, wall_seconds)
+        summary = {
+            **summarize_latencies(turn_latencies_ms, wall_seconds),
+            "tool_call_p50_ms": tool_summary.get("p50_ms", 0.0),
+            "tool_call_p99_ms": tool_summary.get("p99_ms", 0.0),
+            "tool_calls": len(tool_latencies_ms),
+            "logic_app_requests": logic_app.stats["requests"],
+            "logic_app_request_bytes": logic_app.stats["request_bytes"]
+        }
+    
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_json(args.output, summary)
+
+if __name__ == "__main__":
+    main()
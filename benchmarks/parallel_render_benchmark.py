@@ -0,0 +1,132 @@
+"""
+Benchmark of single-server versus parallel section rendering of long policies.
+
+Builds a long policy certificate (the policy wording sections repeated
+--repeat times), renders it in one piece on one MCP server and then split into sections
+on a pool of servers (MCPWorkerPool), and reports wall time, speedup and page
+counts. The fake MCP server's render time grows with the content size
+(FAKE_MCP_RENDER_MS_PER_KB), like browser layout of a long document does.
+
+Usage (from the repository root, with node and pypdf installed):
+    python benchmarks/parallel_render_benchmark.py --workers 4 --repeat 8
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from fakes import FAKE_MCP_SERVER
+from stats import write_json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_DIR = os.path.join(ROOT_DIR, "MCP")
+
+POLICY_DATA = {
+    "customerName": "Priya Sharma",
+    "policyNumber": "GSS-2025-HLT-004512",
+    "claimType": "health",
+    "claimAmount": 500000,
+    "policyStartDate": "2025-04-01"
+}
+
+def build_long_document(repeat: int) -> str:
+    """Render the health certificate with its policy wording sections repeated."""
+    from policy_templates import (
+        CERTIFICATE_FOOTER, CERTIFICATE_HEADER, COVERAGE_SECTIONS,
+        build_certificate_variables, render_template
+    )
+    
+    template = CERTIFICATE_HEADER + COVERAGE_SECTIONS["health"] + CERTIFICATE_FOOTER * repeat
+    return render_template(template, build_certificate_variables(POLICY_DATA))
+
+async def run_benchmark(args, output_dir: str) -> dict:
+    """Render the document both ways and collect timings."""
+    sys.path.insert(0, MCP_DIR)
+    from mcp_client import MCPPDFClient
+    from output_sinks import LocalDirectorySink
+    from parallel_render import MCPWorkerPool, split_sections
+    from policy_templates import POLICY_CERTIFICATE_CSS
+    from pypdf import PdfReader
+    
+    def make_client(server_path: str) -> MCPPDFClient:
+        return MCPPDFClient(FAKE_MCP_SERVER, cache_dir=None, output_sink=LocalDirectorySink(output_dir))
+    
+    content = build_long_document(args.repeat)
+    style = {
+        "style_name": "benchmark_policy",
+        "description": "Benchmark policy style",
+        "theme": "professional",
+        "format": "A4",
+        "custom_css": POLICY_CERTIFICATE_CSS
+    }
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        client = make_client(FAKE_MCP_SERVER)
+        if not await client.start_server():
+            raise RuntimeError("Fake MCP server failed to start")
+        pool = MCPWorkerPool(args.workers, FAKE_MCP_SERVER, client_factory=make_client)
+        if not await pool.start():
+            raise RuntimeError("MCP worker pool failed to start")
+    sections = split_sections(content, len(pool.workers))
+    
+    single_ms, parallel_ms = [], []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            await client.create_custom_style(**style)
+        for _ in range(args.runs):
+            single_path = client.get_pdf_path("single.pdf")
+            start = time.perf_counter()
+            await client.generate_pdf_with_style("benchmark_policy", content, single_path)
+            single_ms.append((time.perf_counter() - start) * 1000)
+            
+            parallel_path = client.get_pdf_path("parallel.pdf")
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = await pool.render_sections(sections, parallel_path, style)
+            parallel_ms.append((time.perf_counter() - start) * 1000)
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            await pool.close()
+            await client.close()
+    
+    single_median = sorted(single_ms)[len(single_ms) // 2]
+    parallel_median = sorted(parallel_ms)[len(parallel_ms) // 2]
+    return {
+        "content_kb": round(len(content.encode("utf-8")) / 1024, 1),
+        "sections": len(sections),
+        "workers": result["workers"],
+        "single_ms": round(single_median, 1),
+        "parallel_ms": round(parallel_median, 1),
+        "speedup": round(single_median / parallel_median, 2),
+        "single_pages": len(PdfReader(single_path).pages),
+        "parallel_pages": result["page_count"]
+    }
+
+def main():
+    """Run the benchmark and print or store a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="MCP servers in the worker pool")
+    parser.add_argument("--repeat", type=int, default=8, help="Times the policy wording sections are repeated")
+    parser.add_argument("--runs", type=int, default=3, help="Renders per mode (the median is reported)")
+    parser.add_argument("--render-ms", type=int, default=100, help="Fixed render time per request in the fake MCP server")
+    parser.add_argument("--render-ms-per-kb", type=float, default=20, help="Render time per KB of content in the fake MCP server")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    os.environ["FAKE_MCP_RENDER_MS"] = str(args.render_ms)
+    os.environ["FAKE_MCP_RENDER_MS_PER_KB"] = str(args.render_ms_per_kb)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        summary = asyncio.run(run_benchmark(args, output_dir))
+    
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_json(args.output, summary)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark of Policy Agent generation turns (agent reply, formatting and PDF).
+
+Runs `ConversationalPolicyAgent.handle_user_input` with AIProjectClient.agents
+answered from recorded fixtures and the node MCP PDF server replaced by a fake
+that skips browser rendering.
+
+Usage (from the repository root, with the MCP requirements and node installed):
+    python benchmarks/policy_benchmark.py --turns 10 --render-ms 250
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from fakes import FAKE_MCP_SERVER, FakeAgentsClient, FakeAIProjectClient, FakeCredential
+from stats import summarize_latencies, write_json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_DIR = os.path.join(ROOT_DIR, "MCP")
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "policy_turns.json")
+
+def make_responder(turns: list):
+    """Build a fake agent responder returning the recorded policy document."""
+    
+    def respond(user_message: str):
+        for turn in turns:
+            customer_name = json.loads(turn["user"]).get("customerName", "")
+            if customer_name and customer_name in user_message:
+                return turn["reply"]
+        return turns[0]["reply"]
+    
+    return respond
+
+async def run_benchmark(args, turns: list, output_dir: str) -> dict:
+    """Run the generation turns and collect timings."""
+    sys.path.insert(0, MCP_DIR)
+    import policy_agent
+    from conversation_history import ConversationHistory
+    from mcp_client import MCPPDFClient
+    from output_sinks import LocalDirectorySink, MemorySink
+    
+    class FakeServerMCPClient(MCPPDFClient):
+        """MCP client that launches the fake server and writes into a temporary directory."""
+        
+        def __init__(self, server_path: str):
+            super().__init__(
+                FAKE_MCP_SERVER,
+                cache_dir=os.path.join(output_dir, ".pdf_cache") if args.pdf_cache else None,
+                output_sink=MemorySink() if args.memory_sink else LocalDirectorySink(output_dir)
+            )
+    
+    agents = FakeAgentsClient(make_responder(turns), args.agent_latency_ms)
+    FakeAIProjectClient.agents_factory = lambda: agents
+    policy_agent.AIProjectClient = FakeAIProjectClient
+    policy_agent.DefaultAzureCredential = FakeCredential
+    policy_agent.MCPPDFClient = FakeServerMCPClient
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = policy_agent.ConversationalPolicyAgent()
+        agent.thread = agent.project_client.agents.create_thread()
+    agent.use_pdf_templates = not args.no_templates
+    agent.overlap_pdf_warm_up = not args.no_warm_up
+    agent.use_llm = not args.no_llm
+    agent.conversation_history = ConversationHistory(log_dir=output_dir)
+    
+    pdf_latencies_ms = []
+    pdf_request_bytes = []
+    generate_pdf_document = agent.generate_pdf_document
+    
+    async def timed_generate_pdf_document(ai_content, policy_data):
+        bytes_before = agent.mcp_client.request_stats["bytes_sent"] if agent.mcp_client else 0
+        start = time.perf_counter()
+        try:
+            return await generate_pdf_document(ai_content, policy_data)
+        finally:
+            pdf_latencies_ms.append((time.perf_counter() - start) * 1000)
+            pdf_request_bytes.append(agent.mcp_client.request_stats["bytes_sent"] - bytes_before)
+    
+    agent.generate_pdf_document = timed_generate_pdf_document
+    
+    turn_latencies_ms = []
+    cold_start_stages = {}
+    try:
+        for index in range(args.turns + 1):
+            user_input = turns[index % len(turns)]["user"]
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                await agent.handle_user_input(user_input)
+            turn_latencies_ms.append((time.perf_counter() - start) * 1000)
+            if index == 0:
+                cold_start_stages = dict(agent.last_stage_timings)
+    finally:
+        if agent.mcp_client:
+            with contextlib.redirect_stdout(io.StringIO()):
+                await agent.mcp_client.close()
+        agent.conversation_history.close()
+    
+    # The first turn also starts the MCP server; report it separately
+    cold_start_ms = turn_latencies_ms.pop(0)
+    pdf_latencies_ms.pop(0)
+    pdf_request_bytes.pop(0)
+    warm_seconds = sum(turn_latencies_ms) / 1000
+    pdf_summary = summarize_latencies(pdf_latencies_ms, warm_seconds)
+    return {
+        **summarize_latencies(turn_latencies_ms, warm_seconds),
+        "cold_start_ms": round(cold_start_ms, 3),
+        "cold_start_stages": cold_start_stages,
+        "pdf_p50_ms": pdf_summary.get("p50_ms", 0.0),
+        "pdf_p99_ms": pdf_summary.get("p99_ms", 0.0),
+        "pdf_request_bytes": round(sum(pdf_request_bytes) / len(pdf_request_bytes)) if pdf_request_bytes else 0,
+        "agent_runs": agents.calls["runs"]
+    }
+
+def find_pdf_files(directory: str) -> list:
+    """List the PDFs and PDF cache files under a directory."""
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(".pdf") or ".pdf_cache" in root
+    ]
+
+def main():
+    """Run the benchmark and print or store a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=10, help="Warm generation turns (after one cold turn)")
+    parser.add_argument("--agent-latency-ms", type=float, default=0, help="Simulated model latency per run")
+    parser.add_argument("--render-ms", type=int, default=250, help="Simulated PDF render time in the fake MCP server")
+    parser.add_argument("--pdf-cache", action="store_true", help="Enable the PDF cache (repeated documents skip rendering)")
+    parser.add_argument("--memory-sink", action="store_true", help="Return PDFs as bytes instead of keeping files")
+    parser.add_argument("--no-templates", action="store_true", help="Send the full HTML with a custom style per document")
+    parser.add_argument("--no-warm-up", action="store_true", help="Start the MCP server after the agent reply instead of during it")
+    parser.add_argument("--no-llm", action="store_true", help="Fast mode: render certificates from the policy JSON without agent runs")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    with open(FIXTURE, "r", encoding="utf-8") as fixture_file:
+        turns = json.load(fixture_file)["turns"]
+    os.environ["FAKE_MCP_RENDER_MS"] = str(args.render_ms)
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        summary = asyncio.run(run_benchmark(args, turns, output_dir))
+        leftover_files = find_pdf_files(output_dir) if args.memory_sink else []
+    
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_json(args.output, summary)
+    if leftover_files:
+        print(f"❌ The memory sink left files on disk: {leftover_files[:5]}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Concurrency check of Policy Agent sessions sharing one event loop.
+
+Runs --sessions ConversationalPolicyAgent instances concurrently, each asking
+the (fake, synchronous) Azure AI agent --questions questions with a simulated
+model latency. Records when every agent run starts and ends and samples the
+event loop's responsiveness with a heartbeat task. The check fails (exit code 1)
+when no two sessions' runs overlap in time, i.e. when the SDK calls block the
+event loop.
+
+Usage (from the repository root, with the MCP requirements installed):
+    python benchmarks/policy_sessions_benchmark.py --sessions 2 --agent-latency-ms 500
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from fakes import FakeAgentsClient, FakeAIProjectClient, FakeCredential
+from stats import write_json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_DIR = os.path.join(ROOT_DIR, "MCP")
+
+class RunRecorder:
+    """Wraps FakeAgentsClient.create_and_process_run to record run intervals per thread."""
+    
+    def __init__(self, agents: FakeAgentsClient):
+        """Install the recorder on a fake agents client."""
+        self.intervals = []
+        self._lock = threading.Lock()
+        self._create_and_process_run = agents.create_and_process_run
+        agents.create_and_process_run = self.create_and_process_run
+    
+    def create_and_process_run(self, thread_id: str, agent_id: str, **kwargs):
+        """Run the agent and record the start and end time."""
+        start = time.perf_counter()
+        try:
+            return self._create_and_process_run(thread_id, agent_id, **kwargs)
+        finally:
+            with self._lock:
+                self.intervals.append((thread_id, start, time.perf_counter()))
+    
+    def overlapping_pairs(self) -> int:
+        """Count pairs of runs from different threads that overlap in time."""
+        pairs = 0
+        for index, (thread_a, start_a, end_a) in enumerate(self.intervals):
+            for thread_b, start_b, end_b in self.intervals[index + 1:]:
+                if thread_a != thread_b and start_a < end_b and start_b < end_a:
+                    pairs += 1
+        return pairs
+
+async def heartbeat(interval_s: float, lags_ms: list, stop: asyncio.Event):
+    """Measure how late the event loop wakes a sleeping task."""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval_s
+        await asyncio.sleep(interval_s)
+        lags_ms.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+async def run_benchmark(args) -> dict:
+    """Run the sessions concurrently and collect run intervals and loop lag."""
+    sys.path.insert(0, MCP_DIR)
+    import policy_agent
+    
+    agents = FakeAgentsClient(lambda message: "Health insurance covers hospitalization costs.", args.agent_latency_ms)
+    recorder = RunRecorder(agents)
+    FakeAIProjectClient.agents_factory = lambda: agents
+    policy_agent.AIProjectClient = FakeAIProjectClient
+    policy_agent.DefaultAzureCredential = FakeCredential
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        sessions = [policy_agent.ConversationalPolicyAgent() for _ in range(args.sessions)]
+    
+    async def run_session(agent):
+        await agent.start_conversation()
+        for index in range(args.questions):
+            await agent.send_message_to_agent(f"Question {index}: what does health insurance cover?")
+    
+    lags_ms = []
+    stop = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat(0.01, lags_ms, stop))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(run_session(agent) for agent in sessions))
+    wall_seconds = time.perf_counter() - start
+    stop.set()
+    await heartbeat_task
+    
+    sequential_seconds = sum(end - begin for _, begin, end in recorder.intervals)
+    return {
+        "sessions": args.sessions,
+        "runs": len(recorder.intervals),
+        "wall_s": round(wall_seconds, 3),
+        "sequential_run_s": round(sequential_seconds, 3),
+        "overlapping_run_pairs": recorder.overlapping_pairs(),
+        "max_loop_lag_ms": round(max(lags_ms, default=0.0), 1)
+    }
+
+def main():
+    """Run the check and print or store a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2, help="Concurrent agent sessions")
+    parser.add_argument("--questions", type=int, default=3, help="Questions per session")
+    parser.add_argument("--agent-latency-ms", type=float, default=500, help="Simulated model latency per run")
+    parser.add_argument("--output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+    
+    summary = asyncio.run(run_benchmark(args))
+    
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        write_json(args.output, summary)
+    if args.sessions > 1 and summary["overlapping_run_pairs"] == 0:
+        print("❌ Agent runs of different sessions did not overlap")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Run every component benchmark and compare the results with stored baselines.
+
+Each benchmark runs in its own process because the components use clashing
+top-level module names (e.g. `config`).
+
+Usage (from the repository root):
+    python benchmarks/run_all.py                   # run and diff against baselines
+    python benchmarks/run_all.py --update-baseline # store the results as new baselines
+    python benchmarks/run_all.py --only policy --fail-on-regression
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from stats import BASELINE_DIR, compare_to_baseline, load_baseline, write_json
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+CUA_BACKEND_DIR = os.path.join(ROOT_DIR, "CUA", "Backend")
+
+# name -> (command, working directory)
+BENCHMARKS = {
+    "notifications": ([sys.executable, os.path.join(BENCHMARK_DIR, "notification_benchmark.py")], ROOT_DIR),
+    "policy": ([sys.executable, os.path.join(BENCHMARK_DIR, "policy_benchmark.py")], ROOT_DIR),
+    "cua_loop": ([sys.executable, "-m", "benchmarks.cua_loop_benchmark", "--latency-ms", "300"], CUA_BACKEND_DIR)
+}
+
+def run_benchmark(name: str) -> dict:
+    """
+    Run one benchmark in a subprocess.
+    
+    Args:
+        name: Key in BENCHMARKS
+    
+    Returns:
+        Parsed summary, or None if the benchmark failed
+    """
+    command, cwd = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, f"{name}.json")
+        completed = subprocess.run(command + ["--output", output_path], cwd=cwd, capture_output=True, text=True)
+        if completed.returncode != 0 or not os.path.exists(output_path):
+            print(f"❌ {name} failed (exit code {completed.returncode})")
+            print(completed.stderr[-2000:])
+            return None
+        with open(output_path, "r", encoding="utf-8") as output_file:
+            return json.load(output_file)
+
+def print_comparison(name: str, rows: list):
+    """Print a metric comparison table for one benchmark."""
+    print(f"\n{name}")
+    print("-" * 78)
+    print(f"{'Metric':<28}{'Baseline':>14}{'Current':>14}{'Change':>10}")
+    for metric, previous, current, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{metric:<28}{previous:>14.2f}{current:>14.2f}{change:>+10.1%}{flag}")
+
+def main():
+    """Run the selected benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), action="append", help="Benchmark to run (repeatable)")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown before flagging")
+    parser.add_argument("--update-baseline", action="store_true", help="Store results as the new baselines")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    args = parser.parse_args()
+    
+    regressions = 0
+    failures = 0
+    for name in args.only or BENCHMARKS:
+        print(f"▶ Running {name} benchmark...")
+        result = run_benchmark(name)
+        if result is None:
+            failures += 1
+            continue
+        
+        if args.update_baseline:
+            write_json(os.path.join(BASELINE_DIR, f"{name}.json"), result)
+            print(f"✅ Baseline updated: {name}")
+            continue
+        
+        baseline = load_baseline(name)
+        if baseline is None:
+            print(f"ℹ️ No baseline for {name}; run with --update-baseline to store one")
+            print(json.dumps(result, indent=2))
+            continue
+        
+        rows = compare_to_baseline(result, baseline, args.tolerance)
+        print_comparison(name, rows)
+        regressions += sum(1 for row in rows if row[4])
+    
+    print(f"\n{regressions} regression(s), {failures} failed benchmark(s)")
+    if failures or (args.fail_on_regression and regressions):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
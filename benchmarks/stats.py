@@ -0,0 +1,81 @@
+"""
+Latency statistics and baseline comparison shared by the benchmark scripts.
+"""
+
+import json
+import os
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# Metrics where a larger value is an improvement
+HIGHER_IS_BETTER = {"throughput_per_s", "iterations_per_s"}
+
+# Metrics describing the run setup rather than its performance
+NOT_COMPARED = {"samples", "runs", "tool_calls", "logic_app_requests", "agent_runs", "compactions"}
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def summarize_latencies(latencies_ms: list, wall_seconds: float) -> dict:
+    """
+    Summarize per-operation latencies.
+    
+    Args:
+        latencies_ms: Latency of each operation in milliseconds
+        wall_seconds: Wall time spent on all operations
+    
+    Returns:
+        Dictionary of latency percentiles and throughput
+    """
+    if not latencies_ms:
+        return {"samples": 0}
+    return {
+        "samples": len(latencies_ms),
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 3),
+        "p50_ms": round(percentile(latencies_ms, 0.50), 3),
+        "p90_ms": round(percentile(latencies_ms, 0.90), 3),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3),
+        "max_ms": round(max(latencies_ms), 3),
+        "throughput_per_s": round(len(latencies_ms) / wall_seconds, 3) if wall_seconds else 0.0
+    }
+
+def write_json(path: str, data: dict):
+    """Write a dictionary as indented JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(data, json_file, indent=2, sort_keys=True)
+        json_file.write("\n")
+
+def load_baseline(name: str) -> dict:
+    """Load a stored baseline result, or None if there is none."""
+    path = os.path.join(BASELINE_DIR, f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+def compare_to_baseline(result: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare numeric metrics of a result with its baseline.
+    
+    Args:
+        result: Current benchmark summary
+        baseline: Stored baseline summary
+        tolerance: Allowed relative slowdown (0.1 = 10%)
+    
+    Returns:
+        List of (metric, baseline, current, relative change, regressed) tuples
+    """
+    rows = []
+    for metric, current in result.items():
+        if metric in NOT_COMPARED:
+            continue
+        previous = baseline.get(metric)
+        if not isinstance(current, (int, float)) or not isinstance(previous, (int, float)) or not previous:
+            continue
+        change = (current - previous) / previous
+        regressed = -change > tolerance if metric in HIGHER_IS_BETTER else change > tolerance
+        rows.append((metric, previous, current, change, regressed))
+    return rows